@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Dict, List
+from typing import Dict, List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
@@ -35,6 +35,93 @@ class Team(BaseModel):
     model_config = {"extra": "forbid"}
 
 
+class ExecutionLimits(BaseModel):
+    max_concurrency: int = Field(
+        default=4, ge=1, description="Maximum number of requests of the strategy running at once"
+    )
+    max_queue: int = Field(
+        default=64,
+        ge=0,
+        description="Requests allowed to wait for a free slot before new ones are rejected",
+    )
+
+    model_config = {"extra": "forbid"}
+
+
+class CacheSettings(BaseModel):
+    enabled: Optional[bool] = Field(
+        default=None,
+        description="Cache responses of the strategy; unset uses the strategy's own default",
+    )
+    ttl: Optional[float] = Field(
+        default=300.0,
+        gt=0.0,
+        description="Seconds a cached response stays valid; null never expires",
+    )
+    max_entries: int = Field(
+        default=1024, ge=1, description="Maximum cached responses before LRU eviction"
+    )
+    normalization: Literal["exact", "whitespace", "casefold", "alphanumeric"] = Field(
+        default="casefold", description="How request texts are normalized into cache keys"
+    )
+
+    model_config = {"extra": "forbid"}
+
+
+class ExecutionPolicy(BaseModel):
+    timeout: Optional[float] = Field(
+        default=None, gt=0.0, description="Seconds an attempt may run; null waits forever"
+    )
+    workers: int = Field(
+        default=8, ge=1, description="Threads running timed attempts; hung attempts hold one"
+    )
+    retries: int = Field(default=0, ge=0, description="Extra attempts after a failure")
+    backoff: float = Field(
+        default=0.1, ge=0.0, description="Base delay in seconds of the jittered retry backoff"
+    )
+    max_backoff: float = Field(
+        default=2.0, ge=0.0, description="Upper bound in seconds of a single retry delay"
+    )
+    failure_threshold: int = Field(
+        default=5, ge=1, description="Consecutive failed requests that open the circuit"
+    )
+    recovery_time: float = Field(
+        default=30.0, gt=0.0, description="Seconds the circuit stays open before a trial request"
+    )
+    fallback: Optional[str] = Field(
+        default="basic",
+        description="Strategy serving requests while the circuit is open or after failures",
+    )
+
+    model_config = {"extra": "forbid"}
+
+
+class Strategy(BaseModel):
+    priority: int = Field(
+        0, description="Routing priority; the highest-priority matching strategy wins"
+    )
+    keywords: List[str] = Field(
+        default_factory=list,
+        description="Whole words or phrases that route a request to this strategy",
+    )
+    examples: List[str] = Field(
+        default_factory=list,
+        description="Example requests whose embeddings define the strategy for semantic routing",
+    )
+    limits: ExecutionLimits = Field(
+        default_factory=ExecutionLimits,
+        description="Concurrency cap and queue depth enforced by the scheduler",
+    )
+    cache: CacheSettings = Field(
+        default_factory=CacheSettings, description="Response cache in front of the strategy"
+    )
+    policy: Optional[ExecutionPolicy] = Field(
+        default=None, description="Timeout, retry and circuit-breaker policy of the strategy"
+    )
+
+    model_config = {"extra": "forbid"}
+
+
 class SystemConfig(BaseModel):
     version: str = Field(
         ..., description="Configuration schema version", pattern=r"^\d+\.\d+$"
@@ -43,6 +130,7 @@ class SystemConfig(BaseModel):
     agents: Dict[str, Agent]
     tasks: Dict[str, Task]
     teams: Dict[str, Team]
+    strategies: Dict[str, Strategy] = Field(default_factory=dict)
 
     model_config = {"extra": "forbid"}
 
@@ -13,6 +13,7 @@ import yaml
 
 from config_models import SystemConfig
 from personal_agent.core.config_validator import ConfigValidator
+from personal_agent.core.intent_router import IntentRouter
 from personal_agent.core.interfaces import UserRequest
 from personal_agent.core.meta_orchestrator import MetaOrchestrator
 
@@ -30,7 +31,7 @@ def main() -> None:
     """Entry point for running the orchestrator demo."""
     config = load_config("system_config.yaml")
     print(f"Loaded config version {config.version}")
-    orchestrator = MetaOrchestrator()
+    orchestrator = MetaOrchestrator(router=IntentRouter.from_config(config))
 
     user_input = input("Digite sua pergunta: ")
     request = UserRequest(text=user_input)
@@ -8,7 +8,13 @@ logger = logging.getLogger(__name__)
 
 
 class ArchivistAgent(IExecutionStrategy):
-    """Simulates archiving and retrieving information."""
+    """Simulates archiving and retrieving information.
+
+    Archiving has side effects, so responses must never be served from a
+    cache.
+    """
+
+    cacheable = False
 
     def execute(self, request: UserRequest) -> AgentResponse:
         """Archive the provided text and return a confirmation.
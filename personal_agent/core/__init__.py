@@ -1,13 +1,59 @@
 """Core components for orchestration and shared interfaces."""
 
+from .batch_executor import BatchingExecutor
 from .config_validator import ConfigValidator
-from .interfaces import AgentResponse, IExecutionStrategy, UserRequest
+from .instrumentation import (
+    InMemorySink,
+    ISpanSink,
+    JsonlSink,
+    PrometheusSink,
+    RequestSpan,
+)
+from .intent_router import IntentRouter, RoutingRule
+from .interfaces import (
+    AgentResponse,
+    IAsyncExecutionStrategy,
+    IBatchExecutionStrategy,
+    IExecutionStrategy,
+    IRequestRouter,
+    UserRequest,
+)
 from .meta_orchestrator import MetaOrchestrator
+from .policies import (
+    CircuitBreaker,
+    CircuitOpen,
+    ResilientStrategy,
+    apply_execution_policies,
+)
+from .response_cache import CachedStrategy, ResponseCache, enable_response_caches
+from .scheduler import SchedulerOverloaded, StrategyScheduler
+from .semantic_router import SemanticRouter
 
 __all__ = [
     "AgentResponse",
+    "BatchingExecutor",
+    "CachedStrategy",
+    "CircuitBreaker",
+    "CircuitOpen",
     "ConfigValidator",
+    "IAsyncExecutionStrategy",
+    "IBatchExecutionStrategy",
     "IExecutionStrategy",
+    "IRequestRouter",
+    "ISpanSink",
+    "InMemorySink",
+    "IntentRouter",
+    "JsonlSink",
     "MetaOrchestrator",
+    "PrometheusSink",
+    "RequestSpan",
+    "ResilientStrategy",
+    "ResponseCache",
+    "RoutingRule",
+    "SchedulerOverloaded",
+    "SemanticRouter",
+    "StrategyScheduler",
     "UserRequest",
+    "apply_execution_policies",
+    "enable_response_caches",
 ]
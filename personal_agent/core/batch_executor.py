@@ -0,0 +1,183 @@
+"""Executor com micro-lotes para o Meta-Orquestrador.
+
+Requisições enviadas concorrentemente são roteadas na chegada e acumuladas
+em uma fila por estratégia. Uma fila é despachada como um único lote quando
+atinge ``max_batch_size`` requisições ou quando sua requisição mais antiga
+espera ``max_latency`` segundos, o que ocorrer primeiro. Assim, estratégias
+que implementam ``execute_batch`` podem agrupar chamadas de embeddings e de
+LLM sem que uma requisição isolada espere mais que o prazo configurado.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from concurrent.futures import Executor, Future
+from typing import Dict, List, Optional, Tuple
+
+from .interfaces import AgentResponse, UserRequest
+from .meta_orchestrator import MetaOrchestrator
+
+logger = logging.getLogger(__name__)
+
+_Pending = List[Tuple[UserRequest, "Future[AgentResponse]"]]
+
+
+class BatchingExecutor:
+    """Agrupa requisições por estratégia e as executa em lotes."""
+
+    def __init__(
+        self,
+        orchestrator: MetaOrchestrator,
+        max_batch_size: int = 32,
+        max_latency: float = 0.01,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        """Inicia a thread despachante.
+
+        Args:
+            orchestrator: Orquestrador que roteia e executa as requisições.
+            max_batch_size: Tamanho máximo de um lote.
+            max_latency: Espera máxima, em segundos, da requisição mais antiga
+                de uma fila antes de o lote ser despachado.
+            executor: Pool que executa os lotes. Sem ele, os lotes rodam na
+                thread despachante, um de cada vez.
+
+        Raises:
+            ValueError: Se ``max_batch_size`` não for positivo ou
+                ``max_latency`` for negativo.
+        """
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size deve ser positivo")
+        if max_latency < 0:
+            raise ValueError("max_latency não pode ser negativo")
+        self.orchestrator = orchestrator
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self.executor = executor
+        self._cond = threading.Condition()
+        self._pending: Dict[str, _Pending] = {}
+        self._deadlines: Dict[str, float] = {}
+        self._closed = False
+        self._stopped = False
+        self._thread = threading.Thread(
+            target=self._dispatch_loop, name="batch-dispatcher", daemon=True
+        )
+        self._thread.start()
+
+    def __enter__(self) -> "BatchingExecutor":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def submit(self, request: UserRequest) -> "Future[AgentResponse]":
+        """Enfileira ``request`` e retorna um futuro com sua resposta.
+
+        Raises:
+            RuntimeError: Se o executor já foi encerrado ou a thread
+                despachante parou.
+        """
+        analysis = self.orchestrator.analyze_request(request)
+        future: "Future[AgentResponse]" = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("BatchingExecutor encerrado")
+            if self._stopped:
+                raise RuntimeError("Thread despachante do BatchingExecutor parou")
+            queue = self._pending.setdefault(analysis, [])
+            if not queue:
+                self._deadlines[analysis] = time.monotonic() + self.max_latency
+            queue.append((request, future))
+            if len(queue) == 1 or len(queue) >= self.max_batch_size:
+                self._cond.notify()
+        return future
+
+    def execute(self, request: UserRequest) -> AgentResponse:
+        """Enfileira ``request`` e aguarda sua resposta."""
+        return self.submit(request).result()
+
+    def close(self) -> None:
+        """Despacha as filas pendentes e encerra a thread despachante."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+
+    def _take_ready(self) -> List[Tuple[str, _Pending]]:
+        """Remove das filas os lotes prontos; deve ser chamado com o lock."""
+        now = time.monotonic()
+        ready: List[Tuple[str, _Pending]] = []
+        for analysis in list(self._pending):
+            queue = self._pending[analysis]
+            while len(queue) >= self.max_batch_size:
+                ready.append((analysis, queue[: self.max_batch_size]))
+                del queue[: self.max_batch_size]
+                self._deadlines[analysis] = now + self.max_latency
+            if queue and (self._closed or self._deadlines[analysis] <= now):
+                ready.append((analysis, queue))
+                self._pending[analysis] = []
+            if not self._pending[analysis]:
+                del self._pending[analysis]
+                del self._deadlines[analysis]
+        return ready
+
+    def _dispatch_loop(self) -> None:
+        try:
+            self._dispatch()
+        except Exception:
+            logger.exception("Thread despachante do BatchingExecutor parou")
+        finally:
+            # Se o laço parar por um erro inesperado, nenhuma requisição pode
+            # ficar aguardando um lote que nunca será despachado.
+            with self._cond:
+                self._stopped = True
+                pending = [item for queue in self._pending.values() for item in queue]
+                self._pending.clear()
+                self._deadlines.clear()
+            self._fail(pending, RuntimeError("Thread despachante do BatchingExecutor parou"))
+
+    def _dispatch(self) -> None:
+        while True:
+            with self._cond:
+                ready = self._take_ready()
+                while not ready:
+                    if self._closed:
+                        return
+                    timeout = (
+                        min(self._deadlines.values()) - time.monotonic()
+                        if self._deadlines
+                        else None
+                    )
+                    self._cond.wait(timeout)
+                    ready = self._take_ready()
+            for analysis, batch in ready:
+                if self.executor is None:
+                    self._run(analysis, batch)
+                    continue
+                try:
+                    self.executor.submit(self._run, analysis, batch)
+                except Exception as exc:
+                    logger.error("Erro ao despachar lote da estratégia %s: %s", analysis, exc)
+                    self._fail(batch, exc)
+
+    @staticmethod
+    def _fail(batch: _Pending, exc: BaseException) -> None:
+        """Falha os futuros de ``batch`` que ainda não foram resolvidos."""
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(exc)
+
+    def _run(self, analysis: str, batch: _Pending) -> None:
+        """Executa um lote e resolve os futuros correspondentes."""
+        logger.debug("Despachando lote de %d requisições para %s", len(batch), analysis)
+        try:
+            responses = self.orchestrator.run_batch(analysis, [request for request, _ in batch])
+        except Exception as exc:
+            logger.error("Erro ao executar lote da estratégia %s: %s", analysis, exc)
+            self._fail(batch, exc)
+            return
+        for (_, future), response in zip(batch, responses):
+            if not future.done():
+                future.set_result(response)
@@ -47,6 +47,7 @@ class ConfigValidator:
         self._check_duplicates(self._config.tasks, "tasks", errors)
         self._check_duplicates(self._config.llm_profiles, "llm_profiles", errors)
         self._check_duplicates(self._config.teams, "teams", errors)
+        self._check_duplicates(self._config.strategies, "strategies", errors)
 
         for agent_name, agent in self._config.agents.items():
             if agent.llm not in self._config.llm_profiles:
@@ -88,6 +89,37 @@ class ConfigValidator:
                         }
                     )
 
+        for strategy_name, strategy in self._config.strategies.items():
+            for keyword in strategy.keywords:
+                if not keyword.strip():
+                    msg = f"Empty keyword for strategy '{strategy_name}'"
+                    errors.append(
+                        {
+                            "type": "value_error",
+                            "loc": ("strategies", strategy_name, "keywords"),
+                            "msg": msg,
+                            "input": keyword,
+                            "ctx": {"error": msg},
+                        }
+                    )
+
+            policy = strategy.policy
+            if policy is not None and policy.fallback is not None:
+                if policy.fallback not in self._config.strategies:
+                    msg = (
+                        f"Unknown fallback strategy '{policy.fallback}' "
+                        f"for strategy '{strategy_name}'"
+                    )
+                    errors.append(
+                        {
+                            "type": "value_error",
+                            "loc": ("strategies", strategy_name, "policy", "fallback"),
+                            "msg": msg,
+                            "input": policy.fallback,
+                            "ctx": {"error": msg},
+                        }
+                    )
+
         if errors:
             raise ValidationError.from_exception_data(
                 "SystemConfig", cast(list[InitErrorDetails], errors)
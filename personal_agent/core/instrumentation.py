@@ -0,0 +1,230 @@
+"""Instrumentação por requisição do Meta-Orquestrador.
+
+Cada requisição processada gera um :class:`RequestSpan` com a duração das
+fases ``analyze``, ``select`` e ``execute``, medidas com o relógio
+monotônico. Os spans são entregues a *sinks* plugáveis:
+
+* :class:`InMemorySink` guarda os spans mais recentes, útil em testes;
+* :class:`PrometheusSink` agrega contadores e histogramas de latência por
+  estratégia e os exporta no formato texto do Prometheus;
+* :class:`JsonlSink` grava um span por linha em um arquivo JSONL.
+
+Sem sinks registrados, o orquestrador não cria spans nem lê o relógio, de
+modo que a instrumentação desativada não tem custo mensurável.
+"""
+
+from __future__ import annotations
+
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from typing import Deque, Dict, List, Optional, Protocol, Sequence, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+PHASES: Tuple[str, ...] = ("analyze", "select", "execute")
+"""Fases medidas em cada requisição, na ordem de execução."""
+
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+"""Limites superiores, em segundos, dos baldes dos histogramas de latência."""
+
+
+@dataclass
+class RequestSpan:
+    """Durações, em segundos, das fases de uma requisição."""
+
+    started_at: float = field(default_factory=time.time)
+    strategy: str = ""
+    phases: Dict[str, float] = field(default_factory=dict)
+    total: float = 0.0
+    error: Optional[str] = None
+    _start: float = field(default_factory=time.perf_counter, repr=False)
+    _last: float = field(default=0.0, repr=False)
+
+    def mark(self, phase: str) -> None:
+        """Registra o fim de ``phase``, medida desde a marca anterior."""
+        now = time.perf_counter()
+        self.phases[phase] = now - (self._last or self._start)
+        self._last = now
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        """Fecha o span, registrando a duração total e o erro, se houver."""
+        self.total = time.perf_counter() - self._start
+        if error is not None:
+            self.error = type(error).__name__
+
+    def to_dict(self) -> Dict[str, object]:
+        """Representação serializável, sem os campos internos do relógio."""
+        data = asdict(self)
+        del data["_start"], data["_last"]
+        return data
+
+
+class ISpanSink(Protocol):
+    """Contrato para destinos de spans de requisição."""
+
+    def record(self, span: RequestSpan) -> None:
+        """Recebe um span concluído."""
+        ...
+
+
+class InMemorySink:
+    """Guarda os ``max_spans`` spans mais recentes."""
+
+    def __init__(self, max_spans: int = 1000) -> None:
+        self.spans: Deque[RequestSpan] = deque(maxlen=max_spans)
+
+    def record(self, span: RequestSpan) -> None:
+        """Armazena ``span``, descartando o mais antigo se necessário."""
+        self.spans.append(span)
+
+
+class Histogram:
+    """Histograma cumulativo de baldes fixos, como os do Prometheus."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets))
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        """Conta ``value`` no primeiro balde cujo limite não é menor que ele."""
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q: float) -> float:
+        """Estima o quantil ``q`` interpolando linearmente dentro do balde.
+
+        Observações acima do último limite são atribuídas a ele.
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for i, bucket_count in enumerate(self.counts):
+            if bucket_count and cumulative + bucket_count >= rank:
+                if i == len(self.buckets):
+                    return self.buckets[-1]
+                lower = self.buckets[i - 1] if i else 0.0
+                return lower + (self.buckets[i] - lower) * (rank - cumulative) / bucket_count
+            cumulative += bucket_count
+        return self.buckets[-1]
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    body = ",".join(
+        '{}="{}"'.format(k, v.replace("\\", "\\\\").replace('"', '\\"'))
+        for k, v in labels.items()
+    )
+    return "{" + body + "}"
+
+
+class PrometheusSink:
+    """Agrega contadores e histogramas de latência por estratégia e fase."""
+
+    def __init__(
+        self, buckets: Sequence[float] = DEFAULT_BUCKETS, namespace: str = "personal_agent"
+    ) -> None:
+        self.buckets = tuple(buckets)
+        self.namespace = namespace
+        self._requests: Dict[str, int] = {}
+        self._errors: Dict[str, int] = {}
+        self._latency: Dict[Tuple[str, str], Histogram] = {}
+        self._lock = threading.Lock()
+
+    def record(self, span: RequestSpan) -> None:
+        """Atualiza os contadores e histogramas com ``span``."""
+        with self._lock:
+            self._requests[span.strategy] = self._requests.get(span.strategy, 0) + 1
+            if span.error is not None:
+                self._errors[span.strategy] = self._errors.get(span.strategy, 0) + 1
+            for phase, duration in (*span.phases.items(), ("total", span.total)):
+                self._histogram(span.strategy, phase).observe(duration)
+
+    def _histogram(self, strategy: str, phase: str) -> Histogram:
+        histogram = self._latency.get((strategy, phase))
+        if histogram is None:
+            histogram = self._latency[(strategy, phase)] = Histogram(self.buckets)
+        return histogram
+
+    def quantile(self, strategy: str, q: float, phase: str = "total") -> float:
+        """Quantil estimado da latência de ``strategy`` em ``phase``, em segundos."""
+        with self._lock:
+            histogram = self._latency.get((strategy, phase))
+            return histogram.quantile(q) if histogram is not None else 0.0
+
+    def counters(self) -> Dict[str, Dict[str, int]]:
+        """Requisições e erros por estratégia."""
+        with self._lock:
+            return {
+                strategy: {"requests": count, "errors": self._errors.get(strategy, 0)}
+                for strategy, count in self._requests.items()
+            }
+
+    def render(self) -> str:
+        """Exporta as métricas no formato texto de exposição do Prometheus."""
+        ns = self.namespace
+        lines: List[str] = []
+        with self._lock:
+            for name, values, help_text in (
+                ("requests_total", self._requests, "Requests processed per strategy."),
+                ("request_errors_total", self._errors, "Failed requests per strategy."),
+            ):
+                lines.append(f"# HELP {ns}_{name} {help_text}")
+                lines.append(f"# TYPE {ns}_{name} counter")
+                for strategy, count in sorted(values.items()):
+                    lines.append(f"{ns}_{name}{_format_labels({'strategy': strategy})} {count}")
+            metric = f"{ns}_request_duration_seconds"
+            lines.append(f"# HELP {metric} Request phase latency per strategy.")
+            lines.append(f"# TYPE {metric} histogram")
+            for (strategy, phase), histogram in sorted(self._latency.items()):
+                labels = {"strategy": strategy, "phase": phase}
+                cumulative = 0
+                for bound, count in zip(
+                    (*(repr(b) for b in histogram.buckets), "+Inf"), histogram.counts
+                ):
+                    cumulative += count
+                    bucket_labels = _format_labels({**labels, "le": bound})
+                    lines.append(f"{metric}_bucket{bucket_labels} {cumulative}")
+                lines.append(f"{metric}_sum{_format_labels(labels)} {histogram.sum!r}")
+                lines.append(f"{metric}_count{_format_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+class JsonlSink:
+    """Grava cada span como uma linha JSON em ``path``."""
+
+    def __init__(self, path: Union[str, "os.PathLike[str]"]) -> None:
+        self.path = path
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def record(self, span: RequestSpan) -> None:
+        """Acrescenta ``span`` ao arquivo."""
+        line = json.dumps(span.to_dict(), ensure_ascii=False)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def close(self) -> None:
+        """Fecha o arquivo."""
+        with self._lock:
+            self._file.close()
+
+
+def emit(sinks: Sequence[ISpanSink], span: RequestSpan) -> None:
+    """Entrega ``span`` a cada sink; falhas de um sink não afetam a requisição."""
+    for sink in sinks:
+        try:
+            sink.record(span)
+        except Exception as exc:
+            logger.warning("Falha ao registrar span em %s: %s", type(sink).__name__, exc)
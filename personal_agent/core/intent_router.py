@@ -0,0 +1,146 @@
+"""Roteador de intenções compilado para o Meta-Orquestrador.
+
+Todas as palavras-chave de todas as estratégias são compiladas em uma única
+expressão regular, organizada como uma trie de prefixos e delimitada por
+fronteiras de palavra. Assim, o texto da requisição é percorrido uma única
+vez, independentemente de quantas estratégias e palavras-chave estejam
+registradas, e termos como ``"researcher"`` não disparam a palavra
+``"research"``. Quando várias estratégias casam, vence a de maior
+prioridade; em caso de empate, a registrada primeiro.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from config_models import SystemConfig
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize(text: str) -> str:
+    """Normaliza caixa e espaços de uma palavra-chave ou trecho casado."""
+    return " ".join(text.casefold().split())
+
+
+@dataclass(frozen=True)
+class RoutingRule:
+    """Palavras-chave que direcionam requisições para uma estratégia."""
+
+    strategy: str
+    keywords: Tuple[str, ...] = field(default_factory=tuple)
+    priority: int = 0
+
+
+DEFAULT_RULES: Tuple[RoutingRule, ...] = (
+    RoutingRule("research", ("research", "pesquisa", "pesquisar"), priority=20),
+    RoutingRule(
+        "archivist", ("archive", "arquivar", "memoria", "memória", "memory"), priority=10
+    ),
+    RoutingRule("basic", ("basic",), priority=0),
+)
+"""Regras equivalentes à seção ``strategies`` do ``system_config.yaml``."""
+
+
+def _trie_pattern(words: Iterable[str]) -> str:
+    """Gera uma expressão regular em forma de trie para ``words``.
+
+    Prefixos comuns são fatorados, de modo que em cada posição do texto o
+    motor testa no máximo um caractere por nível da trie, em vez de testar
+    cada palavra-chave separadamente. Espaços casam qualquer sequência de
+    espaços em branco.
+    """
+    trie: Dict[str, Any] = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict[str, Any]) -> str:
+        branches = [
+            (r"\s+" if char == " " else re.escape(char)) + build(child)
+            for char, child in sorted(node.items())
+            if char
+        ]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            body = "(?:" + body + ")?"
+        return body
+
+    return build(trie)
+
+
+class IntentRouter:
+    """Seleciona a estratégia de uma requisição em uma única passada."""
+
+    def __init__(
+        self, rules: Iterable[RoutingRule] = DEFAULT_RULES, default: str = "basic"
+    ) -> None:
+        """Compila as regras de roteamento.
+
+        Args:
+            rules: Regras por estratégia, em ordem de desempate.
+            default: Estratégia usada quando nenhuma palavra-chave casa.
+        """
+        self.default = default
+        # Palavra-chave normalizada -> (prioridade negada, ordem, estratégia);
+        # a menor tupla vence.
+        self._keywords: Dict[str, Tuple[int, int, str]] = {}
+        for order, rule in enumerate(rules):
+            for keyword in rule.keywords:
+                key = _normalize(keyword)
+                if not key:
+                    continue
+                candidate = (-rule.priority, order, rule.strategy)
+                current = self._keywords.get(key)
+                if current is None or candidate < current:
+                    self._keywords[key] = candidate
+        self._pattern: Optional[re.Pattern[str]] = None
+        if self._keywords:
+            self._pattern = re.compile(
+                r"(?<!\w)" + _trie_pattern(self._keywords) + r"(?!\w)", re.IGNORECASE
+            )
+        logger.debug("Roteador compilado com %d palavras-chave", len(self._keywords))
+
+    @classmethod
+    def from_config(cls, config: SystemConfig, default: str = "basic") -> "IntentRouter":
+        """Cria o roteador a partir da seção ``strategies`` da configuração.
+
+        Sem estratégias configuradas, as regras padrão são utilizadas.
+        """
+        if not config.strategies:
+            return cls(DEFAULT_RULES, default)
+        rules = [
+            RoutingRule(name, tuple(strategy.keywords), strategy.priority)
+            for name, strategy in config.strategies.items()
+        ]
+        return cls(rules, default)
+
+    @property
+    def keywords(self) -> List[str]:
+        """Palavras-chave registradas, normalizadas."""
+        return list(self._keywords)
+
+    def route(self, text: str) -> str:
+        """Retorna a estratégia de maior prioridade cujas palavras aparecem em ``text``.
+
+        Args:
+            text: Texto da requisição.
+
+        Returns:
+            Identificador da estratégia, ou ``default`` se nada casar.
+        """
+        if self._pattern is None:
+            return self.default
+        best: Optional[Tuple[int, int, str]] = None
+        for match in self._pattern.finditer(text):
+            candidate = self._keywords.get(_normalize(match.group(0)))
+            if candidate is not None and (best is None or candidate < best):
+                best = candidate
+        return best[2] if best is not None else self.default
@@ -1,4 +1,4 @@
-from typing import Protocol
+from typing import List, Protocol, runtime_checkable
 
 from pydantic import BaseModel
 
@@ -25,3 +25,37 @@ class IExecutionStrategy(Protocol):
     def execute(self, request: UserRequest) -> AgentResponse:
         """Executa a estratégia baseada na requisição do usuário."""
         ...
+
+
+@runtime_checkable
+class IAsyncExecutionStrategy(Protocol):
+    """Contrato para estratégias com execução assíncrona nativa.
+
+    Estratégias que aguardam E/S (LLMs, ferramentas de busca, RAG) devem
+    implementá-lo para não ocupar uma thread do pool enquanto esperam.
+    """
+
+    async def aexecute(self, request: UserRequest) -> AgentResponse:
+        """Executa a estratégia sem bloquear o laço de eventos."""
+        ...
+
+
+@runtime_checkable
+class IBatchExecutionStrategy(Protocol):
+    """Contrato opcional para estratégias que processam lotes de requisições.
+
+    Permite agrupar chamadas de embeddings ou de LLM de várias requisições
+    em uma única chamada ao serviço externo.
+    """
+
+    def execute_batch(self, requests: List[UserRequest]) -> List[AgentResponse]:
+        """Executa a estratégia para ``requests``, retornando uma resposta por requisição."""
+        ...
+
+
+class IRequestRouter(Protocol):
+    """Contrato para roteadores que escolhem a estratégia de uma requisição."""
+
+    def route(self, text: str) -> str:
+        """Retorna o identificador da estratégia para ``text``."""
+        ...
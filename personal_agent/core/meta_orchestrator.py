@@ -6,12 +6,23 @@ mais profundo e ``ArchivistAgent`` para operações de arquivamento ou
 recuperação de memória.
 """
 
-from typing import Dict
+import asyncio
+from concurrent.futures import Executor
+from typing import Dict, List, Optional, Sequence
 
 from ..agents.archivist_agent import ArchivistAgent
 from ..strategies.basic_strategy import BasicStrategy
 from ..strategies.research_strategy import ResearchStrategy
-from .interfaces import AgentResponse, IExecutionStrategy, UserRequest
+from .instrumentation import ISpanSink, RequestSpan, emit
+from .intent_router import IntentRouter
+from .interfaces import (
+    AgentResponse,
+    IAsyncExecutionStrategy,
+    IBatchExecutionStrategy,
+    IExecutionStrategy,
+    IRequestRouter,
+    UserRequest,
+)
 import logging
 
 logger = logging.getLogger(__name__)
@@ -21,26 +32,67 @@ class MetaOrchestrator:
     """Analisa requisições e delega para ``BasicStrategy``,
     ``ResearchStrategy`` ou ``ArchivistAgent`` conforme necessário."""
 
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        router: Optional[IRequestRouter] = None,
+        executor: Optional[Executor] = None,
+        sinks: Sequence[ISpanSink] = (),
+    ) -> None:
         """Inicializa o orquestrador registrando as estratégias disponíveis.
 
         Inclui ``BasicStrategy`` para tarefas diretas,
         ``ResearchStrategy`` para solicitações que demandam pesquisa
         adicional e ``ArchivistAgent`` para requisições relacionadas a
         arquivamento de informações.
+
+        Args:
+            router: Roteador de intenções usado por :meth:`analyze_request`.
+                Por padrão, usa as regras equivalentes à seção
+                ``strategies`` do ``system_config.yaml``; use
+                :meth:`IntentRouter.from_config` para carregá-las da
+                configuração ou um :class:`SemanticRouter` para rotear por
+                similaridade com frases de exemplo.
+            executor: Pool em que :meth:`aexecute` executa estratégias
+                síncronas. Por padrão, usa o executor padrão do laço de
+                eventos.
+            sinks: Destinos dos spans de cada requisição, com a duração das
+                fases ``analyze``, ``select`` e ``execute``. Sem sinks, a
+                instrumentação fica desativada e não mede tempo algum.
         """
+        self.router: IRequestRouter = router or IntentRouter()
+        self.executor = executor
+        self.sinks: List[ISpanSink] = list(sinks)
         self.strategies: Dict[str, IExecutionStrategy] = {
             "basic": BasicStrategy(),
             "research": ResearchStrategy(),
             "archivist": ArchivistAgent(),
         }
 
+    def __enter__(self) -> "MetaOrchestrator":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Libera os recursos das estratégias registradas que definem ``close``.
+
+        Encerra, por exemplo, os pools de threads próprios das estratégias
+        envolvidas por :func:`apply_execution_policies`.
+        """
+        for strategy in self.strategies.values():
+            close = getattr(strategy, "close", None)
+            if callable(close):
+                close()
+
     def analyze_request(self, request: UserRequest) -> str:
         """Analisa a requisição do usuário para determinar a estratégia.
 
-        A análise identifica palavras-chave simples no texto para decidir
-        entre ``ResearchStrategy``, ``ArchivistAgent`` ou ``BasicStrategy``.
-        Se nenhuma palavra for encontrada, ``BasicStrategy`` é utilizada como
+        Por padrão, o texto é percorrido uma única vez pelo
+        :class:`IntentRouter`, que
+        casa palavras inteiras de todas as estratégias e escolhe a de maior
+        prioridade (``ResearchStrategy`` antes de ``ArchivistAgent``). Se
+        nenhuma palavra for encontrada, ``BasicStrategy`` é utilizada como
         padrão.
 
         Args:
@@ -49,14 +101,7 @@ class MetaOrchestrator:
         Returns:
             Identificador da estratégia a ser utilizada.
         """
-        text = request.text.lower()
-        if any(keyword in text for keyword in ("research", "pesquisa")):
-            return "research"
-        if any(keyword in text for keyword in ("archive", "arquivar", "memoria", "memory")):
-            return "archivist"
-        if "basic" in text:
-            return "basic"
-        return "basic"
+        return self.router.route(request.text)
 
     def select_strategy(self, analysis: str) -> IExecutionStrategy:
         """Seleciona a estratégia apropriada com base na análise.
@@ -76,6 +121,44 @@ class MetaOrchestrator:
             logger.warning("Estratégia desconhecida: %s. Utilizando 'basic'.", analysis)
             return self.strategies["basic"]
 
+    def _route(
+        self, request: UserRequest, span: Optional[RequestSpan], debug: bool
+    ) -> IExecutionStrategy:
+        """Analisa a requisição e seleciona a estratégia, marcando o span."""
+        if debug:
+            logger.debug("Analisando a requisição")
+        analysis = self.analyze_request(request)
+        if span is not None:
+            span.strategy = analysis
+            span.mark("analyze")
+        if debug:
+            logger.debug("Análise concluída: %s", analysis)
+            logger.debug("Selecionando estratégia")
+        strategy = self.select_strategy(analysis)
+        if span is not None:
+            span.mark("select")
+        if debug:
+            logger.debug("Estratégia selecionada: %s", strategy.__class__.__name__)
+        return strategy
+
+    def _finish(
+        self,
+        strategy: IExecutionStrategy,
+        span: Optional[RequestSpan],
+        error: Optional[Exception] = None,
+    ) -> None:
+        """Registra o erro, se houver, e entrega o span aos sinks."""
+        if error is not None:
+            logger.error(
+                "Erro ao executar a estratégia %s: %s",
+                strategy.__class__.__name__,
+                error,
+            )
+        if span is not None:
+            span.mark("execute")
+            span.finish(error)
+            emit(self.sinks, span)
+
     def execute(self, request: UserRequest) -> AgentResponse:
         """Processa a requisição e executa a estratégia selecionada.
 
@@ -87,26 +170,108 @@ class MetaOrchestrator:
             ``ResearchStrategy`` conforme definido pela análise.
         """
         logger.info("Iniciando processamento da requisição do usuário")
+        debug = logger.isEnabledFor(logging.DEBUG)
+        span = RequestSpan() if self.sinks else None
+        strategy = self._route(request, span, debug)
 
-        logger.debug("Analisando a requisição")
-        analysis = self.analyze_request(request)
-        logger.debug("Análise concluída: %s", analysis)
+        if debug:
+            logger.debug("Executando estratégia")
+        try:
+            response = strategy.execute(request)
+        except Exception as exc:
+            self._finish(strategy, span, exc)
+            raise
+        self._finish(strategy, span)
+        if debug:
+            logger.debug("Execução concluída: %s", response)
 
-        logger.debug("Selecionando estratégia")
-        strategy = self.select_strategy(analysis)
-        logger.debug("Estratégia selecionada: %s", strategy.__class__.__name__)
+        logger.info("Processamento da requisição concluído")
+        return response
+
+    async def aexecute(self, request: UserRequest) -> AgentResponse:
+        """Versão assíncrona de :meth:`execute`.
+
+        Estratégias que implementam :class:`IAsyncExecutionStrategy` são
+        aguardadas diretamente; as demais rodam em ``executor``, de modo que
+        uma estratégia lenta não bloqueia o laço de eventos e várias
+        requisições podem ser atendidas concorrentemente.
+
+        Args:
+            request: Requisição do usuário a ser processada.
+
+        Returns:
+            Resposta do agente gerada pela estratégia selecionada.
+        """
+        logger.info("Iniciando processamento assíncrono da requisição do usuário")
+        debug = logger.isEnabledFor(logging.DEBUG)
+        span = RequestSpan() if self.sinks else None
+        strategy = self._route(request, span, debug)
 
-        logger.debug("Executando estratégia")
         try:
-            response = strategy.execute(request)
-        except Exception as exc:  # pragma: no cover - logging tested separately
-            logger.error(
-                "Erro ao executar a estratégia %s: %s",
-                strategy.__class__.__name__,
-                exc,
-            )
+            if isinstance(strategy, IAsyncExecutionStrategy):
+                response = await strategy.aexecute(request)
+            else:
+                loop = asyncio.get_running_loop()
+                response = await loop.run_in_executor(
+                    self.executor, strategy.execute, request
+                )
+        except Exception as exc:
+            self._finish(strategy, span, exc)
             raise
-        logger.debug("Execução concluída: %s", response)
+        self._finish(strategy, span)
+        if debug:
+            logger.debug("Execução concluída: %s", response)
 
         logger.info("Processamento da requisição concluído")
         return response
+
+    def run_batch(self, analysis: str, requests: List[UserRequest]) -> List[AgentResponse]:
+        """Executa um lote de requisições já roteadas para ``analysis``.
+
+        Estratégias que implementam :class:`IBatchExecutionStrategy` recebem
+        o lote inteiro em uma única chamada; as demais são executadas
+        requisição a requisição.
+
+        Args:
+            analysis: Identificador da estratégia, como em :meth:`select_strategy`.
+            requests: Requisições do lote.
+
+        Returns:
+            Uma resposta por requisição, na mesma ordem.
+
+        Raises:
+            ValueError: Se a estratégia não retornar uma resposta por requisição.
+        """
+        strategy = self.select_strategy(analysis)
+        if not isinstance(strategy, IBatchExecutionStrategy):
+            return [strategy.execute(request) for request in requests]
+        responses = strategy.execute_batch(requests)
+        if len(responses) != len(requests):
+            raise ValueError(
+                f"{strategy.__class__.__name__} retornou {len(responses)} respostas "
+                f"para {len(requests)} requisições"
+            )
+        return responses
+
+    def execute_many(self, requests: List[UserRequest]) -> List[AgentResponse]:
+        """Processa várias requisições agrupando-as por estratégia.
+
+        Cada grupo é executado com :meth:`run_batch`, de modo que estratégias
+        com suporte a lotes atendem todas as suas requisições de uma vez.
+
+        Args:
+            requests: Requisições do usuário.
+
+        Returns:
+            Uma resposta por requisição, na ordem de entrada.
+        """
+        groups: Dict[str, List[int]] = {}
+        for position, request in enumerate(requests):
+            groups.setdefault(self.analyze_request(request), []).append(position)
+        responses: List[Optional[AgentResponse]] = [None] * len(requests)
+        for analysis, positions in groups.items():
+            logger.debug("Executando lote de %d requisições em %s", len(positions), analysis)
+            batch = self.run_batch(analysis, [requests[i] for i in positions])
+            for position, response in zip(positions, batch):
+                responses[position] = response
+        return [response for response in responses if response is not None]
@@ -0,0 +1,458 @@
+"""Políticas de execução para degradação graciosa das estratégias.
+
+Uma :class:`ResilientStrategy` envolve uma estratégia e aplica a ela a
+:class:`ExecutionPolicy` configurada:
+
+* **prazo**: cada tentativa roda em um pool de threads e é abandonada com
+  :class:`TimeoutError` quando excede ``timeout``. Python não interrompe
+  threads, então a tentativa abandonada continua ocupando um worker até
+  terminar; o pool limitado a ``workers`` threads evita que tentativas
+  travadas se acumulem sem limite. As threads são daemon, de modo que uma
+  tentativa travada não impede o processo de encerrar, e :meth:`close`
+  descarta as tentativas ainda na fila. Em ``aexecute`` a tentativa é
+  cancelada;
+* **novas tentativas**: até ``retries`` tentativas extras, separadas por um
+  backoff exponencial com *full jitter*, para que clientes que falharam
+  juntos não tentem novamente em sincronia;
+* **circuit breaker**: após ``failure_threshold`` requisições seguidas com
+  falha, o circuito abre e as requisições vão direto para a estratégia de
+  fallback, sem esperar pelo serviço indisponível. Passado
+  ``recovery_time``, uma requisição de teste decide se o circuito fecha.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import queue
+import random
+import threading
+import time
+from concurrent.futures import Executor, Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Type, TypeVar, cast
+
+from config_models import ExecutionPolicy, SystemConfig
+
+from .interfaces import (
+    AgentResponse,
+    IAsyncExecutionStrategy,
+    IBatchExecutionStrategy,
+    IExecutionStrategy,
+    UserRequest,
+)
+from .meta_orchestrator import MetaOrchestrator
+
+logger = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+_Task = Tuple["Future[Any]", Callable[[], Any]]
+
+
+class _DaemonExecutor(Executor):
+    """Pool limitado de threads daemon para as tentativas com prazo.
+
+    As threads de :class:`~concurrent.futures.ThreadPoolExecutor` são
+    aguardadas na saída do interpretador, mesmo após ``shutdown``; uma
+    tentativa travada atrasaria o encerramento do processo.
+    """
+
+    def __init__(self, max_workers: int, name: str) -> None:
+        self._max_workers = max_workers
+        self._name = name
+        self._queue: "queue.SimpleQueue[Optional[_Task]]" = queue.SimpleQueue()
+        self._idle = threading.Semaphore(0)
+        self._threads: List[threading.Thread] = []
+        self._shutdown = False
+        self._lock = threading.Lock()
+
+    def submit(self, fn: Callable[..., _R], /, *args: Any, **kwargs: Any) -> "Future[_R]":
+        future: "Future[_R]" = Future()
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("pool de tentativas encerrado")
+            self._queue.put((future, lambda: fn(*args, **kwargs)))
+            if not self._idle.acquire(blocking=False) and len(self._threads) < self._max_workers:
+                thread = threading.Thread(
+                    target=self._work,
+                    name=f"{self._name}_{len(self._threads)}",
+                    daemon=True,
+                )
+                thread.start()
+                self._threads.append(thread)
+        return future
+
+    def _work(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.put(None)
+                return
+            future, call = item
+            if future.set_running_or_notify_cancel():
+                try:
+                    result = call()
+                except BaseException as exc:
+                    future.set_exception(exc)
+                else:
+                    future.set_result(result)
+            self._idle.release()
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        with self._lock:
+            self._shutdown = True
+        if cancel_futures:
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not None:
+                    item[0].cancel()
+        self._queue.put(None)
+        if wait:
+            for thread in self._threads:
+                thread.join()
+
+
+class CircuitOpen(RuntimeError):
+    """Indica que o circuito está aberto e não há estratégia de fallback."""
+
+
+class CircuitBreaker:
+    """Circuit breaker de três estados: fechado, aberto e meio-aberto."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_time: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Cria o circuito fechado.
+
+        Args:
+            failure_threshold: Falhas seguidas que abrem o circuito.
+            recovery_time: Segundos até uma requisição de teste ser permitida.
+            clock: Fonte de tempo, injetável em testes.
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Estado atual do circuito."""
+        with self._lock:
+            if self._opened_at is None:
+                return self.CLOSED
+            if self._clock() - self._opened_at >= self.recovery_time:
+                return self.HALF_OPEN
+            return self.OPEN
+
+    def allow(self) -> bool:
+        """Indica se uma requisição pode seguir para a estratégia.
+
+        No estado meio-aberto, apenas uma requisição de teste é liberada
+        por vez.
+        """
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._trial_running or self._clock() - self._opened_at < self.recovery_time:
+                return False
+            self._trial_running = True
+            return True
+
+    def record_success(self) -> None:
+        """Fecha o circuito e zera a contagem de falhas."""
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info("Circuito fechado após requisição de teste bem-sucedida")
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self) -> None:
+        """Conta uma falha, abrindo o circuito ao atingir o limite."""
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or self._failures >= self.failure_threshold:
+                if self._opened_at is None:
+                    logger.warning("Circuito aberto após %d falhas seguidas", self._failures)
+                self._opened_at = self._clock()
+            self._trial_running = False
+
+
+class ResilientStrategy(IExecutionStrategy):
+    """Aplica prazo, novas tentativas e circuit breaker a uma estratégia.
+
+    O objeto criado preserva as capacidades da estratégia protegida: se ela
+    implementa :class:`IAsyncExecutionStrategy` ou
+    :class:`IBatchExecutionStrategy`, ``aexecute`` e ``execute_batch`` também
+    passam pela política. Em lotes, o prazo e as tentativas valem para o
+    lote inteiro.
+    """
+
+    def __new__(
+        cls, strategy: IExecutionStrategy, policy: ExecutionPolicy, *args: Any, **kwargs: Any
+    ) -> "ResilientStrategy":
+        if cls is ResilientStrategy:
+            cls = _CAPABILITIES[
+                (
+                    isinstance(strategy, IAsyncExecutionStrategy),
+                    isinstance(strategy, IBatchExecutionStrategy),
+                )
+            ]
+        return super().__new__(cls)
+
+    def __init__(
+        self,
+        strategy: IExecutionStrategy,
+        policy: ExecutionPolicy,
+        fallback: Optional[IExecutionStrategy] = None,
+        executor: Optional[Executor] = None,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: Optional[random.Random] = None,
+        clock: Callable[[], float] = time.monotonic,
+        asleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        """Associa a política à estratégia.
+
+        Args:
+            strategy: Estratégia protegida.
+            policy: Prazo, novas tentativas e parâmetros do circuito.
+            fallback: Estratégia usada com o circuito aberto ou quando todas
+                as tentativas falham. Sem ela, o erro é propagado.
+            executor: Pool das tentativas com prazo, que continua sendo do
+                chamador. Por padrão, cria um pool próprio de
+                ``policy.workers`` threads daemon quando ``policy.timeout`` é
+                definido, encerrado por :meth:`close`.
+            sleep: Função de espera entre tentativas, injetável em testes.
+            rng: Gerador do jitter, injetável em testes.
+            clock: Fonte de tempo do circuit breaker.
+            asleep: Espera entre tentativas de ``aexecute``.
+        """
+        self.strategy = strategy
+        self.policy = policy
+        self.fallback = fallback
+        self.breaker = CircuitBreaker(policy.failure_threshold, policy.recovery_time, clock)
+        self._sleep = sleep
+        self._asleep = asleep
+        self._rng = rng or random.Random()
+        self._executor = executor
+        self._owns_executor = executor is None and policy.timeout is not None
+        if self._owns_executor:
+            self._executor = _DaemonExecutor(policy.workers, "policy-" + type(strategy).__name__)
+        if hasattr(strategy, "cacheable"):
+            self.cacheable = strategy.cacheable
+
+    def __enter__(self) -> "ResilientStrategy":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Encerra o pool próprio sem aguardar tentativas travadas.
+
+        Tentativas ainda na fila são canceladas; as novas falham e seguem
+        para o fallback.
+        """
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _attempt(self, call: Callable[[_T], _R], arg: _T) -> _R:
+        """Executa uma tentativa, respeitando o prazo da política."""
+        if self._executor is None:
+            return call(arg)
+        future = self._executor.submit(call, arg)
+        try:
+            return future.result(timeout=self.policy.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise self._timeout_error() from None
+
+    def _timeout_error(self) -> TimeoutError:
+        return TimeoutError(
+            f"{type(self.strategy).__name__} excedeu o prazo de {self.policy.timeout}s"
+        )
+
+    def _delay(self, attempt: int) -> float:
+        """Espera antes da próxima tentativa: backoff exponencial com full jitter."""
+        ceiling = min(self.policy.max_backoff, self.policy.backoff * 2 ** attempt)
+        return self._rng.uniform(0.0, ceiling)
+
+    def _log_failure(self, attempt: int, error: Exception) -> None:
+        logger.warning(
+            "Tentativa %d de %s falhou: %s", attempt + 1, type(self.strategy).__name__, error
+        )
+
+    def _circuit_open(self) -> CircuitOpen:
+        return CircuitOpen(f"circuito de {type(self.strategy).__name__} aberto")
+
+    def _check_fallback(self, error: Exception) -> IExecutionStrategy:
+        """Retorna o fallback ou propaga ``error`` se não houver um."""
+        if self.fallback is None:
+            raise error
+        logger.warning(
+            "Usando fallback %s para %s: %s",
+            type(self.fallback).__name__,
+            type(self.strategy).__name__,
+            error,
+        )
+        return self.fallback
+
+    def _degrade(self, request: UserRequest, error: Exception) -> AgentResponse:
+        """Serve a requisição pelo fallback ou propaga ``error``."""
+        return self._check_fallback(error).execute(request)
+
+    def _guard(self, run: Callable[[], _R], degrade: Callable[[Exception], _R]) -> _R:
+        """Aplica circuito e novas tentativas a ``run``, degradando em caso de falha."""
+        if not self.breaker.allow():
+            return degrade(self._circuit_open())
+        for attempt in range(self.policy.retries + 1):
+            try:
+                result = run()
+            except Exception as exc:
+                error = exc
+                self._log_failure(attempt, exc)
+                if attempt < self.policy.retries:
+                    self._sleep(self._delay(attempt))
+                continue
+            self.breaker.record_success()
+            return result
+        self.breaker.record_failure()
+        return degrade(error)
+
+    def execute(self, request: UserRequest) -> AgentResponse:
+        """Executa a estratégia protegida aplicando a política.
+
+        Args:
+            request: Requisição do usuário.
+
+        Returns:
+            Resposta da estratégia protegida ou, se ela estiver indisponível,
+            do fallback.
+
+        Raises:
+            CircuitOpen: Se o circuito estiver aberto e não houver fallback.
+            Exception: O último erro da estratégia, se todas as tentativas
+                falharem e não houver fallback.
+        """
+        return self._guard(
+            lambda: self._attempt(self.strategy.execute, request),
+            lambda error: self._degrade(request, error),
+        )
+
+
+class _AsyncResilientStrategy(ResilientStrategy):
+    """Política aplicada a uma estratégia assíncrona."""
+
+    async def aexecute(self, request: UserRequest) -> AgentResponse:
+        """Versão assíncrona de :meth:`execute`.
+
+        O prazo é aplicado com :func:`asyncio.wait_for`, que cancela a
+        tentativa em vez de ocupar uma thread do pool.
+        """
+        if not self.breaker.allow():
+            return await self._adegrade(request, self._circuit_open())
+        strategy = cast(IAsyncExecutionStrategy, self.strategy)
+        for attempt in range(self.policy.retries + 1):
+            try:
+                response = await asyncio.wait_for(
+                    strategy.aexecute(request), self.policy.timeout
+                )
+            except asyncio.TimeoutError:
+                error: Exception = self._timeout_error()
+            except Exception as exc:
+                error = exc
+            else:
+                self.breaker.record_success()
+                return response
+            self._log_failure(attempt, error)
+            if attempt < self.policy.retries:
+                await self._asleep(self._delay(attempt))
+        self.breaker.record_failure()
+        return await self._adegrade(request, error)
+
+    async def _adegrade(self, request: UserRequest, error: Exception) -> AgentResponse:
+        """Serve a requisição pelo fallback sem bloquear o laço de eventos."""
+        fallback = self._check_fallback(error)
+        if isinstance(fallback, IAsyncExecutionStrategy):
+            return await fallback.aexecute(request)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, fallback.execute, request)
+
+
+class _BatchResilientStrategy(ResilientStrategy):
+    """Política aplicada a uma estratégia que processa lotes."""
+
+    def execute_batch(self, requests: List[UserRequest]) -> List[AgentResponse]:
+        """Executa o lote pela estratégia protegida aplicando a política."""
+        strategy = cast(IBatchExecutionStrategy, self.strategy)
+        return self._guard(
+            lambda: self._attempt(strategy.execute_batch, requests),
+            lambda error: self._degrade_batch(requests, error),
+        )
+
+    def _degrade_batch(
+        self, requests: List[UserRequest], error: Exception
+    ) -> List[AgentResponse]:
+        """Serve o lote pelo fallback ou propaga ``error``."""
+        fallback = self._check_fallback(error)
+        if isinstance(fallback, IBatchExecutionStrategy):
+            return fallback.execute_batch(requests)
+        return [fallback.execute(request) for request in requests]
+
+
+class _AsyncBatchResilientStrategy(_AsyncResilientStrategy, _BatchResilientStrategy):
+    """Política aplicada a uma estratégia assíncrona que processa lotes."""
+
+
+_CAPABILITIES: Dict[Tuple[bool, bool], Type[ResilientStrategy]] = {
+    (False, False): ResilientStrategy,
+    (True, False): _AsyncResilientStrategy,
+    (False, True): _BatchResilientStrategy,
+    (True, True): _AsyncBatchResilientStrategy,
+}
+"""Classe do wrapper por (assíncrona, lotes) da estratégia protegida."""
+
+
+def apply_execution_policies(
+    orchestrator: MetaOrchestrator, config: SystemConfig
+) -> Dict[str, ResilientStrategy]:
+    """Envolve as estratégias com ``policy`` configurada em :class:`ResilientStrategy`.
+
+    O fallback de cada política é a estratégia registrada no orquestrador
+    com o nome indicado, antes de ser envolvida.
+
+    Args:
+        orchestrator: Orquestrador cujas estratégias serão envolvidas.
+        config: Configuração com a seção ``strategies``.
+
+    Returns:
+        As estratégias envolvidas, por identificador.
+    """
+    originals = dict(orchestrator.strategies)
+    wrapped: Dict[str, ResilientStrategy] = {}
+    for name, strategy in config.strategies.items():
+        policy = strategy.policy
+        if policy is None or name not in originals:
+            continue
+        fallback = None
+        if policy.fallback is not None and policy.fallback != name:
+            fallback = originals.get(policy.fallback)
+            if fallback is None:
+                logger.warning("Fallback desconhecido %s para %s", policy.fallback, name)
+        wrapped[name] = ResilientStrategy(originals[name], policy, fallback)
+        orchestrator.strategies[name] = wrapped[name]
+    return wrapped
@@ -0,0 +1,346 @@
+"""Cache de respostas na frente das estratégias do Meta-Orquestrador.
+
+Requisições idênticas após a normalização do texto reaproveitam a resposta
+já calculada pela estratégia. As entradas expiram após um TTL e o cache é
+limitado por uma política LRU. Requisições idênticas concorrentes
+compartilham uma única execução (*single-flight*): a primeira executa a
+estratégia e as demais aguardam seu resultado.
+
+O cache é opcional e configurado por estratégia. Estratégias declaram se
+podem ser cacheadas pelo atributo de classe ``cacheable``; estratégias com
+efeitos colaterais, como ``ArchivistAgent``, devem declarar ``False``.
+O wrapper mantém ``aexecute`` e ``execute_batch`` da estratégia envolvida;
+em lotes, apenas as requisições ausentes do cache são executadas.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable, Dict, List, Optional, Tuple, Type, cast
+
+from config_models import CacheSettings, SystemConfig
+
+from .interfaces import (
+    AgentResponse,
+    IAsyncExecutionStrategy,
+    IBatchExecutionStrategy,
+    IExecutionStrategy,
+    UserRequest,
+)
+from .meta_orchestrator import MetaOrchestrator
+
+logger = logging.getLogger(__name__)
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+
+
+def _collapse_whitespace(text: str) -> str:
+    return " ".join(text.split())
+
+
+def _casefold(text: str) -> str:
+    return " ".join(text.casefold().split())
+
+
+def _alphanumeric(text: str) -> str:
+    return " ".join(_PUNCTUATION.sub(" ", text.casefold()).split())
+
+
+NORMALIZERS: Dict[str, Callable[[str], str]] = {
+    "exact": str,
+    "whitespace": _collapse_whitespace,
+    "casefold": _casefold,
+    "alphanumeric": _alphanumeric,
+}
+"""Normalizações de chave disponíveis em ``CacheSettings.normalization``."""
+
+
+class ResponseCache:
+    """Cache LRU/TTL de respostas com de-duplicação de execuções concorrentes."""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: Optional[float] = 300.0,
+        normalizer: Callable[[str], str] = _casefold,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Cria o cache.
+
+        Args:
+            max_entries: Número máximo de respostas armazenadas.
+            ttl: Segundos de validade de uma resposta; ``None`` desativa a
+                expiração.
+            normalizer: Função que transforma o texto da requisição na chave.
+            clock: Fonte de tempo, injetável em testes.
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries deve ser positivo")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.normalizer = normalizer
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, AgentResponse]]" = OrderedDict()
+        self._inflight: Dict[str, "Future[AgentResponse]"] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls, settings: CacheSettings) -> "ResponseCache":
+        """Cria o cache a partir da seção ``cache`` de uma estratégia."""
+        return cls(settings.max_entries, settings.ttl, NORMALIZERS[settings.normalization])
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_compute(
+        self, text: str, compute: Callable[[], AgentResponse]
+    ) -> AgentResponse:
+        """Retorna a resposta cacheada de ``text`` ou a calcula com ``compute``.
+
+        Se outra thread já estiver calculando a mesma chave, aguarda o
+        resultado dela em vez de executar ``compute`` novamente. Exceções
+        são repassadas a todas as chamadas que aguardavam e não são
+        armazenadas.
+        """
+        key = self.normalizer(text)
+        with self._lock:
+            cached = self._fresh(key)
+            if cached is not None:
+                self.hits += 1
+                return cached
+            pending = self._inflight.get(key)
+            if pending is not None:
+                self.shared += 1
+            else:
+                self.misses += 1
+                future: "Future[AgentResponse]" = Future()
+                self._inflight[key] = future
+        if pending is not None:
+            return pending.result()
+
+        try:
+            response = compute()
+        except BaseException as exc:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(exc)
+            raise
+        with self._lock:
+            del self._inflight[key]
+            self._insert(key, response)
+        future.set_result(response)
+        return response
+
+    def lookup(self, text: str) -> Optional[AgentResponse]:
+        """Retorna a resposta cacheada de ``text`` ou ``None``, sem calculá-la.
+
+        Usado pelos caminhos que não passam pelo *single-flight*; uma
+        ausência é contada como falha.
+        """
+        key = self.normalizer(text)
+        with self._lock:
+            response = self._fresh(key)
+            if response is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+            return response
+
+    def store(self, text: str, response: AgentResponse) -> None:
+        """Armazena ``response`` como a resposta de ``text``."""
+        key = self.normalizer(text)
+        with self._lock:
+            self._insert(key, response)
+
+    def _fresh(self, key: str) -> Optional[AgentResponse]:
+        """Entrada válida de ``key``, removendo-a se expirada; exige o lock."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        created, response = entry
+        if self.ttl is not None and self._clock() - created > self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return response
+
+    def _insert(self, key: str, response: AgentResponse) -> None:
+        """Armazena ``response`` aplicando o limite LRU; exige o lock."""
+        self._entries[key] = (self._clock(), response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Remove todas as entradas; os contadores são mantidos."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """Acertos, falhas, execuções compartilhadas e taxa de acerto."""
+        with self._lock:
+            total = self.hits + self.misses + self.shared
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "shared": self.shared,
+                "hit_rate": (self.hits + self.shared) / total if total else 0.0,
+                "entries": len(self._entries),
+            }
+
+
+class CachedStrategy(IExecutionStrategy):
+    """Envolve uma estratégia servindo respostas repetidas a partir do cache.
+
+    O objeto criado preserva as capacidades da estratégia envolvida: se ela
+    implementa :class:`IAsyncExecutionStrategy` ou
+    :class:`IBatchExecutionStrategy`, o wrapper também as implementa, de modo
+    que o orquestrador continua usando ``aexecute`` e ``execute_batch``.
+    """
+
+    def __new__(cls, strategy: IExecutionStrategy, cache: ResponseCache) -> "CachedStrategy":
+        if cls is CachedStrategy:
+            cls = _CAPABILITIES[
+                (
+                    isinstance(strategy, IAsyncExecutionStrategy),
+                    isinstance(strategy, IBatchExecutionStrategy),
+                )
+            ]
+        return super().__new__(cls)
+
+    def __init__(self, strategy: IExecutionStrategy, cache: ResponseCache) -> None:
+        """Associa ``strategy`` ao ``cache``."""
+        self.strategy = strategy
+        self.cache = cache
+        if hasattr(strategy, "cacheable"):
+            self.cacheable = strategy.cacheable
+
+    def execute(self, request: UserRequest) -> AgentResponse:
+        """Retorna a resposta cacheada ou executa a estratégia envolvida.
+
+        Args:
+            request: Requisição do usuário.
+
+        Returns:
+            Resposta da estratégia envolvida.
+        """
+        return self.cache.get_or_compute(request.text, lambda: self.strategy.execute(request))
+
+    def close(self) -> None:
+        """Repassa ``close`` à estratégia envolvida, se ela o definir."""
+        close = getattr(self.strategy, "close", None)
+        if callable(close):
+            close()
+
+
+class _AsyncCachedStrategy(CachedStrategy):
+    """Cache na frente de uma estratégia assíncrona."""
+
+    async def aexecute(self, request: UserRequest) -> AgentResponse:
+        """Retorna a resposta cacheada ou aguarda a estratégia envolvida.
+
+        Execuções assíncronas concorrentes da mesma chave não são
+        de-duplicadas: aguardar o *single-flight* bloquearia o laço de eventos.
+        """
+        response = self.cache.lookup(request.text)
+        if response is None:
+            strategy = cast(IAsyncExecutionStrategy, self.strategy)
+            response = await strategy.aexecute(request)
+            self.cache.store(request.text, response)
+        return response
+
+
+class _BatchCachedStrategy(CachedStrategy):
+    """Cache na frente de uma estratégia que processa lotes."""
+
+    def execute_batch(self, requests: List[UserRequest]) -> List[AgentResponse]:
+        """Serve as requisições cacheadas e executa as demais em um único lote.
+
+        Requisições do lote com a mesma chave são executadas uma única vez.
+
+        Raises:
+            ValueError: Se a estratégia não retornar uma resposta por
+                requisição executada; nada é armazenado nesse caso.
+        """
+        responses: List[Optional[AgentResponse]] = [None] * len(requests)
+        missing: Dict[str, List[int]] = {}
+        for i, request in enumerate(requests):
+            key = self.cache.normalizer(request.text)
+            if key in missing:
+                missing[key].append(i)
+                continue
+            responses[i] = self.cache.lookup(request.text)
+            if responses[i] is None:
+                missing[key] = [i]
+        if missing:
+            strategy = cast(IBatchExecutionStrategy, self.strategy)
+            computed = strategy.execute_batch([requests[rows[0]] for rows in missing.values()])
+            if len(computed) != len(missing):
+                raise ValueError(
+                    f"{type(self.strategy).__name__} retornou {len(computed)} respostas "
+                    f"para {len(missing)} requisições"
+                )
+            for rows, response in zip(missing.values(), computed):
+                self.cache.store(requests[rows[0]].text, response)
+                for i in rows:
+                    responses[i] = response
+        return cast(List[AgentResponse], responses)
+
+
+class _AsyncBatchCachedStrategy(_AsyncCachedStrategy, _BatchCachedStrategy):
+    """Cache na frente de uma estratégia assíncrona que processa lotes."""
+
+
+_CAPABILITIES: Dict[Tuple[bool, bool], Type[CachedStrategy]] = {
+    (False, False): CachedStrategy,
+    (True, False): _AsyncCachedStrategy,
+    (False, True): _BatchCachedStrategy,
+    (True, True): _AsyncBatchCachedStrategy,
+}
+"""Classe do wrapper por (assíncrona, lotes) da estratégia envolvida."""
+
+
+def enable_response_caches(
+    orchestrator: MetaOrchestrator, config: Optional[SystemConfig] = None
+) -> Dict[str, ResponseCache]:
+    """Coloca um cache de respostas na frente das estratégias cacheáveis.
+
+    Uma estratégia é cacheada quando ``cache.enabled`` é ``True`` em sua
+    seção de ``strategies`` ou, se não definido, quando declara
+    ``cacheable = True``. Estratégias que declaram ``cacheable = False``,
+    por terem efeitos colaterais, nunca são cacheadas.
+
+    Args:
+        orchestrator: Orquestrador cujas estratégias serão envolvidas.
+        config: Configuração com a seção ``cache`` de cada estratégia;
+            estratégias ausentes usam os valores padrão de
+            :class:`CacheSettings`.
+
+    Returns:
+        Os caches criados, por identificador de estratégia.
+    """
+    configured = config.strategies if config is not None else {}
+    caches: Dict[str, ResponseCache] = {}
+    for name, strategy in list(orchestrator.strategies.items()):
+        if isinstance(strategy, CachedStrategy):
+            continue
+        settings = configured[name].cache if name in configured else CacheSettings()
+        cacheable = getattr(strategy, "cacheable", None)
+        if cacheable is False:
+            if settings.enabled:
+                logger.warning("Estratégia %s não pode ser cacheada; cache ignorado", name)
+            continue
+        if not (settings.enabled if settings.enabled is not None else cacheable):
+            continue
+        caches[name] = ResponseCache.from_settings(settings)
+        orchestrator.strategies[name] = CachedStrategy(strategy, caches[name])
+        logger.debug("Cache de respostas habilitado para %s", name)
+    return caches
@@ -0,0 +1,215 @@
+"""Agendador com limites de concorrência por estratégia.
+
+Cada estratégia tem uma faixa própria com um limite de execuções
+simultâneas e uma fila de espera limitada, de modo que uma rajada de
+requisições ``research`` não ocupa os recursos de ``basic`` nem excede os
+limites de taxa dos serviços externos. Na fila, requisições de maior
+prioridade são atendidas primeiro. Quando a fila está cheia, a requisição
+de menor prioridade é descartada imediatamente com
+:class:`SchedulerOverloaded`, em vez de acumular latência.
+"""
+
+from __future__ import annotations
+
+import heapq
+import itertools
+import logging
+import threading
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from config_models import ExecutionLimits, SystemConfig
+
+from .interfaces import AgentResponse, UserRequest
+from .meta_orchestrator import MetaOrchestrator
+
+logger = logging.getLogger(__name__)
+
+_Queued = Tuple[int, int, UserRequest, "Future[AgentResponse]"]
+
+
+class SchedulerOverloaded(RuntimeError):
+    """Indica que a fila da estratégia está cheia e a requisição foi descartada."""
+
+
+@dataclass
+class _Lane:
+    """Estado de uma estratégia: execuções em andamento e fila de espera."""
+
+    limits: ExecutionLimits
+    running: int = 0
+    queue: List[_Queued] = field(default_factory=list)
+    completed: int = 0
+    rejected: int = 0
+
+
+class StrategyScheduler:
+    """Executa estratégias em um pool respeitando os limites de cada uma."""
+
+    def __init__(
+        self,
+        orchestrator: MetaOrchestrator,
+        limits: Optional[Mapping[str, ExecutionLimits]] = None,
+        default_limits: Optional[ExecutionLimits] = None,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        """Cria as faixas das estratégias.
+
+        Args:
+            orchestrator: Orquestrador que roteia e seleciona as estratégias.
+            limits: Limites por identificador de estratégia.
+            default_limits: Limites das estratégias ausentes de ``limits``.
+            executor: Pool que executa as estratégias. Pools de processos
+                exigem estratégias serializáveis. Por padrão, cria um pool de
+                threads com uma thread por vaga de concorrência.
+        """
+        self.orchestrator = orchestrator
+        self.default_limits = default_limits or ExecutionLimits()
+        self._lock = threading.Lock()
+        self._sequence = itertools.count()
+        self._lanes: Dict[str, _Lane] = {
+            name: _Lane(lane_limits) for name, lane_limits in (limits or {}).items()
+        }
+        for name in orchestrator.strategies:
+            self._lane(name)
+        self._owns_executor = executor is None
+        self.executor: Executor = executor or ThreadPoolExecutor(
+            max_workers=sum(lane.limits.max_concurrency for lane in self._lanes.values()),
+            thread_name_prefix="strategy",
+        )
+
+    @classmethod
+    def from_config(
+        cls,
+        orchestrator: MetaOrchestrator,
+        config: SystemConfig,
+        executor: Optional[Executor] = None,
+    ) -> "StrategyScheduler":
+        """Cria o agendador com os ``limits`` da seção ``strategies``."""
+        limits = {name: strategy.limits for name, strategy in config.strategies.items()}
+        return cls(orchestrator, limits, executor=executor)
+
+    def __enter__(self) -> "StrategyScheduler":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _lane(self, analysis: str) -> _Lane:
+        """Retorna a faixa de ``analysis``; deve ser chamado com o lock."""
+        lane = self._lanes.get(analysis)
+        if lane is None:
+            lane = self._lanes[analysis] = _Lane(self.default_limits)
+        return lane
+
+    def submit(self, request: UserRequest, priority: int = 0) -> "Future[AgentResponse]":
+        """Agenda ``request`` e retorna um futuro com sua resposta.
+
+        Args:
+            request: Requisição do usuário.
+            priority: Prioridade na fila da estratégia; maior é atendida antes.
+
+        Returns:
+            Futuro resolvido com a resposta da estratégia. Se a requisição for
+            descartada depois de enfileirada por outra de maior prioridade, o
+            futuro falha com :class:`SchedulerOverloaded`.
+
+        Raises:
+            SchedulerOverloaded: Se a fila da estratégia estiver cheia e não
+                houver requisição enfileirada de menor prioridade.
+        """
+        analysis = self.orchestrator.analyze_request(request)
+        future: "Future[AgentResponse]" = Future()
+        shed: Optional["Future[AgentResponse]"] = None
+        with self._lock:
+            lane = self._lane(analysis)
+            start = lane.running < lane.limits.max_concurrency
+            if start:
+                lane.running += 1
+            else:
+                entry: _Queued = (-priority, next(self._sequence), request, future)
+                if len(lane.queue) >= lane.limits.max_queue:
+                    # A pior entrada da fila é a de menor prioridade mais recente.
+                    worst = max(lane.queue, default=None)
+                    lane.rejected += 1
+                    if worst is None or worst[:2] < entry[:2]:
+                        logger.warning(
+                            "Fila da estratégia %s cheia; requisição descartada", analysis
+                        )
+                        raise SchedulerOverloaded(f"fila da estratégia '{analysis}' cheia")
+                    lane.queue.remove(worst)
+                    heapq.heapify(lane.queue)
+                    shed = worst[3]
+                heapq.heappush(lane.queue, entry)
+        if start:
+            self._start(analysis, request, future)
+        if shed is not None and shed.set_running_or_notify_cancel():
+            logger.warning("Fila da estratégia %s cheia; descartando menor prioridade", analysis)
+            shed.set_exception(SchedulerOverloaded(f"fila da estratégia '{analysis}' cheia"))
+        return future
+
+    def execute(self, request: UserRequest, priority: int = 0) -> AgentResponse:
+        """Agenda ``request`` e aguarda sua resposta."""
+        return self.submit(request, priority).result()
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Execuções em andamento, enfileiradas, concluídas e descartadas por estratégia."""
+        with self._lock:
+            return {
+                name: {
+                    "running": lane.running,
+                    "queued": len(lane.queue),
+                    "completed": lane.completed,
+                    "rejected": lane.rejected,
+                }
+                for name, lane in self._lanes.items()
+            }
+
+    def close(self) -> None:
+        """Encerra o pool criado pelo agendador, aguardando as execuções."""
+        if self._owns_executor:
+            self.executor.shutdown()
+
+    def _start(
+        self, analysis: str, request: UserRequest, future: "Future[AgentResponse]"
+    ) -> None:
+        """Envia uma requisição ao pool, ou libera a vaga se ela foi cancelada."""
+        if not future.set_running_or_notify_cancel():
+            self._release(analysis)
+            return
+        strategy = self.orchestrator.select_strategy(analysis)
+        try:
+            inner = self.executor.submit(strategy.execute, request)
+        except Exception as exc:
+            future.set_exception(exc)
+            self._release(analysis)
+            return
+        inner.add_done_callback(lambda done: self._finish(analysis, done, future))
+
+    def _finish(
+        self,
+        analysis: str,
+        done: "Future[AgentResponse]",
+        future: "Future[AgentResponse]",
+    ) -> None:
+        """Repassa o resultado da estratégia e libera a vaga."""
+        with self._lock:
+            self._lanes[analysis].completed += 1
+        exc = done.exception()
+        if exc is not None:
+            logger.error("Erro ao executar a estratégia %s: %s", analysis, exc)
+            future.set_exception(exc)
+        else:
+            future.set_result(done.result())
+        self._release(analysis)
+
+    def _release(self, analysis: str) -> None:
+        """Passa a vaga liberada para a próxima requisição da fila."""
+        with self._lock:
+            lane = self._lanes[analysis]
+            if not lane.queue:
+                lane.running -= 1
+                return
+            _, _, request, queued = heapq.heappop(lane.queue)
+        self._start(analysis, request, queued)
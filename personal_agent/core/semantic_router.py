@@ -0,0 +1,161 @@
+"""Roteamento semântico por centroides de embeddings.
+
+Cada estratégia é representada pelo centroide normalizado dos embeddings de
+suas frases de exemplo. Uma requisição é vetorizada uma única vez e
+comparada com todos os centroides em um único produto matriz-vetor. Se a
+similaridade da melhor estratégia ficar abaixo do limiar de confiança, a
+decisão é delegada às regras de palavras-chave.
+
+Os centroides são calculados na inicialização e gravados em disco junto com
+uma impressão digital do embedder e dos exemplos, de modo que reinícios com
+a mesma configuração não recalculam nenhum embedding.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from config_models import SystemConfig
+
+from ..memory.embedders import IEmbedder
+from ..memory.vector_store import normalize_rows
+from .intent_router import IntentRouter
+from .interfaces import IRequestRouter
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticRouter:
+    """Escolhe a estratégia cujo centroide é mais similar à requisição."""
+
+    def __init__(
+        self,
+        examples: Mapping[str, Sequence[str]],
+        embedder: IEmbedder,
+        threshold: float = 0.6,
+        fallback: Optional[IRequestRouter] = None,
+        cache_path: Optional[Union[str, "os.PathLike[str]"]] = None,
+    ) -> None:
+        """Calcula ou carrega os centroides das estratégias.
+
+        Args:
+            examples: Frases de exemplo por estratégia; estratégias sem
+                exemplos são ignoradas.
+            embedder: Backend de embeddings usado para exemplos e requisições.
+            threshold: Similaridade mínima para aceitar a decisão semântica.
+                O valor adequado depende do embedder.
+            fallback: Roteador usado abaixo do limiar; por padrão, as regras
+                de palavras-chave de :class:`IntentRouter`.
+            cache_path: Arquivo ``.npz`` onde os centroides são gravados.
+        """
+        self.embedder = embedder
+        self.threshold = threshold
+        self.fallback: IRequestRouter = fallback or IntentRouter()
+        self._examples = {name: list(texts) for name, texts in examples.items() if texts}
+        self._strategies, self._centroids = self._load_or_build(
+            Path(cache_path) if cache_path is not None else None
+        )
+
+    @classmethod
+    def from_config(
+        cls,
+        config: SystemConfig,
+        embedder: IEmbedder,
+        threshold: float = 0.6,
+        cache_path: Optional[Union[str, "os.PathLike[str]"]] = None,
+    ) -> "SemanticRouter":
+        """Cria o roteador com os ``examples`` da seção ``strategies``.
+
+        As palavras-chave da mesma seção formam o roteador de fallback.
+        """
+        examples = {name: s.examples for name, s in config.strategies.items()}
+        return cls(
+            examples,
+            embedder,
+            threshold=threshold,
+            fallback=IntentRouter.from_config(config),
+            cache_path=cache_path,
+        )
+
+    @property
+    def strategies(self) -> List[str]:
+        """Estratégias com centroide, na ordem das linhas da matriz."""
+        return list(self._strategies)
+
+    def _fingerprint(self) -> str:
+        payload = json.dumps(
+            {"embedder": getattr(self.embedder, "name", ""), "examples": self._examples},
+            sort_keys=True,
+            ensure_ascii=False,
+        )
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+
+    def _load_or_build(self, cache_path: Optional[Path]) -> Tuple[List[str], np.ndarray]:
+        """Lê os centroides do cache ou os calcula e grava."""
+        fingerprint = self._fingerprint()
+        if cache_path is not None and cache_path.exists():
+            with np.load(cache_path, allow_pickle=False) as cached:
+                if str(cached["fingerprint"]) == fingerprint:
+                    logger.debug("Centroides carregados de %s", cache_path)
+                    return [str(s) for s in cached["strategies"]], cached["centroids"]
+            logger.info("Cache de centroides desatualizado: %s", cache_path)
+        strategies = list(self._examples)
+        centroids = self._build(strategies)
+        if cache_path is not None:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = cache_path.with_name(cache_path.name + ".tmp.npz")
+            np.savez(
+                tmp,
+                fingerprint=np.array(fingerprint),
+                strategies=np.array(strategies),
+                centroids=centroids,
+            )
+            os.replace(tmp, cache_path)
+            logger.info("Centroides gravados em %s", cache_path)
+        return strategies, centroids
+
+    def _build(self, strategies: List[str]) -> np.ndarray:
+        """Calcula um centroide normalizado por estratégia em um único lote."""
+        if not strategies:
+            return np.empty((0, 0), dtype=np.float32)
+        texts = [text for name in strategies for text in self._examples[name]]
+        vectors = normalize_rows(self.embedder.embed(texts))
+        counts = [len(self._examples[name]) for name in strategies]
+        owners = np.repeat(np.arange(len(strategies)), counts)
+        sums = np.zeros((len(strategies), vectors.shape[1]), dtype=np.float32)
+        np.add.at(sums, owners, vectors)
+        return normalize_rows(sums)
+
+    def scores(self, text: str) -> Dict[str, float]:
+        """Similaridade de ``text`` com cada estratégia."""
+        if not self._strategies:
+            return {}
+        similarity = self._centroids @ normalize_rows(self.embedder.embed([text]))[0]
+        return {name: float(score) for name, score in zip(self._strategies, similarity)}
+
+    def route(self, text: str) -> str:
+        """Retorna a estratégia mais similar ou a decisão do fallback.
+
+        Args:
+            text: Texto da requisição.
+
+        Returns:
+            Identificador da estratégia.
+        """
+        scores = self.scores(text)
+        if scores:
+            best = max(scores, key=scores.__getitem__)
+            if scores[best] >= self.threshold:
+                return best
+            logger.debug(
+                "Confiança semântica %.3f abaixo do limiar; usando palavras-chave",
+                scores[best],
+            )
+        return self.fallback.route(text)
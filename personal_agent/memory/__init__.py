@@ -1,5 +1,54 @@
 """Memory module exposing memory-related implementations."""
 
+from .ann_index import ExactIndex, HnswlibIndex, IVectorIndex, IVFIndex
+from .disk_store import DiskDocumentStore, MMapVectorStore
+from .embedders import (
+    BatchedEmbedder,
+    CharHistogramEmbedder,
+    IEmbedder,
+    SentenceTransformerEmbedder,
+)
+from .embedding_cache import EmbeddingCache
+from .ingestion_log import IngestionLog
+from .graph_memory import GraphHit, GraphMemory, IGraphBackend, InMemoryGraphBackend
+from .lexical import BM25Index
+from .metadata import MetadataIndex
+from .quantization import (
+    Float16Codec,
+    IVectorCodec,
+    ProductCodec,
+    QuantizedIndex,
+    ScalarInt8Codec,
+)
+from .query_cache import QueryCache
+from .sharded import ShardedRAG
 from .simple_rag import SimpleRAG
 
-__all__ = ["SimpleRAG"]
+__all__ = [
+    "BM25Index",
+    "BatchedEmbedder",
+    "CharHistogramEmbedder",
+    "DiskDocumentStore",
+    "EmbeddingCache",
+    "ExactIndex",
+    "Float16Codec",
+    "GraphHit",
+    "GraphMemory",
+    "HnswlibIndex",
+    "IVFIndex",
+    "IEmbedder",
+    "IGraphBackend",
+    "IVectorCodec",
+    "IVectorIndex",
+    "InMemoryGraphBackend",
+    "IngestionLog",
+    "MMapVectorStore",
+    "MetadataIndex",
+    "ProductCodec",
+    "QuantizedIndex",
+    "QueryCache",
+    "ScalarInt8Codec",
+    "SentenceTransformerEmbedder",
+    "ShardedRAG",
+    "SimpleRAG",
+]
@@ -0,0 +1,402 @@
+"""Search indexes over a :class:`VectorStore`.
+
+``ExactIndex`` scores every stored row and is the reference implementation.
+``IVFIndex`` is an approximate inverted-file index built in-package with
+NumPy: rows are clustered with spherical k-means and a query only scores the
+rows of its ``n_probe`` closest clusters. ``HnswlibIndex`` wraps the optional
+``hnswlib`` library when it is installed locally.
+
+Indexes are selected per :class:`~personal_agent.memory.simple_rag.SimpleRAG`
+instance and keep themselves in sync with the store lazily, on search. That
+sync is serialized by a per-index lock, so concurrent readers may search the
+same index.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, List, Optional, Protocol, Set, Tuple
+
+import numpy as np
+
+from .vector_store import VectorStore, normalize_rows, top_k_indices
+
+try:  # pragma: no cover - depends on the local environment
+    import hnswlib
+except ImportError:  # pragma: no cover - depends on the local environment
+    hnswlib = None
+
+logger = logging.getLogger(__name__)
+
+
+class IVectorIndex(Protocol):
+    """Contract for search backends used by ``SimpleRAG``."""
+
+    def search_many(
+        self,
+        store: VectorStore,
+        queries: np.ndarray,
+        top_k: int,
+        rows: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Return ``(rows, scores)`` of shape ``(q, k)`` for each query.
+
+        When ``rows`` is given, only those row indices may be returned.
+        """
+        ...
+
+    def reset(self) -> None:
+        """Forget any state derived from the store, e.g. after compaction."""
+        ...
+
+
+def _pad_results(
+    results: List[Tuple[np.ndarray, np.ndarray]], top_k: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Stack per-query results, padding short ones with ``-1`` rows."""
+    width = max((len(rows) for rows, _ in results), default=0)
+    width = min(width, top_k)
+    out_rows = np.full((len(results), width), -1, dtype=np.int64)
+    out_scores = np.full((len(results), width), -np.inf, dtype=np.float32)
+    for i, (rows, scores) in enumerate(results):
+        out_rows[i, : len(rows)] = rows[:width]
+        out_scores[i, : len(scores)] = scores[:width]
+    return out_rows, out_scores
+
+
+class ExactIndex:
+    """Brute-force search over every stored row."""
+
+    def search_many(
+        self,
+        store: VectorStore,
+        queries: np.ndarray,
+        top_k: int,
+        rows: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Delegate to :meth:`VectorStore.search_many`."""
+        return store.search_many(queries, top_k, rows)
+
+    def reset(self) -> None:
+        """Nothing to reset: exact search keeps no derived state."""
+
+
+class IVFIndex:
+    """Inverted-file approximate index with a k-means coarse quantizer.
+
+    Rows are grouped into ``n_lists`` clusters stored as a CSR-style layout
+    (rows sorted by cluster plus offsets). Rows appended after the last
+    rebuild are kept in a small tail that is always scored exactly, so new
+    documents are searchable immediately. The index falls back to exact
+    search while the store holds fewer than ``min_train_size`` rows.
+    """
+
+    def __init__(
+        self,
+        n_lists: int = 64,
+        n_probe: int = 8,
+        min_train_size: int = 4096,
+        n_iter: int = 10,
+        max_tail_fraction: float = 0.1,
+        retrain_growth: float = 2.0,
+        seed: int = 0,
+    ) -> None:
+        """Configure the index.
+
+        Args:
+            n_lists: Number of k-means clusters.
+            n_probe: Clusters scored per query; higher means better recall.
+            min_train_size: Corpus size below which exact search is used.
+            n_iter: Number of k-means iterations during training.
+            max_tail_fraction: Unindexed tail size, relative to the indexed
+                rows, that triggers assigning the tail to clusters.
+            retrain_growth: Corpus growth factor that triggers re-training.
+            seed: Seed for the k-means initialization.
+        """
+        if n_lists < 1 or n_probe < 1:
+            raise ValueError("n_lists and n_probe must be positive")
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.min_train_size = min_train_size
+        self.n_iter = n_iter
+        self.max_tail_fraction = max_tail_fraction
+        self.retrain_growth = retrain_growth
+        self._rng = np.random.default_rng(seed)
+        self._exact = ExactIndex()
+        self._centroids: Optional[np.ndarray] = None
+        self._assignments = np.empty(0, dtype=np.int64)
+        self._members = np.empty(0, dtype=np.int64)
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._trained_size = 0
+        self._indexed = 0
+        self._lock = threading.Lock()
+
+    @property
+    def is_trained(self) -> bool:
+        """Whether a coarse quantizer has been trained."""
+        return self._centroids is not None
+
+    def _assign(self, vectors: np.ndarray, chunk: int = 65536) -> np.ndarray:
+        """Return the closest centroid for each row, in bounded chunks."""
+        assert self._centroids is not None
+        out = np.empty(vectors.shape[0], dtype=np.int64)
+        for start in range(0, vectors.shape[0], chunk):
+            block = vectors[start:start + chunk] @ self._centroids.T
+            out[start:start + chunk] = np.argmax(block, axis=1)
+        return out
+
+    def train(self, store: VectorStore) -> None:
+        """Train the quantizer on the current store and index every row."""
+        vectors = store.vectors
+        n_lists = min(self.n_lists, len(vectors))
+        sample_size = min(len(vectors), n_lists * 256)
+        sample = vectors[self._rng.choice(len(vectors), sample_size, replace=False)]
+        centroids = sample[self._rng.choice(sample_size, n_lists, replace=False)].copy()
+        for _ in range(self.n_iter):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            counts = np.bincount(labels, minlength=n_lists)
+            empty = counts == 0
+            if empty.any():
+                sums[empty] = sample[self._rng.choice(sample_size, int(empty.sum()))]
+            centroids = normalize_rows(sums)
+        self._centroids = centroids
+        self._assignments = self._assign(vectors)
+        self._trained_size = len(vectors)
+        self._rebuild_lists()
+        logger.debug("IVFIndex trained with %d lists on %d rows", n_lists, len(vectors))
+
+    def _rebuild_lists(self) -> None:
+        """Recompute the CSR layout from the per-row assignments."""
+        assert self._centroids is not None
+        self._members = np.argsort(self._assignments, kind="stable")
+        counts = np.bincount(self._assignments, minlength=len(self._centroids))
+        self._offsets = np.concatenate(([0], np.cumsum(counts)))
+        self._indexed = len(self._assignments)
+
+    def _sync(self, store: VectorStore) -> None:
+        """Bring the index up to date with rows appended to ``store``."""
+        size = len(store)
+        if size < self._indexed:
+            self.reset()
+        if not self.is_trained or size >= self._trained_size * self.retrain_growth:
+            self.train(store)
+            return
+        tail = size - self._indexed
+        if tail > self.max_tail_fraction * self._indexed:
+            new = self._assign(store.vectors[self._indexed:])
+            self._assignments = np.concatenate((self._assignments, new))
+            self._rebuild_lists()
+
+    def reset(self) -> None:
+        """Drop the trained quantizer and inverted lists."""
+        self._centroids = None
+        self._assignments = np.empty(0, dtype=np.int64)
+        self._members = np.empty(0, dtype=np.int64)
+        self._offsets = np.zeros(1, dtype=np.int64)
+        self._trained_size = 0
+        self._indexed = 0
+
+    def search_many(
+        self,
+        store: VectorStore,
+        queries: np.ndarray,
+        top_k: int,
+        rows: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Score only the rows in the closest clusters of each query.
+
+        A restriction to fewer than ``min_train_size`` rows is searched
+        exactly; larger ones are applied to the probed candidates.
+        """
+        threshold = max(self.min_train_size, self.n_lists)
+        if len(store) < threshold or (rows is not None and len(rows) < threshold):
+            return self._exact.search_many(store, queries, top_k, rows)
+        with self._lock:
+            # Sync replaces arrays instead of mutating them, so this snapshot
+            # stays consistent while another thread re-indexes.
+            self._sync(store)
+            centroids, members, offsets = self._centroids, self._members, self._offsets
+            indexed = self._indexed
+        allowed: Optional[np.ndarray] = None
+        if rows is not None:
+            allowed = np.zeros(len(store), dtype=bool)
+            allowed[rows] = True
+        assert centroids is not None
+        normalized = normalize_rows(queries)
+        probes = top_k_indices(normalized @ centroids.T, self.n_probe)
+        vectors = store.vectors
+        tail = np.arange(indexed, len(store))
+        results = []
+        for query, lists in zip(normalized, probes):
+            parts = [members[offsets[c]:offsets[c + 1]] for c in lists]
+            parts.append(tail)
+            candidates = np.concatenate(parts)
+            if allowed is not None:
+                candidates = candidates[allowed[candidates]]
+            scores = vectors[candidates] @ query
+            best = top_k_indices(scores, top_k)
+            results.append((candidates[best], scores[best]))
+        return _pad_results(results, top_k)
+
+
+class HnswlibIndex:
+    """Graph index backed by a locally installed ``hnswlib``.
+
+    Rows are inserted incrementally on search and tombstoned rows are marked
+    deleted in the graph. Restricted searches use the graph with a row
+    filter; small corpora and small allowed sets fall back to exact search.
+    """
+
+    def __init__(
+        self,
+        ef: int = 64,
+        m: int = 16,
+        ef_construction: int = 200,
+        min_train_size: int = 4096,
+    ) -> None:
+        """Configure the graph.
+
+        Args:
+            ef: Search breadth; higher means better recall.
+            m: Number of graph links per node.
+            ef_construction: Search breadth used while inserting.
+            min_train_size: Corpus size, and allowed-row count, below which
+                exact search is used.
+
+        Raises:
+            ImportError: If ``hnswlib`` is not installed.
+        """
+        if hnswlib is None:
+            raise ImportError("hnswlib is required for HnswlibIndex")
+        self.ef = ef
+        self.m = m
+        self.ef_construction = ef_construction
+        self.min_train_size = min_train_size
+        self._exact = ExactIndex()
+        self._graph: Any = None
+        self._indexed = 0
+        self._marked: Set[int] = set()
+        self._lock = threading.Lock()
+
+    def reset(self) -> None:
+        """Drop the graph; it is rebuilt on the next search."""
+        self._graph = None
+        self._indexed = 0
+        self._marked = set()
+
+    def _sync(self, store: VectorStore) -> None:
+        """Insert rows appended to ``store`` and mark new tombstones deleted."""
+        size = len(store)
+        if self._graph is None or size < self._indexed:
+            self._graph = hnswlib.Index(space="ip", dim=store.dim)
+            self._graph.init_index(
+                max_elements=max(size, 1), ef_construction=self.ef_construction, M=self.m
+            )
+            self._indexed = 0
+            self._marked = set()
+        if size > self._graph.get_max_elements():
+            self._graph.resize_index(max(size, 2 * self._graph.get_max_elements()))
+        if size > self._indexed:
+            self._graph.add_items(
+                store.vectors[self._indexed:], np.arange(self._indexed, size)
+            )
+            self._indexed = size
+        if store.n_deleted != len(self._marked):
+            live = store.live_mask()
+            dead = set() if live is None else set(np.flatnonzero(~live).tolist())
+            for row in dead - self._marked:
+                self._graph.mark_deleted(row)
+            self._marked = dead
+
+    def search_many(
+        self,
+        store: VectorStore,
+        queries: np.ndarray,
+        top_k: int,
+        rows: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Query the HNSW graph, or search exactly on small corpora or row sets."""
+        if len(store) < self.min_train_size:
+            return self._exact.search_many(store, queries, top_k, rows)
+        n_live = len(store) - store.n_deleted
+        if rows is not None and len(rows) == n_live:
+            # Only tombstones restrict the search; the graph skips them itself.
+            rows = None
+        if rows is not None and len(rows) < self.min_train_size:
+            return self._exact.search_many(store, queries, top_k, rows)
+        with self._lock:
+            self._sync(store)
+        k = min(top_k, n_live if rows is None else len(rows))
+        if k == 0:
+            empty = (int(np.shape(queries)[0]), 0)
+            return np.empty(empty, dtype=np.int64), np.empty(empty, dtype=np.float32)
+        self._graph.set_ef(max(self.ef, k))
+        try:
+            if rows is None:
+                labels, distances = self._graph.knn_query(normalize_rows(queries), k=k)
+            else:
+                allowed = np.zeros(len(store), dtype=bool)
+                allowed[rows] = True
+                # hnswlib calls a Python filter under the GIL; one thread is
+                # the supported configuration.
+                labels, distances = self._graph.knn_query(
+                    normalize_rows(queries),
+                    k=k,
+                    num_threads=1,
+                    filter=lambda label: bool(allowed[label]),
+                )
+        except RuntimeError:
+            # The graph could not reach k allowed rows for some query.
+            logger.debug("HNSW search returned fewer than %d rows; using exact search", k)
+            return self._exact.search_many(store, queries, top_k, rows)
+        return labels.astype(np.int64), (1.0 - distances).astype(np.float32)
+
+
+@dataclass
+class IndexReport:
+    """Recall and latency of an index measured against exact search."""
+
+    recall: float
+    mean_latency_ms: float
+    exact_latency_ms: float
+
+
+def evaluate_index(
+    store: VectorStore, index: IVectorIndex, queries: np.ndarray, top_k: int = 10
+) -> IndexReport:
+    """Measure recall@k and per-query latency of ``index`` on ``store``.
+
+    The index is warmed up with one search first so training cost is not
+    counted as query latency.
+
+    Args:
+        store: Populated vector store.
+        index: Index under evaluation.
+        queries: Query embeddings of shape ``(q, dim)``.
+        top_k: Number of neighbours compared with the exact result.
+
+    Returns:
+        Report with recall@k averaged over queries and mean latencies.
+    """
+    exact = ExactIndex()
+    index.search_many(store, queries[:1], top_k)
+
+    start = time.perf_counter()
+    expected = [exact.search_many(store, q[None, :], top_k)[0][0] for q in queries]
+    exact_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+    start = time.perf_counter()
+    found = [index.search_many(store, q[None, :], top_k)[0][0] for q in queries]
+    index_ms = (time.perf_counter() - start) * 1000 / len(queries)
+
+    hits = [len(np.intersect1d(e, f)) / max(len(e), 1) for e, f in zip(expected, found)]
+    return IndexReport(
+        recall=float(np.mean(hits)),
+        mean_latency_ms=index_ms,
+        exact_latency_ms=exact_ms,
+    )
@@ -0,0 +1,130 @@
+"""Streaming helpers for document ingestion.
+
+Documents are split into overlapping character windows and grouped into
+bounded batches lazily, so arbitrarily large exports can be ingested with
+flat memory usage. :func:`prefetch` optionally overlaps reading and chunking
+with embedding through a bounded queue that blocks the producer when the
+consumer falls behind.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+from typing import Iterable, Iterator, List, TypeVar, cast
+
+T = TypeVar("T")
+
+_DONE = object()
+
+
+class _Failure:
+    """Wraps an exception raised by a :func:`prefetch` producer."""
+
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+def chunk_text(text: str, chunk_size: int = 1000, overlap: int = 200) -> Iterator[str]:
+    """Split ``text`` into windows of at most ``chunk_size`` characters.
+
+    Consecutive chunks share ``overlap`` characters. When possible a chunk
+    ends at the last whitespace of its window so words are not cut in half.
+
+    Args:
+        text: Document to split.
+        chunk_size: Maximum chunk length in characters.
+        overlap: Characters repeated at the start of the next chunk.
+
+    Yields:
+        Non-empty chunks in document order.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    if not 0 <= overlap < chunk_size:
+        raise ValueError("overlap must be in [0, chunk_size)")
+    start = 0
+    length = len(text)
+    while start < length:
+        end = min(start + chunk_size, length)
+        if end < length:
+            cut = text.rfind(" ", start + overlap + 1, end)
+            if cut != -1:
+                end = cut
+        chunk = text[start:end].strip()
+        if chunk:
+            yield chunk
+        if end >= length:
+            break
+        start = end - overlap
+
+
+def iter_chunks(
+    documents: Iterable[str], chunk_size: int = 1000, overlap: int = 200
+) -> Iterator[str]:
+    """Lazily chunk every document of ``documents``."""
+    for document in documents:
+        yield from chunk_text(document, chunk_size, overlap)
+
+
+def batched(items: Iterable[T], size: int) -> Iterator[List[T]]:
+    """Group ``items`` into lists of at most ``size`` elements."""
+    if size < 1:
+        raise ValueError("size must be positive")
+    batch: List[T] = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def prefetch(items: Iterable[T], maxsize: int) -> Iterator[T]:
+    """Produce ``items`` on a background thread through a bounded queue.
+
+    The producer blocks once ``maxsize`` items are waiting, so memory stays
+    bounded regardless of how fast the source is. Exceptions raised by the
+    source are re-raised in the consumer.
+
+    Args:
+        items: Source iterable, consumed on a daemon thread.
+        maxsize: Maximum number of items buffered ahead of the consumer.
+
+    Yields:
+        The items of ``items`` in order.
+    """
+    buffer: "queue.Queue[object]" = queue.Queue(maxsize=maxsize)
+    stop = threading.Event()
+
+    def put(entry: object) -> bool:
+        while not stop.is_set():
+            try:
+                buffer.put(entry, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for item in items:
+                if not put(item):
+                    return
+            put(_DONE)
+        except BaseException as exc:  # propagated to the consumer
+            put(_Failure(exc))
+
+    thread = threading.Thread(target=produce, name="ingestion-prefetch", daemon=True)
+    thread.start()
+    try:
+        while True:
+            entry = buffer.get()
+            if entry is _DONE:
+                return
+            if isinstance(entry, _Failure):
+                raise entry.error
+            yield cast(T, entry)
+    finally:
+        stop.set()
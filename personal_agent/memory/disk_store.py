@@ -0,0 +1,363 @@
+"""Durable, memory-mapped storage for :class:`SimpleRAG` memory.
+
+A store directory contains:
+
+* ``vectors.f32`` - raw float32 matrix of normalized embeddings, mapped with
+  :class:`numpy.memmap` so opening it costs no heap allocation and several
+  processes can share the same pages read-only;
+* ``documents.jsonl`` - append-only ``{"id": ..., "text": ...}`` records,
+  with an optional ``"metadata"`` mapping;
+* ``offsets.i64`` - raw int64 byte offset of each record, also memory-mapped;
+* ``tombstones.i64`` - append-only raw int64 indices of deleted rows;
+* ``meta.json`` - embedding dimension, the committed row count and the
+  ingestion-log offset those rows cover.
+
+``meta.json`` is replaced atomically after every batch, so rows written by an
+interrupted batch are ignored (and truncated) the next time the store is
+opened for writing.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import mmap
+import os
+import threading
+import uuid
+from pathlib import Path
+from typing import (
+    IO,
+    Any,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Literal,
+    Mapping,
+    Optional,
+    Sequence,
+    Union,
+)
+
+import numpy as np
+
+from .vector_store import VectorStore
+
+logger = logging.getLogger(__name__)
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+_VECTORS_FILE = "vectors.f32"
+_DOCUMENTS_FILE = "documents.jsonl"
+_OFFSETS_FILE = "offsets.i64"
+_META_FILE = "meta.json"
+_TOMBSTONES_FILE = "tombstones.i64"
+
+
+def _read_meta(directory: Path) -> Dict[str, Any]:
+    path = directory / _META_FILE
+    if not path.exists():
+        return {}
+    with open(path, "r", encoding="utf-8") as fh:
+        data: Dict[str, Any] = json.load(fh)
+    return data
+
+
+def _write_meta(directory: Path, meta: Dict[str, Any]) -> None:
+    tmp = directory / f"{_META_FILE}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(meta, fh)
+        fh.flush()
+        os.fsync(fh.fileno())
+    os.replace(tmp, directory / _META_FILE)
+
+
+class MMapVectorStore(VectorStore):
+    """:class:`VectorStore` whose matrix lives in a memory-mapped file."""
+
+    def __init__(
+        self,
+        path: PathLike,
+        dim: Optional[int] = None,
+        read_only: bool = False,
+        initial_capacity: int = 1024,
+    ) -> None:
+        """Open or create the vector file inside ``path``.
+
+        Args:
+            path: Store directory, created if needed unless ``read_only``.
+            dim: Embedding dimension for a new store.
+            read_only: Map the file read-only so it can be shared by workers.
+            initial_capacity: Rows preallocated when the file is created.
+        """
+        super().__init__(dim=dim, initial_capacity=initial_capacity)
+        self._dir = Path(path)
+        self._read_only = read_only
+        # Incremented each time the store directory is rewritten by a
+        # compaction, so mappings of the previous files can be detected.
+        self.generation = 0
+        if not read_only:
+            self._dir.mkdir(parents=True, exist_ok=True)
+        meta = _read_meta(self._dir)
+        if meta:
+            self._dim = int(meta["dim"])
+            self._size = int(meta["size"])
+            self.log_offset = int(meta.get("log_offset", 0))
+            self.generation = int(meta.get("generation", 0))
+            self._map()
+        tombstones = self._dir / _TOMBSTONES_FILE
+        if tombstones.exists():
+            rows = np.fromfile(tombstones, dtype=np.int64)
+            self._deleted = {int(row) for row in rows if row < self._size}
+        logger.debug("MMapVectorStore opened at %s with %d rows", self._dir, self._size)
+
+    @property
+    def read_only(self) -> bool:
+        """Whether the store rejects writes."""
+        return self._read_only
+
+    @property
+    def _vectors_path(self) -> Path:
+        return self._dir / _VECTORS_FILE
+
+    def _map(self) -> None:
+        """Map the vector file using its current length as capacity."""
+        dim = self._dim or 0
+        row_bytes = dim * np.dtype(np.float32).itemsize
+        file_size = self._vectors_path.stat().st_size if self._vectors_path.exists() else 0
+        capacity = file_size // row_bytes if row_bytes else 0
+        if capacity == 0:
+            self._matrix = np.empty((0, dim), dtype=np.float32)
+            return
+        mode: Literal["r", "r+"] = "r" if self._read_only else "r+"
+        self._matrix = np.memmap(
+            self._vectors_path, dtype=np.float32, mode=mode, shape=(capacity, dim)
+        )
+
+    def _check_writable(self) -> None:
+        if self._read_only:
+            raise PermissionError(f"Store at {self._dir} was opened read-only")
+
+    def _reserve(self, required: int) -> None:
+        """Extend the vector file by doubling and remap it."""
+        if required <= self.capacity:
+            return
+        self._check_writable()
+        new_capacity = max(self.capacity, self._initial_capacity)
+        while new_capacity < required:
+            new_capacity *= 2
+        if isinstance(self._matrix, np.memmap):
+            self._matrix.flush()
+        self._matrix = np.empty((0, self._dim or 0), dtype=np.float32)
+        with open(self._vectors_path, "ab") as fh:
+            fh.truncate(new_capacity * (self._dim or 0) * np.dtype(np.float32).itemsize)
+        self._map()
+        logger.debug("MMapVectorStore capacity grown to %d rows", new_capacity)
+
+    def add(self, embeddings: np.ndarray) -> np.ndarray:
+        """Append embeddings to the mapped file without committing them."""
+        self._check_writable()
+        return super().add(embeddings)
+
+    def delete(self, rows: Iterable[int]) -> None:
+        """Tombstone ``rows`` and durably record them."""
+        self._check_writable()
+        batch = [int(row) for row in rows]
+        super().delete(batch)
+        with open(self._dir / _TOMBSTONES_FILE, "ab") as fh:
+            fh.write(np.asarray(batch, dtype=np.int64).tobytes())
+            fh.flush()
+            os.fsync(fh.fileno())
+
+    @property
+    def memory_mapped(self) -> bool:
+        """Rows are read from the mapped file on demand."""
+        return True
+
+    def evict(self, start: int, stop: int) -> None:
+        """Drop the pages holding rows ``[start, stop)`` from memory.
+
+        The pages are unmapped from this process and, when clean, dropped from
+        the page cache, so a full scan such as encoding the rows does not
+        leave the whole file resident. Later reads fault them back in.
+        """
+        mapped = getattr(self._matrix, "_mmap", None)
+        row_bytes = (self._dim or 0) * np.dtype(np.float32).itemsize
+        if mapped is None or not hasattr(mmap, "MADV_DONTNEED") or stop <= start:
+            return
+        page = mmap.PAGESIZE
+        first = -(-start * row_bytes // page) * page
+        last = min(stop * row_bytes, len(mapped)) // page * page
+        if last <= first:
+            return
+        mapped.madvise(mmap.MADV_DONTNEED, first, last - first)
+        if hasattr(os, "posix_fadvise"):
+            fd = os.open(self._vectors_path, os.O_RDONLY)
+            try:
+                os.posix_fadvise(fd, first, last - first, os.POSIX_FADV_DONTNEED)
+            finally:
+                os.close(fd)
+
+    def commit(self) -> None:
+        """Flush mapped pages and atomically record the row count and log offset."""
+        self._check_writable()
+        if isinstance(self._matrix, np.memmap):
+            self._matrix.flush()
+        _write_meta(
+            self._dir,
+            {
+                "dim": self._dim,
+                "size": self._size,
+                "log_offset": self.log_offset,
+                "generation": self.generation,
+            },
+        )
+
+
+class DiskDocumentStore:
+    """Append-only document file with a memory-mapped offset index.
+
+    Behaves like a read-only list of texts for ranking purposes while keeping
+    the document bodies on disk; only the records returned by a query are
+    read and decoded.
+    """
+
+    def __init__(self, path: PathLike, read_only: bool = False) -> None:
+        """Open or create the document files inside ``path``.
+
+        Args:
+            path: Store directory, created if needed unless ``read_only``.
+            read_only: Reject appends.
+        """
+        self._dir = Path(path)
+        self._read_only = read_only
+        if not read_only:
+            self._dir.mkdir(parents=True, exist_ok=True)
+        self._data_path = self._dir / _DOCUMENTS_FILE
+        self._offsets_path = self._dir / _OFFSETS_FILE
+        self._count = (
+            self._offsets_path.stat().st_size // 8 if self._offsets_path.exists() else 0
+        )
+        self._offsets: Optional[np.ndarray] = None
+        self._reader: Optional[IO[bytes]] = None
+        self._reader_lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> str:
+        text: str = self.record(index)["text"]
+        return text
+
+    def _offset_index(self) -> np.ndarray:
+        """Return the offset array, mapping it lazily."""
+        offsets = self._offsets
+        count = self._count
+        if offsets is None or len(offsets) != count:
+            if count == 0:
+                offsets = np.empty(0, dtype=np.int64)
+            else:
+                offsets = np.memmap(
+                    self._offsets_path, dtype=np.int64, mode="r", shape=(count,)
+                )
+            self._offsets = offsets
+        return offsets
+
+    def _fileno(self) -> int:
+        """Return the descriptor of the shared reader, opening it lazily."""
+        with self._reader_lock:
+            if self._reader is None:
+                self._reader = open(self._data_path, "rb")
+            return self._reader.fileno()
+
+    def record(self, index: int) -> Dict[str, Any]:
+        """Read and decode the record stored at ``index``.
+
+        Records are read with positional reads on a shared descriptor, so
+        concurrent readers never move a shared file position.
+        """
+        count = self._count
+        if not 0 <= index < count:
+            raise IndexError(index)
+        offsets = self._offset_index()
+        start = int(offsets[index])
+        fd = self._fileno()
+        if index + 1 < len(offsets):
+            line = os.pread(fd, int(offsets[index + 1]) - start, start)
+        else:
+            chunks: List[bytes] = []
+            position = start
+            while True:
+                chunk = os.pread(fd, 4096, position)
+                newline = chunk.find(b"\n")
+                if newline >= 0 or not chunk:
+                    chunks.append(chunk if newline < 0 else chunk[:newline])
+                    break
+                chunks.append(chunk)
+                position += len(chunk)
+            line = b"".join(chunks)
+        data: Dict[str, Any] = json.loads(line)
+        return data
+
+    def doc_id(self, index: int) -> str:
+        """Return the identifier stored with the record at ``index``."""
+        doc_id: str = self.record(index)["id"]
+        return doc_id
+
+    def extend(
+        self,
+        texts: Iterable[str],
+        ids: Optional[Iterable[str]] = None,
+        metadatas: Optional[Sequence[Optional[Mapping[str, Hashable]]]] = None,
+    ) -> None:
+        """Append documents and their offsets.
+
+        Args:
+            texts: Documents to append.
+            ids: Identifiers for the documents; random ones are generated if
+                omitted.
+            metadatas: Optional metadata mapping per document.
+        """
+        if self._read_only:
+            raise PermissionError(f"Store at {self._dir} was opened read-only")
+        batch = list(texts)
+        id_list = list(ids) if ids is not None else [uuid.uuid4().hex for _ in batch]
+        metadata_list = metadatas if metadatas is not None else [None] * len(batch)
+        offsets: List[int] = []
+        with open(self._data_path, "ab") as fh:
+            position = fh.tell()
+            for doc_id, text, metadata in zip(id_list, batch, metadata_list):
+                record: Dict[str, Any] = {"id": doc_id, "text": text}
+                if metadata:
+                    record["metadata"] = dict(metadata)
+                line = json.dumps(record, ensure_ascii=False)
+                encoded = (line + "\n").encode("utf-8")
+                offsets.append(position)
+                fh.write(encoded)
+                position += len(encoded)
+            fh.flush()
+        with open(self._offsets_path, "ab") as fh:
+            fh.write(np.asarray(offsets, dtype=np.int64).tobytes())
+        self._count += len(offsets)
+
+    def truncate(self, count: int) -> None:
+        """Drop records beyond ``count``, e.g. left by an interrupted batch."""
+        if count >= self._count:
+            return
+        end = int(self._offset_index()[count])
+        self._offsets = None
+        self.close()
+        with open(self._data_path, "r+b") as fh:
+            fh.truncate(end)
+        with open(self._offsets_path, "r+b") as fh:
+            fh.truncate(count * 8)
+        self._count = count
+        logger.warning("Truncated document store at %s to %d records", self._dir, count)
+
+    def close(self) -> None:
+        """Close the reader handle, if open."""
+        with self._reader_lock:
+            if self._reader is not None:
+                self._reader.close()
+                self._reader = None
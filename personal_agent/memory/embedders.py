@@ -0,0 +1,185 @@
+"""Embedding backends used by :class:`SimpleRAG`.
+
+Every embedder turns a batch of texts into a float32 matrix. The default
+:class:`CharHistogramEmbedder` counts letters and needs no model;
+:class:`SentenceTransformerEmbedder` loads a ``sentence-transformers`` model on
+first use. :class:`BatchedEmbedder` wraps any of them to split bulk
+ingestion into fixed-size batches, optionally spread over a process pool.
+"""
+
+from __future__ import annotations
+
+import logging
+import string
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Protocol, Sequence
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class IEmbedder(Protocol):
+    """Contract for embedding backends."""
+
+    name: str
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Return a float32 matrix with one embedding per text."""
+        ...
+
+
+def _letter_lookup_table() -> np.ndarray:
+    """Map every byte to its letter index, or to ``26`` for non-letters."""
+    table = np.full(256, len(string.ascii_lowercase), dtype=np.intp)
+    for i, ch in enumerate(string.ascii_lowercase.encode("ascii")):
+        table[ch] = i
+    return table
+
+
+_LETTER_TABLE = _letter_lookup_table()
+
+
+class CharHistogramEmbedder:
+    """Embeds text as counts of the 26 ASCII letters, case-insensitive."""
+
+    name = "char-histogram"
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Count letter occurrences of each text.
+
+        The whole batch is lowercased and encoded to UTF-8, each byte is
+        mapped through a lookup table and a single :func:`numpy.bincount`
+        over ``row * 27 + letter`` builds every histogram at once. Multi-byte
+        characters never encode to ASCII letter bytes, so only ``a``-``z``
+        are counted.
+
+        Args:
+            texts: Documents or queries to embed.
+
+        Returns:
+            Float32 matrix of shape ``(len(texts), 26)``.
+        """
+        width = len(string.ascii_lowercase) + 1
+        encoded = [text.lower().encode("utf-8") for text in texts]
+        codes = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+        rows = np.repeat(np.arange(len(encoded)), [len(e) for e in encoded])
+        counts = np.bincount(
+            rows * width + _LETTER_TABLE[codes], minlength=len(encoded) * width
+        )
+        return counts.reshape(len(encoded), width)[:, :-1].astype(np.float32)
+
+
+class SentenceTransformerEmbedder:
+    """Embeds text with a ``sentence-transformers`` model."""
+
+    def __init__(
+        self,
+        model_name: str = "all-MiniLM-L6-v2",
+        batch_size: int = 32,
+        device: Optional[str] = None,
+    ) -> None:
+        """Configure the model; weights are loaded on the first call.
+
+        Args:
+            model_name: Model identifier or local path.
+            batch_size: Batch size passed to ``SentenceTransformer.encode``.
+            device: Torch device, e.g. ``"cpu"``; chosen automatically if omitted.
+        """
+        self.name = f"sentence-transformers/{model_name}"
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.device = device
+        self._model: Any = None
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Workers of a process pool load their own copy of the model.
+        state = self.__dict__.copy()
+        state["_model"] = None
+        return state
+
+    def _load(self) -> Any:
+        if self._model is None:
+            from sentence_transformers import SentenceTransformer
+
+            self._model = SentenceTransformer(self.model_name, device=self.device)
+            logger.info("Loaded embedding model %s", self.model_name)
+        return self._model
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Encode ``texts`` with the configured model."""
+        vectors = self._load().encode(
+            list(texts), batch_size=self.batch_size, convert_to_numpy=True
+        )
+        return np.asarray(vectors, dtype=np.float32)
+
+
+_worker_embedder: Optional[IEmbedder] = None
+
+
+def _init_worker(embedder: IEmbedder) -> None:
+    global _worker_embedder
+    _worker_embedder = embedder
+
+
+def _embed_in_worker(texts: List[str]) -> np.ndarray:
+    assert _worker_embedder is not None
+    return _worker_embedder.embed(texts)
+
+
+class BatchedEmbedder:
+    """Splits embedding work into batches, optionally across processes.
+
+    With ``processes > 0`` a process pool is started on first use and each
+    worker receives its own copy of the wrapped embedder once, so CPU-only
+    bulk ingestion can use every core. Call :meth:`close` to stop the pool.
+    """
+
+    def __init__(
+        self, embedder: IEmbedder, batch_size: int = 256, processes: int = 0
+    ) -> None:
+        """Wrap ``embedder``.
+
+        Args:
+            embedder: Embedder doing the actual work.
+            batch_size: Maximum number of texts per call to ``embedder``.
+            processes: Number of worker processes; ``0`` embeds in-process.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
+        self.embedder = embedder
+        self.name = embedder.name
+        self.batch_size = batch_size
+        self.processes = processes
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_lock = threading.Lock()
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed ``texts`` batch by batch, preserving input order."""
+        batches = [
+            list(texts[i:i + self.batch_size])
+            for i in range(0, len(texts), self.batch_size)
+        ]
+        if not batches:
+            return np.asarray(self.embedder.embed([]), dtype=np.float32)
+        if self.processes > 0 and len(batches) > 1:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.processes,
+                        initializer=_init_worker,
+                        initargs=(self.embedder,),
+                    )
+                pool = self._pool
+            results = list(pool.map(_embed_in_worker, batches))
+        else:
+            results = [self.embedder.embed(batch) for batch in batches]
+        return np.concatenate(results).astype(np.float32, copy=False)
+
+    def close(self) -> None:
+        """Shut down the worker pool, if started."""
+        with self._pool_lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown()
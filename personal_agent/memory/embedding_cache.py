@@ -0,0 +1,141 @@
+"""Content-addressed cache for text embeddings.
+
+Embeddings are keyed by a hash of the text, so duplicate documents, repeated
+chunks and common queries are embedded only once. Entries live in a
+size-bounded in-memory LRU, optionally backed by an on-disk ``dbm`` tier that
+survives restarts.
+"""
+
+from __future__ import annotations
+
+import dbm
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .disk_store import PathLike
+
+logger = logging.getLogger(__name__)
+
+
+class EmbeddingCache:
+    """Two-tier LRU cache of float32 embeddings keyed by content hash."""
+
+    def __init__(
+        self,
+        max_entries: int = 10_000,
+        path: Optional[PathLike] = None,
+        namespace: str = "",
+    ) -> None:
+        """Create the cache.
+
+        Args:
+            max_entries: Maximum number of embeddings kept in memory.
+            path: Optional ``dbm`` file used as a persistent second tier.
+            namespace: Prefix mixed into every key, e.g. the embedding model
+                name, so vectors from different models never collide.
+                ``SimpleRAG`` uses its embedder's name when this is empty.
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be positive")
+        self.max_entries = max_entries
+        self.namespace = namespace
+        self.hits = 0
+        self.misses = 0
+        self._memory: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self._disk: Any = dbm.open(str(path), "c") if path is not None else None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def _key(self, text: str, namespace: str) -> bytes:
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(namespace.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(text.encode("utf-8"))
+        return digest.digest()
+
+    def _remember(self, key: bytes, vector: np.ndarray) -> None:
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _lookup(self, key: bytes, dim: Optional[int]) -> Optional[np.ndarray]:
+        vector = self._memory.get(key)
+        if vector is None and self._disk is not None and key in self._disk:
+            vector = np.frombuffer(self._disk[key], dtype=np.float32)
+        if vector is None or (dim is not None and len(vector) != dim):
+            return None
+        self._remember(key, vector)
+        return vector
+
+    def embed(
+        self,
+        texts: Sequence[str],
+        compute: Callable[[List[str]], np.ndarray],
+        namespace: Optional[str] = None,
+        dim: Optional[int] = None,
+    ) -> np.ndarray:
+        """Return embeddings for ``texts``, computing only the missing ones.
+
+        Misses are de-duplicated and passed to ``compute`` as one batch.
+
+        Args:
+            texts: Texts to embed.
+            compute: Function embedding a list of texts into a matrix.
+            namespace: Key prefix for this call, overriding
+                :attr:`namespace`; lets one cache serve several models.
+            dim: Expected embedding dimension, if known; cached vectors of
+                another size are treated as misses.
+
+        Returns:
+            Float32 matrix with one row per text, in input order.
+        """
+        if not texts:
+            return np.asarray(compute([]), dtype=np.float32)
+        prefix = self.namespace if namespace is None else namespace
+        keys = [self._key(text, prefix) for text in texts]
+        found: Dict[bytes, np.ndarray] = {}
+        missing: Dict[bytes, str] = {}
+        with self._lock:
+            for key, text in zip(keys, texts):
+                if key in found or key in missing:
+                    continue
+                vector = self._lookup(key, dim)
+                if vector is None:
+                    missing[key] = text
+                else:
+                    found[key] = vector
+            self.hits += len(texts) - len(missing)
+            self.misses += len(missing)
+        if missing:
+            computed = np.asarray(compute(list(missing.values())), dtype=np.float32)
+            with self._lock:
+                for key, vector in zip(missing, computed):
+                    found[key] = vector
+                    self._remember(key, vector.copy())
+                    if self._disk is not None:
+                        self._disk[key] = vector.tobytes()
+        return np.stack([found[key] for key in keys])
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss counters and the hit rate."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": len(self._memory),
+        }
+
+    def close(self) -> None:
+        """Close the on-disk tier, if any."""
+        if self._disk is not None:
+            self._disk.close()
+            self._disk = None
@@ -0,0 +1,336 @@
+"""Hybrid graph-vector memory with an in-process graph store.
+
+Entities are graph nodes carrying an embedding of their description;
+relations are typed, directed edges between them. Retrieval follows the
+"vector seed + k-hop expansion" pattern of the architecture plan: the nodes
+most similar to the question seed the search, and their neighbourhood is
+expanded hop by hop, keeping the best-scoring nodes within a fixed budget.
+
+:class:`InMemoryGraphBackend` keeps edges in a compressed sparse row (CSR)
+layout, so expanding a whole frontier is a handful of vectorized NumPy
+operations whose cost depends on the frontier's degree, not on the size of
+the graph. :class:`IGraphBackend` is the contract a Neo4j adapter would
+implement for Iteration 3.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Protocol, Sequence, Tuple
+
+import numpy as np
+
+from .embedders import CharHistogramEmbedder, IEmbedder
+from .vector_store import VectorStore, normalize_rows, top_k_indices
+
+logger = logging.getLogger(__name__)
+
+Triple = Tuple[str, str, str]
+
+
+@dataclass
+class GraphHit:
+    """An entity returned by :meth:`GraphMemory.query`."""
+
+    name: str
+    text: str
+    score: float
+    hops: int
+
+
+class IGraphBackend(Protocol):
+    """Contract for graph stores used by :class:`GraphMemory`.
+
+    Nodes are addressed by dense integer ids assigned on insertion.
+    """
+
+    def upsert_entities(
+        self, names: Sequence[str], texts: Sequence[str], embeddings: np.ndarray
+    ) -> List[int]:
+        """Insert entities, or update the text and embedding of known names."""
+        ...
+
+    def node_ids(self, names: Sequence[str]) -> List[Optional[int]]:
+        """Return the id of each name, or ``None`` if unknown."""
+        ...
+
+    def add_relations(
+        self, sources: Sequence[int], relations: Sequence[str], targets: Sequence[int]
+    ) -> None:
+        """Add directed, typed edges between existing nodes."""
+        ...
+
+    def seeds(self, query: np.ndarray, top_k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Return the ``top_k`` nodes most similar to ``query`` and their scores."""
+        ...
+
+    def neighbours(self, nodes: np.ndarray) -> np.ndarray:
+        """Return the nodes adjacent to any of ``nodes``, in either direction."""
+        ...
+
+    def similarity(self, query: np.ndarray, nodes: np.ndarray) -> np.ndarray:
+        """Cosine similarity between ``query`` and each of ``nodes``."""
+        ...
+
+    def entity(self, node: int) -> Tuple[str, str]:
+        """Return ``(name, text)`` of ``node``."""
+        ...
+
+    def relations(self, node: int) -> List[Tuple[str, str]]:
+        """Return ``(relation, target name)`` for the outgoing edges of ``node``."""
+        ...
+
+
+class InMemoryGraphBackend:
+    """Graph store with CSR adjacency and node embeddings in a ``VectorStore``.
+
+    Edges are appended to growable coordinate arrays; the CSR index over
+    both edge directions is rebuilt lazily on the first expansion after a
+    write.
+    """
+
+    def __init__(self) -> None:
+        self._vectors = VectorStore()
+        self._names: List[str] = []
+        self._texts: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._relation_codes: Dict[str, int] = {}
+        self._relation_names: List[str] = []
+        self._edges = np.empty((0, 3), dtype=np.int64)
+        self._n_edges = 0
+        self._indptr = np.zeros(1, dtype=np.int64)
+        self._adjacent = np.empty(0, dtype=np.int64)
+        # Edge index of each CSR slot; values >= n_edges are reverse edges.
+        self._slot_edges = np.empty(0, dtype=np.int64)
+        self._csr_edges = -1
+
+    def __len__(self) -> int:
+        return len(self._names)
+
+    @property
+    def n_edges(self) -> int:
+        """Number of stored relations."""
+        return self._n_edges
+
+    def upsert_entities(
+        self, names: Sequence[str], texts: Sequence[str], embeddings: np.ndarray
+    ) -> List[int]:
+        """Insert new entities and refresh the text of existing ones.
+
+        The embedding of an existing entity is overwritten in place.
+        """
+        vectors = normalize_rows(embeddings)
+        ids: List[int] = []
+        new_rows: List[int] = []
+        for i, (name, text) in enumerate(zip(names, texts)):
+            node = self._ids.get(name)
+            if node is None:
+                node = len(self._names)
+                self._ids[name] = node
+                self._names.append(name)
+                self._texts.append(text)
+                new_rows.append(i)
+            elif node < len(self._vectors):
+                self._texts[node] = text
+                self._vectors.vectors[node] = vectors[i]
+            ids.append(node)
+        if new_rows:
+            self._vectors.add(vectors[new_rows])
+        return ids
+
+    def node_ids(self, names: Sequence[str]) -> List[Optional[int]]:
+        """Return the id of each name, or ``None`` if unknown."""
+        return [self._ids.get(name) for name in names]
+
+    def add_relations(
+        self, sources: Sequence[int], relations: Sequence[str], targets: Sequence[int]
+    ) -> None:
+        """Append directed, typed edges."""
+        codes = []
+        for relation in relations:
+            code = self._relation_codes.get(relation)
+            if code is None:
+                code = self._relation_codes[relation] = len(self._relation_names)
+                self._relation_names.append(relation)
+            codes.append(code)
+        batch = np.column_stack(
+            (
+                np.asarray(sources, dtype=np.int64),
+                np.asarray(codes, dtype=np.int64),
+                np.asarray(targets, dtype=np.int64),
+            )
+        )
+        if len(batch) and (batch[:, [0, 2]].max() >= len(self._names) or batch.min() < 0):
+            raise IndexError("Relation endpoint is not a known node")
+        required = self._n_edges + len(batch)
+        if required > len(self._edges):
+            grown = np.empty((max(required, 2 * len(self._edges), 64), 3), dtype=np.int64)
+            grown[: self._n_edges] = self._edges[: self._n_edges]
+            self._edges = grown
+        self._edges[self._n_edges:required] = batch
+        self._n_edges = required
+
+    def _csr(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return ``(indptr, adjacent)`` over both directions of every edge."""
+        if self._csr_edges != self._n_edges or len(self._indptr) != len(self._names) + 1:
+            edges = self._edges[: self._n_edges]
+            heads = np.concatenate((edges[:, 0], edges[:, 2]))
+            tails = np.concatenate((edges[:, 2], edges[:, 0]))
+            order = np.argsort(heads, kind="stable")
+            counts = np.bincount(heads, minlength=len(self._names))
+            self._indptr = np.concatenate(([0], np.cumsum(counts)))
+            self._adjacent = tails[order]
+            self._slot_edges = order
+            self._csr_edges = self._n_edges
+            logger.debug("Graph adjacency rebuilt with %d edges", self._n_edges)
+        return self._indptr, self._adjacent
+
+    def seeds(self, query: np.ndarray, top_k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Rank nodes by cosine similarity to ``query``."""
+        return self._vectors.search(query, top_k)
+
+    def neighbours(self, nodes: np.ndarray) -> np.ndarray:
+        """Gather the CSR slices of ``nodes`` without a Python loop."""
+        indptr, adjacent = self._csr()
+        nodes = np.asarray(nodes, dtype=np.int64)
+        starts = indptr[nodes]
+        counts = indptr[nodes + 1] - starts
+        total = int(counts.sum())
+        if total == 0:
+            return np.empty(0, dtype=np.int64)
+        # Position of every gathered slot: its slice start plus its offset
+        # within the slice.
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        return np.unique(adjacent[np.repeat(starts, counts) + offsets])
+
+    def similarity(self, query: np.ndarray, nodes: np.ndarray) -> np.ndarray:
+        """Score ``nodes`` against a single query embedding."""
+        return self._vectors.vectors[nodes] @ normalize_rows(query)
+
+    def entity(self, node: int) -> Tuple[str, str]:
+        """Return ``(name, text)`` of ``node``."""
+        return self._names[node], self._texts[node]
+
+    def relations(self, node: int) -> List[Tuple[str, str]]:
+        """List outgoing edges of ``node`` as ``(relation, target name)``."""
+        indptr, _ = self._csr()
+        slots = self._slot_edges[indptr[node]:indptr[node + 1]]
+        outgoing = self._edges[slots[slots < self._n_edges]]
+        return [
+            (self._relation_names[code], self._names[target])
+            for _, code, target in outgoing.tolist()
+        ]
+
+
+class GraphMemory:
+    """Entity graph whose nodes are searchable by embedding."""
+
+    def __init__(
+        self,
+        backend: Optional[IGraphBackend] = None,
+        embedder: Optional[IEmbedder] = None,
+        hop_decay: float = 0.8,
+    ) -> None:
+        """Create the memory.
+
+        Args:
+            backend: Graph store; defaults to :class:`InMemoryGraphBackend`.
+            embedder: Embedding backend for entity texts and questions.
+            hop_decay: Factor applied to the similarity of a node per hop
+                away from the seeds, so direct matches rank first.
+        """
+        self._backend: IGraphBackend = backend or InMemoryGraphBackend()
+        self._embedder: IEmbedder = embedder or CharHistogramEmbedder()
+        self.hop_decay = hop_decay
+
+    def add_entities(self, names: Sequence[str], texts: Optional[Sequence[str]] = None) -> None:
+        """Insert or update entities.
+
+        Args:
+            names: Unique entity names.
+            texts: Descriptions embedded for retrieval; the names are used
+                if omitted.
+        """
+        texts = list(texts) if texts is not None else list(names)
+        if len(texts) != len(names):
+            raise ValueError("texts must have one entry per name")
+        if names:
+            self._backend.upsert_entities(names, texts, self._embedder.embed(texts))
+        logger.info("Added %d entities", len(names))
+
+    def add_relations(self, triples: Sequence[Triple]) -> None:
+        """Add ``(source, relation, target)`` edges.
+
+        Unknown endpoints are created as entities described by their name.
+        """
+        names = list(dict.fromkeys(n for s, _, t in triples for n in (s, t)))
+        missing = [n for n, node in zip(names, self._backend.node_ids(names)) if node is None]
+        if missing:
+            self.add_entities(missing)
+        sources = self._backend.node_ids([s for s, _, _ in triples])
+        targets = self._backend.node_ids([t for _, _, t in triples])
+        self._backend.add_relations(
+            [int(n) for n in sources if n is not None],
+            [r for _, r, _ in triples],
+            [int(n) for n in targets if n is not None],
+        )
+        logger.info("Added %d relations", len(triples))
+
+    def relations(self, name: str) -> List[Tuple[str, str]]:
+        """Return ``(relation, target)`` pairs leaving entity ``name``."""
+        node = self._backend.node_ids([name])[0]
+        if node is None:
+            raise KeyError(name)
+        return self._backend.relations(node)
+
+    def query(
+        self,
+        question: str,
+        top_k: int = 5,
+        hops: int = 1,
+        seeds: int = 3,
+        max_nodes: int = 64,
+    ) -> List[GraphHit]:
+        """Retrieve entities by vector seeding and k-hop expansion.
+
+        Each hop scores only the newly reached neighbours and keeps the best
+        of them within the remaining ``max_nodes`` budget, which bounds the
+        work per query regardless of the graph size.
+
+        Args:
+            question: Natural language query.
+            top_k: Number of entities to return.
+            hops: Maximum distance from the seed nodes.
+            seeds: Number of nodes found by vector similarity.
+            max_nodes: Maximum number of nodes visited.
+
+        Returns:
+            Entities ranked by similarity decayed by hop distance.
+        """
+        query = self._embedder.embed([question])[0]
+        frontier, scores = self._backend.seeds(query, min(seeds, max_nodes))
+        visited: Dict[int, Tuple[float, int]] = {
+            int(node): (float(score), 0) for node, score in zip(frontier, scores)
+        }
+        for hop in range(1, hops + 1):
+            budget = max_nodes - len(visited)
+            if budget <= 0 or len(frontier) == 0:
+                break
+            reached = self._backend.neighbours(frontier)
+            seen = np.fromiter(visited, dtype=np.int64, count=len(visited))
+            fresh = reached[~np.isin(reached, seen)]
+            if len(fresh) == 0:
+                break
+            similarity = self._backend.similarity(query, fresh)
+            keep = top_k_indices(similarity, budget)
+            frontier = fresh[keep]
+            decay = self.hop_decay ** hop
+            for node, score in zip(frontier.tolist(), similarity[keep].tolist()):
+                visited[node] = (score * decay, hop)
+        ranked = sorted(visited.items(), key=lambda item: (-item[1][0], item[0]))[:top_k]
+        hits = []
+        for node, (score, hop) in ranked:
+            name, text = self._backend.entity(node)
+            hits.append(GraphHit(name=name, text=text, score=score, hops=hop))
+        return hits
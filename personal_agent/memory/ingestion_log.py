@@ -0,0 +1,154 @@
+"""Append-only JSONL ingestion log for the memory layer.
+
+Raw ingested data is written here before it is indexed, giving a
+database-agnostic source of truth from which any ``SimpleRAG`` backend can be
+rebuilt. Positions in the log are byte offsets, so a consumer can resume from
+a recorded offset without scanning what it has already indexed.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from .disk_store import PathLike
+
+logger = logging.getLogger(__name__)
+
+Record = Dict[str, Any]
+
+
+class IngestionLog:
+    """Streaming reader and writer for an append-only JSONL file."""
+
+    def __init__(self, path: PathLike) -> None:
+        """Bind the log to ``path``; the file is created on first append.
+
+        Args:
+            path: Location of the JSONL file.
+        """
+        self._path = Path(path)
+
+    @property
+    def path(self) -> Path:
+        """Location of the log file."""
+        return self._path
+
+    def size(self) -> int:
+        """Return the current end offset of the log in bytes."""
+        return self._path.stat().st_size if self._path.exists() else 0
+
+    def _write(self, records: Iterable[Record]) -> int:
+        """Durably append ``records`` and return the new end offset."""
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self._path, "ab") as fh:
+            for record in records:
+                fh.write((json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8"))
+            fh.flush()
+            os.fsync(fh.fileno())
+            return fh.tell()
+
+    def append(
+        self,
+        texts: Sequence[str],
+        metadatas: Optional[Sequence[Optional[Mapping[str, Hashable]]]] = None,
+        ids: Optional[Sequence[str]] = None,
+        op: str = "add",
+    ) -> int:
+        """Durably append one ``add`` (or ``upsert``) record per text.
+
+        Args:
+            texts: Raw documents being ingested.
+            metadatas: Optional metadata mapping per document.
+            ids: Optional document identifier per text.
+            op: ``"add"`` for new documents, ``"upsert"`` for replacements.
+
+        Returns:
+            Byte offset just past the appended records.
+        """
+        timestamp = time.time()
+        metadata_list = metadatas if metadatas is not None else [None] * len(texts)
+        id_list: Sequence[Optional[str]] = ids if ids is not None else [None] * len(texts)
+        records: List[Record] = []
+        for text, metadata, doc_id in zip(texts, metadata_list, id_list):
+            record: Record = {"op": op, "text": text, "ts": timestamp}
+            if doc_id is not None:
+                record["id"] = doc_id
+            if metadata:
+                record["metadata"] = dict(metadata)
+            records.append(record)
+        return self._write(records)
+
+    def append_deletes(self, ids: Sequence[str]) -> int:
+        """Durably append one ``delete`` record per identifier.
+
+        Args:
+            ids: Identifiers of the documents being forgotten.
+
+        Returns:
+            Byte offset just past the appended records.
+        """
+        timestamp = time.time()
+        return self._write({"op": "delete", "id": doc_id, "ts": timestamp} for doc_id in ids)
+
+    def read(self, offset: int = 0) -> Iterator[Tuple[Record, int]]:
+        """Stream records starting at ``offset``.
+
+        Only one line is held in memory at a time. A trailing line without a
+        newline (an interrupted append) is not yielded.
+
+        Args:
+            offset: Byte offset of the first record to read.
+
+        Yields:
+            Tuples ``(record, end_offset)`` where ``end_offset`` is the offset
+            at which reading should resume after this record.
+        """
+        if not self._path.exists():
+            return
+        with open(self._path, "rb") as fh:
+            fh.seek(offset)
+            while True:
+                line = fh.readline()
+                if not line.endswith(b"\n"):
+                    break
+                yield json.loads(line), fh.tell()
+
+    def read_batches(
+        self, offset: int = 0, batch_size: int = 512
+    ) -> Iterator[Tuple[List[Record], int]]:
+        """Group :meth:`read` output into bounded batches.
+
+        Args:
+            offset: Byte offset of the first record to read.
+            batch_size: Maximum number of records per batch.
+
+        Yields:
+            Tuples ``(records, end_offset)`` for each batch.
+        """
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
+        batch: List[Record] = []
+        end = offset
+        for record, end in self.read(offset):
+            batch.append(record)
+            if len(batch) >= batch_size:
+                yield batch, end
+                batch = []
+        if batch:
+            yield batch, end
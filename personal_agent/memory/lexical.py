@@ -0,0 +1,144 @@
+"""BM25 inverted index and rank fusion for hybrid retrieval.
+
+:class:`BM25Index` keeps one postings list per term (row ids and term
+frequencies in compact ``array`` buffers), appended incrementally as rows are
+added. A query only touches the postings of its own terms, so short keyword
+queries score the handful of rows that contain them instead of the whole
+corpus. :func:`reciprocal_rank_fusion` merges lexical and vector rankings.
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import re
+from array import array
+from collections import Counter
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .vector_store import top_k_indices
+
+logger = logging.getLogger(__name__)
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: str) -> List[str]:
+    """Split ``text`` into lowercase word tokens."""
+    return _TOKEN_RE.findall(text.lower())
+
+
+class _Postings:
+    """Row ids and term frequencies of one term, in insertion order."""
+
+    __slots__ = ("rows", "freqs")
+
+    def __init__(self) -> None:
+        self.rows = array("q")
+        self.freqs = array("f")
+
+
+class BM25Index:
+    """Incremental Okapi BM25 index over row-aligned documents."""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75) -> None:
+        """Configure the scoring function.
+
+        Args:
+            k1: Term-frequency saturation.
+            b: Strength of document-length normalization.
+        """
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, _Postings] = {}
+        self._lengths = array("f")
+        self._total_length = 0.0
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def add(self, texts: Sequence[str]) -> None:
+        """Index ``texts`` as the next rows, in order."""
+        for text in texts:
+            row = len(self._lengths)
+            counts = Counter(tokenize(text))
+            for term, freq in counts.items():
+                postings = self._postings.get(term)
+                if postings is None:
+                    postings = self._postings[term] = _Postings()
+                postings.rows.append(row)
+                postings.freqs.append(freq)
+            length = float(sum(counts.values()))
+            self._lengths.append(length)
+            self._total_length += length
+
+    def reset(self) -> None:
+        """Drop every posting, e.g. before re-indexing a compacted store."""
+        self._postings = {}
+        self._lengths = array("f")
+        self._total_length = 0.0
+
+    def search(
+        self, query: str, top_k: int, allowed: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Rank the rows containing at least one query term.
+
+        Args:
+            query: Free-text query.
+            top_k: Maximum number of rows to return.
+            allowed: Optional boolean mask over rows; other rows are skipped.
+
+        Returns:
+            Tuple ``(rows, scores)`` ordered from best to worst match.
+        """
+        n_docs = len(self._lengths)
+        terms = [t for t in set(tokenize(query)) if t in self._postings]
+        if not terms or n_docs == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        lengths = np.frombuffer(self._lengths, dtype=np.float32)
+        avg_length = self._total_length / n_docs or 1.0
+        row_parts = []
+        score_parts = []
+        for term in terms:
+            postings = self._postings[term]
+            rows = np.frombuffer(postings.rows, dtype=np.int64)
+            freqs = np.frombuffer(postings.freqs, dtype=np.float32)
+            idf = math.log(1.0 + (n_docs - len(rows) + 0.5) / (len(rows) + 0.5))
+            norm = self.k1 * (1.0 - self.b + self.b * lengths[rows] / avg_length)
+            row_parts.append(rows)
+            score_parts.append(idf * freqs * (self.k1 + 1.0) / (freqs + norm))
+        rows = np.concatenate(row_parts)
+        contributions = np.concatenate(score_parts)
+        if allowed is not None:
+            keep = allowed[rows]
+            rows, contributions = rows[keep], contributions[keep]
+        candidates, inverse = np.unique(rows, return_inverse=True)
+        scores = np.bincount(inverse, weights=contributions).astype(np.float32)
+        best = top_k_indices(scores, top_k)
+        return candidates[best], scores[best]
+
+
+def reciprocal_rank_fusion(
+    rankings: Sequence[Sequence[int]], top_k: int, k: int = 60
+) -> List[int]:
+    """Merge several rankings of row ids with reciprocal rank fusion.
+
+    Each row scores ``sum(1 / (k + rank))`` over the rankings it appears in,
+    so rows ranked well by both retrievers rise to the top without having to
+    calibrate their raw scores against each other.
+
+    Args:
+        rankings: Row ids ordered from best to worst, one list per retriever.
+        top_k: Number of fused rows to return.
+        k: Damping constant; larger values flatten the rank contribution.
+
+    Returns:
+        Fused row ids, best first.
+    """
+    fused: Dict[int, float] = {}
+    for ranking in rankings:
+        for rank, row in enumerate(ranking):
+            fused[row] = fused.get(row, 0.0) + 1.0 / (k + rank + 1)
+    return sorted(fused, key=lambda row: (-fused[row], row))[:top_k]
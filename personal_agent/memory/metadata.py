@@ -0,0 +1,204 @@
+"""Columnar metadata index used to pre-filter ``SimpleRAG`` searches.
+
+Each metadata key is stored as a dictionary-encoded ``int32`` column (``-1``
+when a row has no value) and, for numeric values, a parallel ``float64``
+column (``NaN`` when missing). A filter is evaluated as vectorized
+comparisons over these columns, producing a boolean row bitmap before any
+vector is scored.
+
+Filters use a small Mongo-like syntax, with all keys combined by AND::
+
+    {"user": "alice", "source": {"$in": ["mail", "chat"]}, "ts": {"$gte": 10}}
+
+Supported operators are ``$eq``, ``$ne``, ``$in``, ``$nin``, ``$gt``, ``$gte``,
+``$lt`` and ``$lte``.
+
+Values must be JSON scalars (``str``, ``int``, ``float``, ``bool`` or
+``None``) so they read back unchanged from persistent stores and logs.
+Booleans are kept apart from numbers: ``True`` does not match ``1``.
+"""
+
+from __future__ import annotations
+
+import logging
+import numbers
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+Scalar = Union[str, int, float, bool, None]
+Metadata = Mapping[str, Scalar]
+Where = Mapping[str, Any]
+
+_RANGE_OPS = {
+    "$gt": np.greater,
+    "$gte": np.greater_equal,
+    "$lt": np.less,
+    "$lte": np.less_equal,
+}
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, numbers.Real) and not isinstance(value, bool)
+
+
+def _vocabulary_key(value: Any) -> Tuple[bool, Any]:
+    # ``True == 1`` in Python; tag booleans so they get their own code.
+    return isinstance(value, bool), value
+
+
+def check_metadata(metadatas: Sequence[Optional[Metadata]]) -> None:
+    """Reject metadata values that :class:`MetadataIndex` cannot store.
+
+    Called before a batch is written anywhere, so a bad value never reaches
+    the ingestion log or the store.
+
+    Raises:
+        ValueError: If a value is not a JSON scalar.
+    """
+    for metadata in metadatas:
+        for key, value in (metadata or {}).items():
+            if value is not None and not isinstance(value, (str, int, float)):
+                raise ValueError(
+                    f"Metadata value for '{key}' must be a str, int, float, bool or None"
+                )
+
+
+class _Column:
+    """Growable dictionary-encoded column with an optional numeric view."""
+
+    def __init__(self, size: int) -> None:
+        self.codes = np.full(max(size, 1), -1, dtype=np.int32)
+        self.numbers: Optional[np.ndarray] = None
+        self.vocabulary: Dict[Tuple[bool, Scalar], int] = {}
+        self.values: List[Scalar] = []
+
+    def reserve(self, size: int) -> None:
+        if size <= len(self.codes):
+            return
+        capacity = len(self.codes)
+        while capacity < size:
+            capacity *= 2
+        codes = np.full(capacity, -1, dtype=np.int32)
+        codes[: len(self.codes)] = self.codes
+        self.codes = codes
+        if self.numbers is not None:
+            numbers_ = np.full(capacity, np.nan)
+            numbers_[: len(self.numbers)] = self.numbers
+            self.numbers = numbers_
+
+    def set(self, row: int, value: Scalar) -> None:
+        key = _vocabulary_key(value)
+        code = self.vocabulary.get(key)
+        if code is None:
+            code = len(self.values)
+            self.vocabulary[key] = code
+            self.values.append(value)
+        self.codes[row] = code
+        if _is_number(value):
+            if self.numbers is None:
+                self.numbers = np.full(len(self.codes), np.nan)
+            self.numbers[row] = float(value)  # type: ignore[arg-type]
+
+    def code(self, value: Any) -> int:
+        try:
+            return self.vocabulary.get(_vocabulary_key(value), -2)
+        except TypeError:
+            raise ValueError(f"Unhashable metadata filter value: {value!r}") from None
+
+
+class MetadataIndex:
+    """Columnar per-row metadata supporting vectorized filters."""
+
+    def __init__(self) -> None:
+        self._size = 0
+        self._columns: Dict[str, _Column] = {}
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def keys(self) -> List[str]:
+        """Metadata keys seen so far."""
+        return list(self._columns)
+
+    def add(self, metadatas: Sequence[Optional[Metadata]]) -> None:
+        """Append one metadata mapping (or ``None``) per new row.
+
+        Args:
+            metadatas: Scalar metadata values keyed by name.
+
+        Raises:
+            ValueError: If a value is not a JSON scalar.
+        """
+        check_metadata(metadatas)
+        start = self._size
+        self._size += len(metadatas)
+        for existing in self._columns.values():
+            existing.reserve(self._size)
+        for offset, metadata in enumerate(metadatas):
+            for key, value in (metadata or {}).items():
+                column = self._columns.get(key)
+                if column is None:
+                    column = _Column(self._size)
+                    self._columns[key] = column
+                column.set(start + offset, value)
+
+    def get(self, row: int) -> Dict[str, Scalar]:
+        """Return the metadata stored for ``row``."""
+        if not 0 <= row < self._size:
+            raise IndexError(row)
+        return {
+            key: column.values[column.codes[row]]
+            for key, column in self._columns.items()
+            if column.codes[row] >= 0
+        }
+
+    def _condition(self, key: str, condition: Any) -> np.ndarray:
+        column = self._columns.get(key)
+        if not isinstance(condition, Mapping):
+            condition = {"$eq": condition}
+        mask = np.ones(self._size, dtype=bool)
+        for op, value in condition.items():
+            if column is None:
+                mask &= op in ("$ne", "$nin")
+                continue
+            codes = column.codes[: self._size]
+            if op == "$eq":
+                mask &= codes == column.code(value)
+            elif op == "$ne":
+                mask &= codes != column.code(value)
+            elif op in ("$in", "$nin"):
+                wanted = np.fromiter((column.code(v) for v in value), dtype=np.int32)
+                hit = np.isin(codes, wanted)
+                mask &= hit if op == "$in" else ~hit
+            elif op in _RANGE_OPS:
+                if not _is_number(value):
+                    raise ValueError(f"Operator {op} requires a number for '{key}'")
+                if column.numbers is None:
+                    mask[:] = False
+                    continue
+                with np.errstate(invalid="ignore"):
+                    mask &= _RANGE_OPS[op](column.numbers[: self._size], value)
+            else:
+                raise ValueError(f"Unsupported filter operator: {op}")
+        return mask
+
+    def mask(self, where: Where) -> np.ndarray:
+        """Evaluate ``where`` into a boolean bitmap over all rows.
+
+        Args:
+            where: Filter mapping; an empty mapping matches every row.
+
+        Returns:
+            Boolean array of length ``len(self)``.
+
+        Raises:
+            ValueError: If the filter uses an unsupported operator or value.
+        """
+        mask = np.ones(self._size, dtype=bool)
+        for key, condition in where.items():
+            mask &= self._condition(key, condition)
+        return mask
@@ -0,0 +1,353 @@
+"""Compressed vector codes and a re-ranking index built on them.
+
+A codec turns normalized float32 embeddings into compact codes and scores
+queries directly against those codes:
+
+* :class:`Float16Codec` halves the size with negligible loss.
+* :class:`ScalarInt8Codec` stores one byte per dimension using a per-dimension
+  scale learned from the first rows (4x smaller).
+* :class:`ProductCodec` splits each vector into sub-vectors and stores the
+  id of the closest of 256 k-means centroids for each one (``dim * 4 /
+  n_subvectors`` times smaller).
+
+:class:`QuantizedIndex` scans the codes to shortlist ``top_k * rerank_factor``
+candidates and re-ranks only those against the full-precision rows of the
+store. The codes are kept in addition to the float32 rows, so the index
+only saves memory with a persistent store (``SimpleRAG(path=...)``): there
+the full-precision rows stay in the memory-mapped file, the pages read
+while training and encoding are evicted again, and the resident footprint
+of search is the codes plus the pages of the shortlisted rows. With an
+in-memory store the codes add to the resident matrix instead, and the index
+logs a warning.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Dict, List, Optional, Protocol, Tuple, Type, Union
+
+import numpy as np
+
+from .ann_index import ExactIndex
+from .vector_store import VectorStore, normalize_rows, top_k_indices
+
+logger = logging.getLogger(__name__)
+
+
+class IVectorCodec(Protocol):
+    """Contract for vector compression schemes used by :class:`QuantizedIndex`."""
+
+    name: str
+
+    @property
+    def is_trained(self) -> bool:
+        """Whether :meth:`encode` can be called."""
+        ...
+
+    def train(self, vectors: np.ndarray) -> None:
+        """Learn codec parameters from a sample of normalized rows."""
+        ...
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        """Return one code row per vector."""
+        ...
+
+    def score(self, queries: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        """Approximate inner products of shape ``(len(queries), len(codes))``."""
+        ...
+
+    def bytes_per_vector(self, dim: int) -> int:
+        """Size of one code in bytes."""
+        ...
+
+
+class Float16Codec:
+    """Stores vectors as half-precision floats."""
+
+    name = "float16"
+    is_trained = True
+
+    def train(self, vectors: np.ndarray) -> None:
+        """Nothing to learn."""
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        """Cast ``vectors`` to float16."""
+        return np.asarray(vectors, dtype=np.float16)
+
+    def score(self, queries: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        """Score against codes widened back to float32."""
+        return queries @ codes.astype(np.float32).T
+
+    def bytes_per_vector(self, dim: int) -> int:
+        """Two bytes per dimension."""
+        return 2 * dim
+
+
+class ScalarInt8Codec:
+    """Symmetric int8 quantization with one scale per dimension."""
+
+    name = "int8"
+
+    def __init__(self) -> None:
+        self._scale: Optional[np.ndarray] = None
+
+    @property
+    def is_trained(self) -> bool:
+        """Whether the per-dimension scales are known."""
+        return self._scale is not None
+
+    def train(self, vectors: np.ndarray) -> None:
+        """Map the largest magnitude seen in each dimension to ``127``.
+
+        Later rows exceeding the training range are clipped.
+        """
+        peak = np.abs(np.asarray(vectors, dtype=np.float32)).max(axis=0)
+        peak[peak == 0] = 1.0
+        self._scale = (peak / 127.0).astype(np.float32)
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        """Round each component to the nearest step of its dimension."""
+        assert self._scale is not None
+        steps = np.rint(np.asarray(vectors, dtype=np.float32) / self._scale)
+        return np.clip(steps, -127, 127).astype(np.int8)
+
+    def score(self, queries: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        """Fold the scales into the queries and score the raw codes."""
+        assert self._scale is not None
+        return (queries * self._scale) @ codes.astype(np.float32).T
+
+    def bytes_per_vector(self, dim: int) -> int:
+        """One byte per dimension."""
+        return dim
+
+
+class ProductCodec:
+    """Product quantization with one byte per sub-vector.
+
+    Scoring uses asymmetric distance computation: the query is kept in full
+    precision and its inner product with every centroid of every subspace is
+    tabulated once, so scoring a code is ``n_subvectors`` table lookups.
+    """
+
+    name = "pq"
+
+    def __init__(
+        self,
+        n_subvectors: int = 8,
+        n_centroids: int = 256,
+        n_iter: int = 10,
+        seed: int = 0,
+    ) -> None:
+        """Configure the quantizer.
+
+        Args:
+            n_subvectors: Number of subspaces, i.e. bytes per code.
+            n_centroids: Centroids per subspace, at most 256.
+            n_iter: Number of k-means iterations per subspace.
+            seed: Seed for sampling and initialization.
+        """
+        if n_subvectors < 1 or not 1 <= n_centroids <= 256:
+            raise ValueError("n_subvectors must be positive and n_centroids in [1, 256]")
+        self.n_subvectors = n_subvectors
+        self.n_centroids = n_centroids
+        self.n_iter = n_iter
+        self._rng = np.random.default_rng(seed)
+        self._subspaces: List[np.ndarray] = []
+        self._centroids: List[np.ndarray] = []
+
+    @property
+    def is_trained(self) -> bool:
+        """Whether the subspace codebooks have been learned."""
+        return bool(self._centroids)
+
+    def _kmeans(self, sample: np.ndarray) -> np.ndarray:
+        k = min(self.n_centroids, len(sample))
+        centroids = sample[self._rng.choice(len(sample), k, replace=False)].copy()
+        for _ in range(self.n_iter):
+            labels = self._nearest(sample, centroids)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            counts = np.bincount(labels, minlength=k)
+            empty = counts == 0
+            if empty.any():
+                sums[empty] = sample[self._rng.choice(len(sample), int(empty.sum()))]
+                counts[empty] = 1
+            centroids = sums / counts[:, None]
+        return centroids.astype(np.float32)
+
+    @staticmethod
+    def _nearest(vectors: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        # argmin ||x - c||^2 == argmax (x.c - ||c||^2 / 2)
+        half_norms = 0.5 * np.einsum("ij,ij->i", centroids, centroids)
+        return np.argmax(vectors @ centroids.T - half_norms, axis=1)
+
+    def train(self, vectors: np.ndarray) -> None:
+        """Learn one k-means codebook per subspace."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        dim = vectors.shape[1]
+        if dim < self.n_subvectors:
+            raise ValueError(f"Dimension {dim} is smaller than n_subvectors")
+        self._subspaces = np.array_split(np.arange(dim), self.n_subvectors)
+        self._centroids = [self._kmeans(vectors[:, sub]) for sub in self._subspaces]
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        """Return the nearest centroid id of every subspace as ``uint8``."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        codes = np.empty((len(vectors), self.n_subvectors), dtype=np.uint8)
+        for m, (sub, centroids) in enumerate(zip(self._subspaces, self._centroids)):
+            codes[:, m] = self._nearest(vectors[:, sub], centroids)
+        return codes
+
+    def score(self, queries: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        """Sum per-subspace lookup tables indexed by the codes."""
+        scores = np.zeros((len(queries), len(codes)), dtype=np.float32)
+        for m, (sub, centroids) in enumerate(zip(self._subspaces, self._centroids)):
+            table = queries[:, sub] @ centroids.T
+            scores += table[:, codes[:, m]]
+        return scores
+
+    def bytes_per_vector(self, dim: int) -> int:
+        """One byte per subspace."""
+        return self.n_subvectors
+
+
+_CODECS: Dict[str, Type[IVectorCodec]] = {
+    "float16": Float16Codec,
+    "int8": ScalarInt8Codec,
+    "pq": ProductCodec,
+}
+
+
+class QuantizedIndex:
+    """Scores compressed codes, then re-ranks a shortlist exactly.
+
+    Codes are kept in sync with the store lazily, on search, and the codec is
+    trained on the first ``train_size`` rows it sees. Small corpora fall back
+    to exact search. The codes do not replace the store's float32 rows, so
+    memory is only saved when those rows are memory-mapped from disk; rows
+    are evicted from memory once encoded.
+    """
+
+    def __init__(
+        self,
+        codec: Union[str, IVectorCodec] = "int8",
+        rerank_factor: int = 4,
+        min_train_size: int = 1024,
+        train_size: int = 65536,
+        chunk_size: int = 65536,
+        scan_size: int = 8192,
+    ) -> None:
+        """Configure the index.
+
+        Args:
+            codec: Codec instance or one of ``"float16"``, ``"int8"``, ``"pq"``.
+            rerank_factor: Candidates re-ranked exactly per requested result.
+            min_train_size: Corpus size below which exact search is used.
+            train_size: Maximum number of rows used to train the codec.
+            chunk_size: Rows encoded at a time while syncing.
+            scan_size: Codes scored at a time during search.
+
+        Raises:
+            ValueError: If ``codec`` names an unknown codec.
+        """
+        if isinstance(codec, str):
+            if codec not in _CODECS:
+                raise ValueError(f"Unknown codec '{codec}'; expected one of {sorted(_CODECS)}")
+            codec = _CODECS[codec]()
+        if rerank_factor < 1:
+            raise ValueError("rerank_factor must be positive")
+        self.codec = codec
+        self.rerank_factor = rerank_factor
+        self.min_train_size = min_train_size
+        self.train_size = train_size
+        self.chunk_size = chunk_size
+        self.scan_size = scan_size
+        self._exact = ExactIndex()
+        self._chunks: List[np.ndarray] = []
+        self._codes: Optional[np.ndarray] = None
+        self._indexed = 0
+        self._warned = False
+        self._lock = threading.Lock()
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the codes."""
+        return sum(chunk.nbytes for chunk in self._chunks)
+
+    def reset(self) -> None:
+        """Drop every code; the codec keeps its trained parameters."""
+        self._chunks = []
+        self._codes = None
+        self._indexed = 0
+
+    def _sync(self, store: VectorStore) -> np.ndarray:
+        """Encode rows appended to ``store`` and return all codes."""
+        size = len(store)
+        if size < self._indexed:
+            self.reset()
+        if not self.codec.is_trained:
+            self.codec.train(store.vectors[: self.train_size])
+            store.evict(0, min(size, self.train_size))
+            logger.debug(
+                "Trained %s codec on %d rows", self.codec.name, min(size, self.train_size)
+            )
+        if not store.memory_mapped and not self._warned:
+            logger.warning(
+                "QuantizedIndex over an in-memory store keeps its codes in addition to "
+                "the float32 rows; open the store with path= to save memory"
+            )
+            self._warned = True
+        if size > self._indexed:
+            for start in range(self._indexed, size, self.chunk_size):
+                stop = min(start + self.chunk_size, size)
+                self._chunks.append(self.codec.encode(store.vectors[start:stop]))
+                # Encoding reads every row once; let the kernel drop those
+                # pages so only the codes and re-ranked rows stay resident.
+                store.evict(start, stop)
+            self._indexed = size
+            self._codes = None
+        if self._codes is None:
+            # Consolidate once per growth so searches scan one array.
+            self._codes = np.concatenate(self._chunks)
+            self._chunks = [self._codes]
+        return self._codes
+
+    def search_many(
+        self,
+        store: VectorStore,
+        queries: np.ndarray,
+        top_k: int,
+        rows: Optional[np.ndarray] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Shortlist rows on the codes and re-rank them in full precision."""
+        if len(store) < self.min_train_size:
+            return self._exact.search_many(store, queries, top_k, rows)
+        n_queries = int(np.shape(queries)[0])
+        if n_queries == 0 or (rows is not None and len(rows) == 0):
+            empty = (n_queries, 0)
+            return np.empty(empty, dtype=np.int64), np.empty(empty, dtype=np.float32)
+        with self._lock:
+            codes = self._sync(store)
+        normalized = normalize_rows(queries)
+        if rows is not None:
+            rows = np.asarray(rows, dtype=np.int64)
+            codes = codes[rows]
+        # Score in blocks so widened codes never exist for the whole corpus.
+        approx = np.concatenate(
+            [
+                self.codec.score(normalized, codes[start:start + self.scan_size])
+                for start in range(0, max(len(codes), 1), self.scan_size)
+            ],
+            axis=1,
+        )
+        shortlist = top_k_indices(approx, top_k * self.rerank_factor)
+        if rows is not None:
+            shortlist = rows[shortlist]
+        candidates = store.vectors[shortlist.ravel()].reshape(shortlist.shape + (-1,))
+        exact = np.einsum("qcd,qd->qc", candidates, normalized)
+        best = top_k_indices(exact, top_k)
+        return (
+            np.take_along_axis(shortlist, best, axis=-1),
+            np.take_along_axis(exact, best, axis=-1),
+        )
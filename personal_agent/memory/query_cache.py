@@ -0,0 +1,112 @@
+"""Result cache for repeated ``SimpleRAG`` queries.
+
+Entries are keyed by the normalized question, ``top_k``, metadata filter and
+query mode, and tagged with the corpus version they were computed against.
+``SimpleRAG`` bumps its version on every write, so a cached result is only
+served while the corpus it was computed from is unchanged; no explicit
+invalidation is needed. Entries also expire after a TTL and the cache is
+bounded by an LRU policy.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+from .metadata import Where
+
+logger = logging.getLogger(__name__)
+
+QueryKey = Tuple[str, int, str, str]
+
+
+def normalize_question(question: str) -> str:
+    """Case-fold ``question`` and collapse runs of whitespace."""
+    return " ".join(question.casefold().split())
+
+
+class QueryCache:
+    """Thread-safe LRU/TTL cache of ranked query results."""
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: Optional[float] = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Create the cache.
+
+        Args:
+            max_entries: Maximum number of cached results.
+            ttl: Seconds a result stays valid; ``None`` disables expiry.
+            clock: Time source, injectable for tests.
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be positive")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[int, float, List[str]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def make_key(
+        question: str, top_k: int, where: Optional[Where] = None, mode: str = "vector"
+    ) -> QueryKey:
+        """Build the cache key of a query."""
+        filters = json.dumps(where or {}, sort_keys=True, default=str)
+        return normalize_question(question), top_k, filters, mode
+
+    def get(self, key: Hashable, version: int) -> Optional[List[str]]:
+        """Return the cached result for ``key`` if computed at ``version``.
+
+        Stale or expired entries are dropped and counted as misses.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry_version, created, results = entry
+                expired = self.ttl is not None and self._clock() - created > self.ttl
+                if entry_version == version and not expired:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return list(results)
+                del self._entries[key]
+                self.invalidations += 1
+            self.misses += 1
+            return None
+
+    def put(self, key: Hashable, version: int, results: List[str]) -> None:
+        """Store ``results`` for ``key`` as computed at corpus ``version``."""
+        with self._lock:
+            self._entries[key] = (version, self._clock(), list(results))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every entry; counters are kept."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """Return hit/miss counters and the hit rate."""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+                "hit_rate": self.hits / total if total else 0.0,
+                "entries": len(self._entries),
+            }
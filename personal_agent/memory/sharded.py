@@ -0,0 +1,296 @@
+"""Hash-partitioned memory layer built from several ``SimpleRAG`` shards.
+
+Documents are routed to a shard by a stable hash of their id, so adds,
+upserts and deletes touch a single shard. A query is embedded once,
+scattered to every shard in parallel and the per-shard top-k lists are
+merged with a heap.
+
+Shards are searched on a thread pool by default; NumPy releases the GIL
+during scoring, so shards use several cores without copying any data. For
+persistent stores, ``processes > 0`` scores shards in worker processes that
+memory-map the shard files read-only: the operating system shares those
+pages between processes, so the matrices are never copied or pickled.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import heapq
+import itertools
+import logging
+import uuid
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .ann_index import IVectorIndex
+from .disk_store import MMapVectorStore, PathLike
+from .embedders import IEmbedder
+from .embedding_cache import EmbeddingCache
+from .metadata import Metadata, Where, check_metadata
+from .simple_rag import SimpleRAG
+
+logger = logging.getLogger(__name__)
+
+Scored = List[Tuple[float, str]]
+
+_worker_stores: Dict[str, MMapVectorStore] = {}
+
+
+def _search_mapped_shard(
+    path: str,
+    generation: int,
+    size: int,
+    queries: np.ndarray,
+    top_k: int,
+    rows: Optional[np.ndarray],
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Score one shard inside a worker process.
+
+    The shard is mapped read-only once per worker and remapped when the
+    caller has committed rows the mapping does not cover yet, or when a
+    compaction has rewritten the shard since it was mapped.
+    """
+    store = _worker_stores.get(path)
+    if store is None or store.generation != generation or len(store) < size:
+        store = _worker_stores[path] = MMapVectorStore(path, read_only=True)
+    if store.generation != generation:
+        raise RuntimeError(f"Shard {path} changed while being searched")
+    if rows is None and len(store) > size:
+        rows = np.arange(size)
+    elif rows is not None:
+        # Rows appended but not committed yet are not visible to workers.
+        rows = rows[rows < len(store)]
+    return store.search_many(queries, top_k, rows)
+
+
+def shard_for(doc_id: str, n_shards: int) -> int:
+    """Return the shard owning ``doc_id``; stable across processes and runs."""
+    digest = hashlib.blake2b(doc_id.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little") % n_shards
+
+
+def merge_top_k(results: Sequence[Scored], top_k: int) -> List[str]:
+    """Merge per-shard ``(score, document)`` lists, each sorted best first."""
+    merged = heapq.merge(*results, key=lambda item: -item[0])
+    return [doc for _, doc in itertools.islice(merged, top_k)]
+
+
+class ShardedRAG:
+    """Scatter-gather memory over ``n_shards`` independent ``SimpleRAG`` stores."""
+
+    def __init__(
+        self,
+        n_shards: int = 4,
+        path: Optional[PathLike] = None,
+        processes: int = 0,
+        embedder: Optional[IEmbedder] = None,
+        embedding_cache: Optional[EmbeddingCache] = None,
+        index_factory: Optional[Callable[[], IVectorIndex]] = None,
+    ) -> None:
+        """Create or open the shards.
+
+        Args:
+            n_shards: Number of partitions. Must not change for an existing
+                ``path``, since ids are routed by ``hash(id) % n_shards``.
+            path: Directory holding one persistent store per shard
+                (``shard-000``, ``shard-001``...). Shards live in memory if
+                omitted.
+            processes: Worker processes scoring persistent shards; ``0``
+                scores shards on threads. Worker processes search the
+                committed rows exactly, without the shard indexes.
+            embedder: Embedder shared by every shard.
+            embedding_cache: Embedding cache shared by every shard.
+            index_factory: Builds the search index of each shard.
+
+        Raises:
+            ValueError: If ``n_shards`` is not positive, or ``processes`` is
+                requested without a ``path``.
+        """
+        if n_shards < 1:
+            raise ValueError("n_shards must be positive")
+        if processes > 0 and path is None:
+            raise ValueError("processes requires persistent shards (path)")
+        self.n_shards = n_shards
+        self.processes = processes
+        self._paths = [
+            Path(path) / f"shard-{i:03d}" if path is not None else None
+            for i in range(n_shards)
+        ]
+        self._shards = [
+            SimpleRAG(
+                index=index_factory() if index_factory is not None else None,
+                path=shard_path,
+                embedding_cache=embedding_cache,
+                embedder=embedder,
+            )
+            for shard_path in self._paths
+        ]
+        self._executor: Optional[Executor] = None
+        logger.debug("ShardedRAG initialized with %d shards", n_shards)
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+    @property
+    def shards(self) -> List[SimpleRAG]:
+        """The underlying shards, indexed by shard number."""
+        return list(self._shards)
+
+    def _pool(self) -> Executor:
+        if self._executor is None:
+            if self.processes > 0:
+                self._executor = ProcessPoolExecutor(max_workers=self.processes)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.n_shards, thread_name_prefix="rag-shard"
+                )
+        return self._executor
+
+    def _group(self, ids: Sequence[str]) -> Dict[int, List[int]]:
+        """Map each shard to the positions of ``ids`` it owns."""
+        groups: Dict[int, List[int]] = {}
+        for position, doc_id in enumerate(ids):
+            groups.setdefault(shard_for(doc_id, self.n_shards), []).append(position)
+        return groups
+
+    def add_documents(
+        self,
+        texts: List[str],
+        metadatas: Optional[Sequence[Optional[Metadata]]] = None,
+        ids: Optional[Sequence[str]] = None,
+    ) -> List[str]:
+        """Route a batch of documents to their shards.
+
+        Args:
+            texts: Raw text documents.
+            metadatas: Optional scalar metadata per document.
+            ids: Optional stable identifiers; random ones are generated if
+                omitted.
+
+        Returns:
+            Identifiers of the stored documents, in input order.
+        """
+        id_list = list(ids) if ids is not None else [uuid.uuid4().hex for _ in texts]
+        if len(id_list) != len(texts):
+            raise ValueError("ids must have one entry per text")
+        if metadatas is not None:
+            check_metadata(metadatas)
+        for shard, positions in self._group(id_list).items():
+            self._shards[shard].add_documents(
+                [texts[i] for i in positions],
+                [metadatas[i] for i in positions] if metadatas is not None else None,
+                [id_list[i] for i in positions],
+            )
+        return id_list
+
+    def upsert(
+        self,
+        texts: List[str],
+        ids: Sequence[str],
+        metadatas: Optional[Sequence[Optional[Metadata]]] = None,
+    ) -> None:
+        """Insert or replace documents on the shards owning ``ids``."""
+        if len(ids) != len(texts):
+            raise ValueError("ids must have one entry per text")
+        if metadatas is not None:
+            check_metadata(metadatas)
+        for shard, positions in self._group(ids).items():
+            self._shards[shard].upsert(
+                [texts[i] for i in positions],
+                [ids[i] for i in positions],
+                [metadatas[i] for i in positions] if metadatas is not None else None,
+            )
+
+    def delete(self, ids: Sequence[str]) -> int:
+        """Delete documents from the shards owning ``ids``."""
+        return sum(
+            self._shards[shard].delete([ids[i] for i in positions])
+            for shard, positions in self._group(ids).items()
+        )
+
+    def query(
+        self, question: str, top_k: int = 5, where: Optional[Where] = None
+    ) -> List[str]:
+        """Retrieve the ``top_k`` best documents across every shard."""
+        return self.query_many([question], top_k, where)[0]
+
+    def query_many(
+        self, questions: List[str], top_k: int = 5, where: Optional[Where] = None
+    ) -> List[List[str]]:
+        """Embed ``questions`` once and scatter them to every shard.
+
+        Args:
+            questions: Natural language queries.
+            top_k: Number of results per question.
+            where: Optional metadata filter applied on every shard.
+
+        Returns:
+            One ranked list of documents per question, in input order.
+        """
+        if not questions:
+            return []
+        embeddings = self._shards[0]._embed(questions)
+        if self.processes > 0:
+            per_shard = self._search_in_processes(embeddings, top_k, where)
+        else:
+            pool = self._pool()
+            futures = [
+                pool.submit(shard.search_embeddings, embeddings, top_k, where)
+                for shard in self._shards
+            ]
+            per_shard = [future.result() for future in futures]
+        return [
+            merge_top_k([results[q] for results in per_shard], top_k)
+            for q in range(len(questions))
+        ]
+
+    def _search_in_processes(
+        self, embeddings: np.ndarray, top_k: int, where: Optional[Where]
+    ) -> List[List[Scored]]:
+        """Score every shard in worker processes over the mapped files.
+
+        Read locks are held on all shards until row ids are resolved to
+        documents, so no shard can compact in between.
+        """
+        pool = self._pool()
+        if where:
+            for shard in self._shards:
+                shard._sync_rows()
+        with ExitStack() as stack:
+            futures = []
+            for shard, shard_path in zip(self._shards, self._paths):
+                stack.enter_context(shard._rw.read())
+                allowed = shard._allowed_rows(where)
+                store = shard._store
+                generation = store.generation if isinstance(store, MMapVectorStore) else 0
+                futures.append(
+                    pool.submit(
+                        _search_mapped_shard,
+                        str(shard_path),
+                        generation,
+                        len(shard._store),
+                        embeddings,
+                        top_k,
+                        allowed,
+                    )
+                )
+            per_shard = []
+            for shard, future in zip(self._shards, futures):
+                rows, scores = future.result()
+                per_shard.append(
+                    [
+                        [(float(s), shard._docs[int(i)]) for i, s in zip(r, sc) if i >= 0]
+                        for r, sc in zip(rows, scores)
+                    ]
+                )
+        return per_shard
+
+    def close(self) -> None:
+        """Stop the worker pool, if started."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
@@ -3,98 +3,742 @@ Stub module for a simple Retrieval-Augmented Generation (RAG) system.
 
 This module defines the minimal interface for future memory integration.
 It exposes the SimpleRAG class, an in-memory placeholder that stores documents
-and returns basic matches for a query. Initial versions use ChromaDB for vector
-storage and retrieval, with plans to incorporate Neo4j for graph-based
-relationships in later iterations.
+and returns the closest matches for a query. Embeddings live in an in-process
+:class:`~personal_agent.memory.vector_store.VectorStore`, with plans to
+incorporate Neo4j for graph-based relationships in later iterations.
 """
 
 from __future__ import annotations
 
 import logging
-import string
+import os
+import shutil
+import threading
 import uuid
-from collections import Counter
-from typing import List
-import chromadb
-from chromadb.api.models.Collection import Collection
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Protocol, Sequence, Tuple
+
 import numpy as np
+
+from ..utils.rwlock import RWLock
+from .ann_index import ExactIndex, IVectorIndex
+from .chunking import batched, iter_chunks, prefetch
+from .disk_store import DiskDocumentStore, MMapVectorStore, PathLike
+from .embedders import CharHistogramEmbedder, IEmbedder
+from .embedding_cache import EmbeddingCache
+from .ingestion_log import IngestionLog, Record
+from .lexical import BM25Index, reciprocal_rank_fusion
+from .metadata import Metadata, MetadataIndex, Where, check_metadata
+from .query_cache import QueryCache
+from .vector_store import VectorStore
+
 logger = logging.getLogger(__name__)
 
+_QUERY_MODES = ("vector", "lexical", "hybrid")
+# Hybrid mode fuses candidate lists this many times deeper than ``top_k``.
+_FUSION_DEPTH = 4
 
-class _InMemoryCollection:
-    """Placeholder vector store used only for testing."""
 
-    def __init__(self, store: List[str]) -> None:
-        self._store = store
+class _DocumentSequence(Protocol):
+    """Indexable document container shared by memory and disk storage."""
 
-    def add(self, documents: List[str], embeddings: np.ndarray, ids: List[str]) -> None:
-        # embeddings and ids are currently unused but kept for API compatibility
-        del embeddings, ids
-        self._store.extend(documents)
+    def __len__(self) -> int:
+        ...
+
+    def __getitem__(self, index: int) -> str:
+        ...
+
+    def extend(self, texts: Iterable[str]) -> None:
+        ...
 
 
 class SimpleRAG:
-    """ChromaDB-backed RAG implementation."""
-
-    def __init__(self) -> None:
-        """Initialize the RAG system."""
-        self._client = chromadb.EphemeralClient()
-        collection_name = f"documents_{uuid.uuid4().hex}"
-        self._collection: Collection = self._client.create_collection(collection_name)
-        self._docs: List[str] = []
-        self._collection = _InMemoryCollection(self._docs)
+    """In-process RAG implementation backed by a :class:`VectorStore`."""
+
+    def __init__(
+        self,
+        index: Optional[IVectorIndex] = None,
+        path: Optional[PathLike] = None,
+        read_only: bool = False,
+        log: Optional[IngestionLog] = None,
+        embedding_cache: Optional[EmbeddingCache] = None,
+        embedder: Optional[IEmbedder] = None,
+        compact_threshold: Optional[float] = 0.5,
+        lexical_index: Optional[BM25Index] = None,
+        query_cache: Optional[QueryCache] = None,
+    ) -> None:
+        """Initialize the RAG system.
+
+        Args:
+            index: Search backend used by :meth:`query`. Defaults to exact
+                brute-force search; pass an :class:`IVFIndex` for large corpora.
+            path: Directory of a persistent store. Vectors are memory-mapped
+                and documents read on demand, so opening is cheap regardless
+                of the store size. Memory is kept in-process if omitted.
+            read_only: Open ``path`` read-only so several worker processes can
+                share the same mapped pages.
+            log: Ingestion log that receives the raw documents before they
+                are indexed.
+            embedding_cache: Cache shared by ingestion and queries so the same
+                text is never embedded twice. Unless the cache sets its own
+                ``namespace``, entries are keyed by the embedder's name.
+            embedder: Embedding backend. Defaults to
+                :class:`CharHistogramEmbedder`; wrap it in a
+                :class:`BatchedEmbedder` for bulk ingestion.
+            compact_threshold: Fraction of tombstoned rows above which
+                :meth:`compact` runs automatically after deletes and upserts.
+                ``None`` leaves compaction to explicit calls.
+            lexical_index: BM25 index maintained alongside the vectors, which
+                enables the ``"lexical"`` and ``"hybrid"`` query modes.
+                :meth:`compact` replaces it with a rebuilt index using the
+                same parameters.
+            query_cache: Cache of ranked results, invalidated automatically
+                whenever the corpus changes.
+        """
+        self._docs: _DocumentSequence
+        self._store: VectorStore
+        self._path = Path(path) if path is not None else None
+        if path is None:
+            self._docs = []
+            self._store = VectorStore()
+        else:
+            documents = DiskDocumentStore(path, read_only=read_only)
+            self._store = MMapVectorStore(path, read_only=read_only)
+            if not read_only:
+                documents.truncate(len(self._store))
+            self._docs = documents
+        self._index: IVectorIndex = index or ExactIndex()
+        self._log = log
+        self._embedding_cache = embedding_cache
+        self._embedder: IEmbedder = embedder or CharHistogramEmbedder()
+        self._compact_threshold = compact_threshold
+        # Per-row ids and metadata; filled lazily from disk records for
+        # stores opened with existing rows.
+        self._ids: List[str] = []
+        self._row_by_id: Dict[str, int] = {}
+        self._metadata = MetadataIndex()
+        self._lexical = lexical_index
+        self._query_cache = query_cache
+        # Bumped by every write so cached query results can detect staleness.
+        self._version = 0
+        # Writers are serialized by ``_write_mutex`` and embed outside the
+        # readers-writer lock, which they hold only to publish a batch.
+        # Ids and metadata of existing disk rows are loaded lazily, under the
+        # write lock, before a reader that needs them takes the read lock.
+        self._write_mutex = threading.RLock()
+        self._rw = RWLock()
         logger.debug("SimpleRAG initialized")
 
-    def _embed_texts(self, texts: List[str]) -> List[List[float]]:
+    def _embed_texts(self, texts: List[str]) -> np.ndarray:
         """Generate embeddings for a batch of texts.
 
         Args:
             texts: Documents or queries to embed.
 
         Returns:
-            List of vector embeddings.
+            Float32 matrix with one embedding per text.
+        """
+        return self._embedder.embed(texts)
+
+    @property
+    def log_offset(self) -> int:
+        """Ingestion-log offset up to which documents are indexed."""
+        return self._store.log_offset
+
+    @property
+    def version(self) -> int:
+        """Counter incremented whenever documents are added, replaced or removed."""
+        return self._version
+
+    def __len__(self) -> int:
+        """Number of live (not deleted) documents."""
+        return len(self._store) - self._store.n_deleted
+
+    def _register_rows(
+        self,
+        ids: Sequence[str],
+        metadatas: Optional[Sequence[Optional[Metadata]]],
+        texts: Sequence[str],
+    ) -> None:
+        """Record ids, metadata and lexical postings for appended rows."""
+        start = len(self._ids)
+        self._ids.extend(ids)
+        self._metadata.add(metadatas if metadatas is not None else [None] * len(ids))
+        if self._lexical is not None:
+            self._lexical.add(texts)
+        for row, doc_id in enumerate(ids, start):
+            if not self._store.is_deleted(row):
+                self._row_by_id[doc_id] = row
+
+    def _sync_rows(self, batch_size: int = 4096) -> None:
+        """Load ids and metadata of rows not seen yet from disk records.
+
+        The rows are registered under the write lock, so concurrent readers
+        never see the metadata or lexical indexes half-extended. Callers
+        must not hold the readers-writer lock.
+        """
+        if not isinstance(self._docs, DiskDocumentStore) or len(self._ids) == len(self._store):
+            return
+        with self._rw.write():
+            while len(self._ids) < len(self._store):
+                start = len(self._ids)
+                stop = min(start + batch_size, len(self._store))
+                records = [self._docs.record(i) for i in range(start, stop)]
+                self._register_rows(
+                    [r["id"] for r in records],
+                    [r.get("metadata") for r in records],
+                    [r["text"] for r in records],
+                )
+
+    def _allowed_rows(self, where: Optional[Where]) -> Optional[np.ndarray]:
+        """Translate tombstones and a metadata filter into allowed row indices.
+
+        Must be called with the read lock held, after :meth:`_sync_rows` when
+        ``where`` is given.
+        """
+        live = self._store.live_mask()
+        if not where:
+            return None if live is None else np.flatnonzero(live)
+        mask = self._metadata.mask(where)
+        if live is not None:
+            mask &= live
+        return np.flatnonzero(mask)
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        """Embed ``texts`` through the embedding cache, if configured."""
+        cache = self._embedding_cache
+        if cache is None:
+            return self._embed_texts(texts)
+        # Key vectors by model so a shared or persisted cache never serves
+        # embeddings computed by another embedder.
+        namespace = cache.namespace or self._embedder.name
+        return cache.embed(texts, self._embed_texts, namespace, self._store.dim)
+
+    def _write_batch(
+        self,
+        texts: List[str],
+        ids: List[str],
+        metadatas: Optional[Sequence[Optional[Metadata]]],
+        log_offset: int,
+        replace: bool = False,
+    ) -> None:
+        """Embed and store a batch, committing it with its log offset.
+
+        With ``replace`` the rows currently holding ``ids`` are tombstoned in
+        the same commit, which is how upserts are applied. Embedding runs
+        before the write lock is taken, so readers only wait for the append.
         """
-        alphabet = string.ascii_lowercase
+        embeddings = self._embed(texts)
+        if replace:
+            self._sync_rows()
+        with self._rw.write():
+            if replace:
+                stale = [self._row_by_id.pop(i) for i in ids if i in self._row_by_id]
+                if stale:
+                    self._store.delete(stale)
+            in_sync = len(self._ids) == len(self._store)
+            if isinstance(self._docs, DiskDocumentStore):
+                self._docs.extend(texts, ids=ids, metadatas=metadatas)
+            else:
+                self._docs.extend(texts)
+            self._store.add(embeddings)
+            self._store.log_offset = log_offset
+            self._version += 1
+            if in_sync:
+                self._register_rows(ids, metadatas, texts)
+        self._store.commit()
 
-        def embed(text: str) -> List[float]:
-            counts = Counter(c for c in text.lower() if c in alphabet)
-            return [float(counts.get(ch, 0)) for ch in alphabet]
+    def _delete_ids(self, ids: Sequence[str], log_offset: int) -> int:
+        """Tombstone the rows holding ``ids`` and commit the log offset."""
+        self._sync_rows()
+        with self._rw.write():
+            rows = [self._row_by_id.pop(i) for i in ids if i in self._row_by_id]
+            if rows:
+                self._store.delete(rows)
+                self._version += 1
+            self._store.log_offset = log_offset
+        self._store.commit()
+        return len(rows)
 
-        return [embed(t) for t in texts]
+    def _catch_up(self) -> None:
+        """Replay log records written but not yet indexed."""
+        if self._log is not None and self.log_offset < self._log.size():
+            self.replay(self._log)
 
-    def add_documents(self, texts: List[str]) -> None:
+    def _maybe_compact(self) -> None:
+        """Compact once tombstones exceed the configured fraction of rows."""
+        if self._compact_threshold is None or len(self._store) == 0:
+            return
+        if self._store.n_deleted / len(self._store) > self._compact_threshold:
+            self.compact()
+
+    @staticmethod
+    def _check_batch(
+        texts: Sequence[str],
+        ids: Optional[Sequence[str]],
+        metadatas: Optional[Sequence[Optional[Metadata]]],
+    ) -> None:
+        if metadatas is not None and len(metadatas) != len(texts):
+            raise ValueError("metadatas must have one entry per text")
+        if ids is not None and len(ids) != len(texts):
+            raise ValueError("ids must have one entry per text")
+        if metadatas is not None:
+            check_metadata(metadatas)
+
+    def add_documents(
+        self,
+        texts: List[str],
+        metadatas: Optional[Sequence[Optional[Metadata]]] = None,
+        ids: Optional[Sequence[str]] = None,
+    ) -> List[str]:
         """Ingest a batch of documents into the memory store.
 
+        When an ingestion log is attached, the texts are appended to it first
+        and any records the store has not indexed yet are replayed, so the
+        store never skips part of the log.
+
         Args:
             texts: Raw text documents to embed and persist.
+            metadatas: Optional scalar metadata per document (e.g. user,
+                source or timestamp) usable in query filters.
+            ids: Optional stable identifiers; random ones are generated if
+                omitted.
+
+        Returns:
+            Identifiers of the stored documents, in input order.
+
+        Raises:
+            ValueError: If ``metadatas`` or ``ids`` do not match ``texts`` in
+                length, or an id is repeated or already stored.
         """
-        embeddings = self._embed_texts(texts)
-        ids = [str(uuid.uuid4()) for _ in texts]
-        self._collection.add(documents=texts, embeddings=embeddings, ids=ids)
-        self._docs.extend(texts)
+        self._check_batch(texts, ids, metadatas)
+        with self._write_mutex:
+            # Replay pending log records first so ids they hold count as stored.
+            self._catch_up()
+            if ids is None:
+                id_list = [uuid.uuid4().hex for _ in texts]
+            else:
+                id_list = list(ids)
+                self._sync_rows()
+                if len(set(id_list)) != len(id_list):
+                    raise ValueError("ids must be unique within a batch")
+                existing = [i for i in id_list if i in self._row_by_id]
+                if existing:
+                    raise ValueError(f"Documents already stored: {existing}; use upsert")
+            if self._log is None:
+                log_offset = self.log_offset
+            else:
+                log_offset = self._log.append(texts, metadatas, id_list)
+            self._write_batch(texts, id_list, metadatas, log_offset)
 
         logger.info("Added %d documents", len(texts))
+        return id_list
+
+    def upsert(
+        self,
+        texts: List[str],
+        ids: Sequence[str],
+        metadatas: Optional[Sequence[Optional[Metadata]]] = None,
+    ) -> None:
+        """Insert documents or replace the ones already stored under ``ids``.
+
+        Replaced rows are tombstoned and reclaimed by :meth:`compact`. If an
+        id appears more than once, its last occurrence wins.
+
+        Args:
+            texts: New document texts.
+            ids: Identifiers of the documents to insert or replace.
+            metadatas: Optional scalar metadata per document.
+        """
+        self._check_batch(texts, ids, metadatas)
+        last = {doc_id: i for i, doc_id in enumerate(ids)}
+        keep = sorted(last.values())
+        texts = [texts[i] for i in keep]
+        id_list = [ids[i] for i in keep]
+        if metadatas is not None:
+            metadatas = [metadatas[i] for i in keep]
+        with self._write_mutex:
+            self._catch_up()
+            if self._log is None:
+                log_offset = self.log_offset
+            else:
+                log_offset = self._log.append(texts, metadatas, id_list, op="upsert")
+            self._write_batch(texts, id_list, metadatas, log_offset, replace=True)
+            logger.info("Upserted %d documents", len(texts))
+            self._maybe_compact()
+
+    def delete(self, ids: Sequence[str]) -> int:
+        """Forget the documents stored under ``ids``.
 
-    def query(self, question: str, top_k: int = 5) -> List[str]:
+        Rows are tombstoned immediately and no longer returned by queries;
+        their space is reclaimed by :meth:`compact`.
+
+        Args:
+            ids: Identifiers of the documents to delete. Unknown ids are
+                ignored.
+
+        Returns:
+            Number of documents deleted.
+        """
+        with self._write_mutex:
+            self._catch_up()
+            if self._log is None:
+                log_offset = self.log_offset
+            else:
+                log_offset = self._log.append_deletes(ids)
+            deleted = self._delete_ids(ids, log_offset)
+            logger.info("Deleted %d documents", deleted)
+            self._maybe_compact()
+            return deleted
+
+    def compact(self, batch_size: int = 4096) -> int:
+        """Rewrite the store without tombstoned rows.
+
+        Vectors, documents, ids, metadata and lexical postings are copied in
+        bounded batches into new structures and the search index is reset.
+        Persistent stores are rebuilt in a sibling directory that then
+        replaces the original. Queries keep running on the old store while
+        the copy is built; the write lock is only held to swap references.
+
+        Args:
+            batch_size: Number of rows copied at a time.
+
+        Returns:
+            Number of rows reclaimed.
+        """
+        with self._write_mutex:
+            live_mask = self._store.live_mask()
+            if live_mask is None:
+                return 0
+            self._sync_rows()
+            live = np.flatnonzero(live_mask).tolist()
+            reclaimed = len(self._store) - len(live)
+            ids = [self._ids[i] for i in live]
+            metadata = MetadataIndex()
+            lexical = (
+                BM25Index(self._lexical.k1, self._lexical.b)
+                if self._lexical is not None
+                else None
+            )
+            for start in range(0, len(live), batch_size):
+                metadata.add([self._metadata.get(i) for i in live[start:start + batch_size]])
+            if isinstance(self._docs, DiskDocumentStore):
+                target = self._build_compacted_disk(live, batch_size, lexical)
+            else:
+                store = VectorStore(dim=self._store.dim)
+                for start in range(0, len(live), batch_size):
+                    store.add(self._store.vectors[live[start:start + batch_size]])
+                store.log_offset = self._store.log_offset
+                docs = [self._docs[i] for i in live]
+                if lexical is not None:
+                    for start in range(0, len(docs), batch_size):
+                        lexical.add(docs[start:start + batch_size])
+            row_by_id = {doc_id: row for row, doc_id in enumerate(ids)}
+            with self._rw.write():
+                if isinstance(self._docs, DiskDocumentStore):
+                    self._swap_disk(target)
+                else:
+                    self._docs, self._store = docs, store
+                self._ids = ids
+                self._row_by_id = row_by_id
+                self._metadata = metadata
+                self._lexical = lexical
+                self._index.reset()
+                self._version += 1
+            logger.info("Compacted memory store, reclaiming %d rows", reclaimed)
+            return reclaimed
+
+    def _build_compacted_disk(
+        self, live: List[int], batch_size: int, lexical: Optional[BM25Index]
+    ) -> Path:
+        """Copy live rows into a sibling store directory and return it.
+
+        Texts of the copied rows are also added to ``lexical``, if given.
+        """
+        assert isinstance(self._docs, DiskDocumentStore) and self._path is not None
+        if isinstance(self._store, MMapVectorStore) and self._store.read_only:
+            raise PermissionError(f"Store at {self._path} was opened read-only")
+        target = self._path.with_name(self._path.name + ".compact")
+        if target.exists():
+            shutil.rmtree(target)
+        documents = DiskDocumentStore(target)
+        store = MMapVectorStore(target, dim=self._store.dim)
+        for start in range(0, len(live), batch_size):
+            rows = live[start:start + batch_size]
+            records = [self._docs.record(i) for i in rows]
+            texts = [r["text"] for r in records]
+            documents.extend(
+                texts,
+                ids=[r["id"] for r in records],
+                metadatas=[r.get("metadata") for r in records],
+            )
+            store.add(self._store.vectors[rows])
+            if lexical is not None:
+                lexical.add(texts)
+        store.log_offset = self._store.log_offset
+        if isinstance(self._store, MMapVectorStore):
+            store.generation = self._store.generation + 1
+        store.commit()
+        documents.close()
+        return target
+
+    def _swap_disk(self, target: Path) -> None:
+        """Replace the store directory with ``target`` and reopen it."""
+        assert isinstance(self._docs, DiskDocumentStore) and self._path is not None
+        backup = self._path.with_name(self._path.name + ".old")
+        if backup.exists():
+            shutil.rmtree(backup)
+        self._docs.close()
+        os.replace(self._path, backup)
+        os.replace(target, self._path)
+        shutil.rmtree(backup)
+        self._docs = DiskDocumentStore(self._path)
+        self._store = MMapVectorStore(self._path)
+
+    def ingest(
+        self,
+        documents: Iterable[str],
+        chunk_size: int = 1000,
+        overlap: int = 200,
+        batch_size: int = 256,
+        prefetch_batches: int = 0,
+    ) -> int:
+        """Chunk and index a stream of documents with bounded memory.
+
+        ``documents`` may be any iterable, including a generator reading a
+        large export. Chunks are embedded and committed one batch at a time;
+        the source is only advanced when the previous batch has been stored,
+        so memory usage does not depend on the size of the input.
+
+        Args:
+            documents: Iterable of raw documents.
+            chunk_size: Maximum chunk length in characters.
+            overlap: Characters shared between consecutive chunks.
+            batch_size: Number of chunks embedded and committed together.
+            prefetch_batches: If positive, read and chunk the source on a
+                background thread, keeping at most this many batches ready.
+
+        Returns:
+            Number of chunks indexed.
+        """
+        batches: Iterator[List[str]] = batched(
+            iter_chunks(documents, chunk_size, overlap), batch_size
+        )
+        if prefetch_batches > 0:
+            batches = prefetch(batches, prefetch_batches)
+        total = 0
+        for batch in batches:
+            self.add_documents(batch)
+            total += len(batch)
+        logger.info("Ingested %d chunks", total)
+        return total
+
+    def _apply_log_records(self, op: str, records: List[Record], log_offset: int) -> int:
+        """Apply a run of same-kind log records, committing ``log_offset``."""
+        if op == "delete":
+            self._delete_ids([r["id"] for r in records], log_offset)
+            return len(records)
+        ids = [r.get("id") or uuid.uuid4().hex for r in records]
+        # A run may hold several versions of one id; the last one wins, as
+        # in :meth:`upsert`.
+        last = {doc_id: i for i, doc_id in enumerate(ids)}
+        keep = sorted(last.values())
+        self._write_batch(
+            [records[i]["text"] for i in keep],
+            [ids[i] for i in keep],
+            [records[i].get("metadata") for i in keep],
+            log_offset,
+            replace=True,
+        )
+        return len(records)
+
+    def replay(self, log: IngestionLog, batch_size: int = 512) -> int:
+        """Apply records of ``log`` not yet covered by :attr:`log_offset`.
+
+        The log is streamed in bounded runs of consecutive records of the
+        same kind, and the offset is committed with every run, so an
+        interrupted replay resumes where it stopped and no record is
+        embedded twice. Added documents are applied as upserts, which makes
+        replaying a record twice harmless.
+
+        Args:
+            log: Ingestion log to read from.
+            batch_size: Maximum number of records embedded at once.
+
+        Returns:
+            Number of records applied.
+        """
+        with self._write_mutex:
+            replayed = 0
+            run: List[Record] = []
+            run_op = ""
+            run_end = self.log_offset
+            for record, end in log.read(self.log_offset):
+                op = "delete" if record.get("op") == "delete" else "upsert"
+                if run and (op != run_op or len(run) >= batch_size):
+                    replayed += self._apply_log_records(run_op, run, run_end)
+                    run = []
+                run.append(record)
+                run_op = op
+                run_end = end
+            if run:
+                replayed += self._apply_log_records(run_op, run, run_end)
+            logger.info("Replayed %d records from %s", replayed, log.path)
+            self._maybe_compact()
+            return replayed
+
+    def _check_mode(self, mode: str) -> None:
+        if mode not in _QUERY_MODES:
+            raise ValueError(f"Unknown query mode '{mode}'; expected one of {_QUERY_MODES}")
+        if mode != "vector" and self._lexical is None:
+            raise ValueError(f"Query mode '{mode}' requires a lexical_index")
+
+    def _rank(
+        self,
+        questions: List[str],
+        embeddings: Optional[np.ndarray],
+        top_k: int,
+        where: Optional[Where],
+        mode: str,
+    ) -> List[List[int]]:
+        """Return the best live row ids for each question under ``mode``.
+
+        Must be called with the read lock held, after :meth:`_sync_rows`
+        for filtered or lexical queries.
+        """
+        allowed = self._allowed_rows(where)
+        depth = top_k * _FUSION_DEPTH if mode == "hybrid" else top_k
+        vector: List[List[int]] = [[] for _ in questions]
+        lexical: List[List[int]] = [[] for _ in questions]
+        if embeddings is not None:
+            rows, _ = self._index.search_many(self._store, embeddings, depth, allowed)
+            vector = [[int(i) for i in ranked if i >= 0] for ranked in rows]
+        if self._lexical is not None and mode != "vector":
+            mask: Optional[np.ndarray] = None
+            if allowed is not None:
+                mask = np.zeros(len(self._store), dtype=bool)
+                mask[allowed] = True
+            lexical = [
+                self._lexical.search(q, depth, mask)[0].tolist() for q in questions
+            ]
+        if mode == "vector":
+            return vector
+        if mode == "lexical":
+            return lexical
+        return [
+            reciprocal_rank_fusion([v, lex], top_k) for v, lex in zip(vector, lexical)
+        ]
+
+    def _search(
+        self, questions: List[str], top_k: int, where: Optional[Where], mode: str
+    ) -> Tuple[int, List[List[str]]]:
+        """Rank ``questions`` on one consistent snapshot of the corpus.
+
+        Questions are embedded before the read lock is taken.
+
+        Returns:
+            The corpus version searched and the documents per question.
+        """
+        embeddings = self._embed(questions) if mode != "lexical" else None
+        if where or mode != "vector":
+            self._sync_rows()
+        with self._rw.read():
+            ranked = self._rank(questions, embeddings, top_k, where, mode)
+            return self._version, [[self._docs[i] for i in rows] for rows in ranked]
+
+    def search_embeddings(
+        self, embeddings: np.ndarray, top_k: int = 5, where: Optional[Where] = None
+    ) -> List[List[Tuple[float, str]]]:
+        """Rank documents for precomputed query embeddings, keeping scores.
+
+        Used by layers that embed once and merge results from several
+        stores, such as :class:`~personal_agent.memory.sharded.ShardedRAG`.
+
+        Args:
+            embeddings: Query embeddings of shape ``(q, dim)``.
+            top_k: Number of results per query.
+            where: Optional metadata filter.
+
+        Returns:
+            One list of ``(score, document)`` pairs per query, best first.
+        """
+        if len(self._store) == 0:
+            return [[] for _ in range(len(embeddings))]
+        if where:
+            self._sync_rows()
+        with self._rw.read():
+            allowed = self._allowed_rows(where)
+            rows, scores = self._index.search_many(self._store, embeddings, top_k, allowed)
+            return [
+                [
+                    (float(score), self._docs[int(i)])
+                    for i, score in zip(ranked, row_scores)
+                    if i >= 0
+                ]
+                for ranked, row_scores in zip(rows, scores)
+            ]
+
+    def query(
+        self,
+        question: str,
+        top_k: int = 5,
+        where: Optional[Where] = None,
+        mode: str = "vector",
+    ) -> List[str]:
         """Retrieve relevant documents for a given question.
 
         Args:
             question: Natural language query.
             top_k: Number of results to return.
+            where: Optional metadata filter, e.g. ``{"user": "alice"}``. It is
+                applied before scoring, so only matching rows are compared.
+            mode: ``"vector"`` ranks by embedding similarity, ``"lexical"``
+                by BM25 and ``"hybrid"`` fuses both with reciprocal rank
+                fusion. The last two require a ``lexical_index``.
+
+        Returns:
+            List of document snippets ranked by relevance.
+
+        Raises:
+            ValueError: If ``mode`` is unknown or needs a missing lexical index.
+        """
+        return self.query_many([question], top_k, where, mode)[0]
+
+    def query_many(
+        self,
+        questions: List[str],
+        top_k: int = 5,
+        where: Optional[Where] = None,
+        mode: str = "vector",
+    ) -> List[List[str]]:
+        """Retrieve relevant documents for several questions in one pass.
+
+        The questions are embedded as a single batch and scored against the
+        corpus with one matrix-matrix product. With a ``query_cache``, only
+        questions without a current cached result are ranked.
+
+        Args:
+            questions: Natural language queries.
+            top_k: Number of results to return per question.
+            where: Optional metadata filter shared by every question.
+            mode: Retrieval mode, as in :meth:`query`.
 
         Returns:
-            List of document snippets ranked by vector similarity.
+            One ranked list of document snippets per question, in input order.
         """
-        embedding = np.array(self._embed_texts([question])[0])
-        stored = self._collection.get(include=["documents", "embeddings"])
-        docs = stored.get("documents", [])
-        embs = np.array(stored.get("embeddings", []))
-        if len(embs) == 0:
+        self._check_mode(mode)
+        if not questions:
             return []
-        norms = np.linalg.norm(embs, axis=1) * np.linalg.norm(embedding)
-        # Avoid division by zero
-        norms[norms == 0] = 1e-10
-        scores = np.dot(embs, embedding) / norms
-        ranked = np.argsort(scores)[::-1][:top_k]
-        return [docs[i] for i in ranked]
-      
\ No newline at end of file
+        if len(self._store) == 0:
+            return [[] for _ in questions]
+        if self._query_cache is None:
+            return self._search(questions, top_k, where, mode)[1]
+        keys = [QueryCache.make_key(q, top_k, where, mode) for q in questions]
+        results = [self._query_cache.get(key, self._version) for key in keys]
+        misses = [i for i, cached in enumerate(results) if cached is None]
+        if misses:
+            version, found = self._search([questions[i] for i in misses], top_k, where, mode)
+            for i, docs in zip(misses, found):
+                self._query_cache.put(keys[i], version, docs)
+                results[i] = docs
+        return [docs or [] for docs in results]
@@ -0,0 +1,236 @@
+"""Contiguous in-process vector store used by :class:`SimpleRAG`.
+
+Embeddings are kept L2-normalized in a preallocated float32 matrix that grows
+by amortized doubling, so scoring a query is a single matrix-vector product
+over rows that are already ready to be compared.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Iterable, Optional, Set, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """Return ``vectors`` as float32 rows scaled to unit L2 norm.
+
+    Rows with zero norm are left as zeros so they score ``0`` against any
+    query instead of producing ``NaN`` values.
+
+    Args:
+        vectors: Matrix of shape ``(n, dim)`` or a single vector.
+
+    Returns:
+        Normalized float32 array with the same shape as ``vectors``.
+    """
+    out = np.array(vectors, dtype=np.float32, copy=True)
+    norms = np.linalg.norm(out, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    out /= norms
+    return out
+
+
+def top_k_indices(scores: np.ndarray, k: int) -> np.ndarray:
+    """Return the indices of the ``k`` highest scores in descending order.
+
+    Uses :func:`numpy.argpartition` so only the selected candidates are
+    sorted, keeping the cost linear in the number of scores. Matrices are
+    ranked row by row along the last axis.
+
+    Args:
+        scores: Array of similarity scores, one- or two-dimensional.
+        k: Number of indices to return per row.
+
+    Returns:
+        Integer array with at most ``k`` indices along the last axis.
+    """
+    n = scores.shape[-1]
+    k = min(k, n)
+    if k <= 0:
+        return np.empty(scores.shape[:-1] + (0,), dtype=np.int64)
+    if k < n:
+        candidates = np.argpartition(-scores, k - 1, axis=-1)[..., :k]
+    else:
+        candidates = np.broadcast_to(np.arange(n), scores.shape).copy()
+    selected = np.take_along_axis(scores, candidates, axis=-1)
+    order = np.argsort(-selected, axis=-1, kind="stable")
+    return np.take_along_axis(candidates, order, axis=-1)
+
+
+class VectorStore:
+    """Growable matrix of normalized float32 embeddings."""
+
+    def __init__(self, dim: Optional[int] = None, initial_capacity: int = 64) -> None:
+        """Create an empty store.
+
+        Args:
+            dim: Embedding dimension. Inferred from the first batch if omitted.
+            initial_capacity: Number of rows preallocated on first use.
+        """
+        if initial_capacity < 1:
+            raise ValueError("initial_capacity must be positive")
+        self._dim = dim
+        self._initial_capacity = initial_capacity
+        self._size = 0
+        self._matrix = np.empty((0, dim or 0), dtype=np.float32)
+        # Ingestion-log offset covered by the committed rows.
+        self.log_offset = 0
+        self._deleted: Set[int] = set()
+        self._live_mask: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def dim(self) -> Optional[int]:
+        """Embedding dimension, or ``None`` before the first insertion."""
+        return self._dim
+
+    @property
+    def capacity(self) -> int:
+        """Number of rows currently allocated."""
+        return int(self._matrix.shape[0])
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """View over the stored, normalized embeddings."""
+        return self._matrix[: self._size]
+
+    @property
+    def n_deleted(self) -> int:
+        """Number of tombstoned rows still occupying space."""
+        return len(self._deleted)
+
+    def delete(self, rows: Iterable[int]) -> None:
+        """Tombstone ``rows`` so they are no longer returned by searches.
+
+        The rows keep their space until the owner compacts the store.
+        """
+        for row in rows:
+            if not 0 <= row < self._size:
+                raise IndexError(row)
+            self._deleted.add(int(row))
+        self._live_mask = None
+
+    def is_deleted(self, row: int) -> bool:
+        """Whether ``row`` has been tombstoned."""
+        return row in self._deleted
+
+    def live_mask(self) -> Optional[np.ndarray]:
+        """Boolean mask of rows not tombstoned, or ``None`` if none are."""
+        if not self._deleted:
+            return None
+        if self._live_mask is None or len(self._live_mask) != self._size:
+            mask = np.ones(self._size, dtype=bool)
+            mask[np.fromiter(self._deleted, dtype=np.int64)] = False
+            self._live_mask = mask
+        return self._live_mask
+
+    def _reserve(self, required: int) -> None:
+        """Grow the backing matrix so it can hold ``required`` rows."""
+        if required <= self.capacity:
+            return
+        new_capacity = max(self.capacity, self._initial_capacity)
+        while new_capacity < required:
+            new_capacity *= 2
+        grown = np.empty((new_capacity, self._dim or 0), dtype=np.float32)
+        grown[: self._size] = self._matrix[: self._size]
+        self._matrix = grown
+        logger.debug("VectorStore capacity grown to %d rows", new_capacity)
+
+    def add(self, embeddings: np.ndarray) -> np.ndarray:
+        """Append a batch of embeddings.
+
+        Args:
+            embeddings: Matrix of shape ``(n, dim)``.
+
+        Returns:
+            Row indices assigned to the new embeddings.
+        """
+        batch = np.asarray(embeddings, dtype=np.float32)
+        if batch.ndim != 2:
+            raise ValueError("embeddings must be a 2-D matrix")
+        if self._dim is None:
+            self._dim = int(batch.shape[1])
+            self._matrix = np.empty((0, self._dim), dtype=np.float32)
+        elif batch.shape[1] != self._dim:
+            raise ValueError(
+                f"Expected embeddings of dimension {self._dim}, got {batch.shape[1]}"
+            )
+        start = self._size
+        stop = start + batch.shape[0]
+        self._reserve(stop)
+        self._matrix[start:stop] = normalize_rows(batch)
+        self._size = stop
+        return np.arange(start, stop)
+
+    def commit(self) -> None:
+        """Make appended rows durable. In-memory stores have nothing to do."""
+
+    @property
+    def memory_mapped(self) -> bool:
+        """Whether rows live in a file and are only resident once read."""
+        return False
+
+    def evict(self, start: int, stop: int) -> None:
+        """Hint that rows ``[start, stop)`` will not be read again soon.
+
+        In-memory stores keep every row resident, so this does nothing.
+        """
+
+    def search(
+        self, query: np.ndarray, top_k: int, rows: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Rank stored embeddings by cosine similarity to ``query``.
+
+        Args:
+            query: Query embedding of shape ``(dim,)``.
+            top_k: Maximum number of rows to return.
+            rows: Optional row indices restricting the search; only these
+                rows are scored.
+
+        Returns:
+            Tuple ``(rows, scores)`` ordered from most to least similar.
+        """
+        found, scores = self.search_many(np.asarray(query)[None, :], top_k, rows)
+        return found[0], scores[0]
+
+    def search_many(
+        self, queries: np.ndarray, top_k: int, rows: Optional[np.ndarray] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Rank stored embeddings for a batch of queries at once.
+
+        All queries are scored with a single matrix-matrix product.
+
+        Args:
+            queries: Query embeddings of shape ``(q, dim)``.
+            top_k: Maximum number of rows to return per query.
+            rows: Optional row indices restricting the search; only these
+                rows participate in the product.
+
+        Returns:
+            Tuple ``(rows, scores)`` of shape ``(q, min(top_k, candidates))``.
+        """
+        n_queries = int(np.shape(queries)[0])
+        n_candidates = self._size if rows is None else len(rows)
+        if n_candidates == 0 or n_queries == 0:
+            empty = (n_queries, 0)
+            return np.empty(empty, dtype=np.int64), np.empty(empty, dtype=np.float32)
+        normalized = normalize_rows(queries)
+        if rows is None or n_candidates * 2 < self._size:
+            candidates = self.vectors if rows is None else self.vectors[rows]
+            scores = normalized @ candidates.T
+            best = top_k_indices(scores, top_k)
+            found = best if rows is None else np.asarray(rows)[best]
+            return found, np.take_along_axis(scores, best, axis=-1)
+        # Most rows are allowed: score in place and mask the rest instead of
+        # copying the allowed rows out of the matrix.
+        scores = normalized @ self.vectors.T
+        masked = np.full_like(scores, -np.inf)
+        masked[:, rows] = scores[:, rows]
+        found = top_k_indices(masked, min(top_k, n_candidates))
+        return found, np.take_along_axis(scores, found, axis=-1)
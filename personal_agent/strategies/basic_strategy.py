@@ -11,8 +11,11 @@ class BasicStrategy(IExecutionStrategy):
     """Estratégia simples de execução.
 
     Utilizada como implementação mínima de :class:`IExecutionStrategy`.
+    Por ser determinística, pode ter suas respostas cacheadas.
     """
 
+    cacheable = True
+
     def execute(self, request: UserRequest) -> AgentResponse:
         """Executa a estratégia retornando uma resposta padrão.
 
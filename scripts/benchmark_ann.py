@@ -0,0 +1,97 @@
+"""Report recall@k versus latency of ``IVFIndex`` and ``QuantizedIndex`` settings.
+
+Builds a synthetic clustered corpus, measures the exact baseline and prints
+one line per ``n_probe`` value and per codec, with the memory held by the
+codes, so a setting can be chosen for production.
+
+Uso: python scripts/benchmark_ann.py [--size N] [--dim D] [--lists L] [--codecs int8 pq]
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(levelname)s: %(message)s",
+    stream=sys.stdout,
+)
+logger = logging.getLogger(__name__)
+
+
+def _clustered_data(rng: np.random.Generator, means: np.ndarray, size: int) -> np.ndarray:
+    labels = rng.integers(0, len(means), size=size)
+    return means[labels] + 0.3 * rng.normal(size=(size, means.shape[1]))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    root = Path(__file__).resolve().parent.parent
+    if str(root) not in sys.path:
+        sys.path.append(str(root))
+    from personal_agent.memory.ann_index import IVFIndex, evaluate_index
+    from personal_agent.memory.quantization import QuantizedIndex
+    from personal_agent.memory.vector_store import VectorStore
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=100_000)
+    parser.add_argument("--dim", type=int, default=64)
+    parser.add_argument("--lists", type=int, default=256)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--probes", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument("--codecs", nargs="*", default=["float16", "int8", "pq"])
+    parser.add_argument("--rerank", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(0)
+    store = VectorStore()
+    # Queries are drawn around the same cluster means as the corpus so recall
+    # is measured on in-distribution queries.
+    means = rng.normal(size=(args.lists, args.dim))
+    store.add(_clustered_data(rng, means, args.size))
+    queries = _clustered_data(rng, means, args.queries)
+
+    logger.info(
+        "Corpus: %d vetores de dimensão %d, %d listas, top_k=%d",
+        args.size,
+        args.dim,
+        args.lists,
+        args.top_k,
+    )
+    index = IVFIndex(n_lists=args.lists, min_train_size=0)
+    logger.info("%8s %10s %12s %12s", "n_probe", "recall@k", "ivf_ms", "exact_ms")
+    for n_probe in args.probes:
+        index.n_probe = n_probe
+        report = evaluate_index(store, index, queries, args.top_k)
+        logger.info(
+            "%8d %10.3f %12.3f %12.3f",
+            n_probe,
+            report.recall,
+            report.mean_latency_ms,
+            report.exact_latency_ms,
+        )
+
+    logger.info(
+        "%8s %10s %12s %12s %12s", "codec", "recall@k", "quant_ms", "exact_ms", "MiB"
+    )
+    logger.info("%8s %10s %12s %12s %12.1f", "float32", "-", "-", "-", store.vectors.nbytes / 2**20)
+    for codec in args.codecs:
+        quantized = QuantizedIndex(codec=codec, rerank_factor=args.rerank, min_train_size=0)
+        report = evaluate_index(store, quantized, queries, args.top_k)
+        logger.info(
+            "%8s %10.3f %12.3f %12.3f %12.1f",
+            codec,
+            report.recall,
+            report.mean_latency_ms,
+            report.exact_latency_ms,
+            quantized.nbytes / 2**20,
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
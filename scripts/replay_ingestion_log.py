@@ -0,0 +1,52 @@
+"""Rebuild or catch up a persistent ``SimpleRAG`` store from an ingestion log.
+
+The store directory records the log offset it has indexed, so running the
+command again only embeds records appended since the previous run. Pointing
+it at an empty directory rebuilds the store from scratch.
+
+Uso: python scripts/replay_ingestion_log.py <log.jsonl> <diretorio_da_memoria>
+"""
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(levelname)s: %(message)s",
+    stream=sys.stdout,
+)
+logger = logging.getLogger(__name__)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    root = Path(__file__).resolve().parent.parent
+    if str(root) not in sys.path:
+        sys.path.append(str(root))
+    from personal_agent.memory.ingestion_log import IngestionLog
+    from personal_agent.memory.simple_rag import SimpleRAG
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("log", help="Arquivo JSONL de ingestão")
+    parser.add_argument("store", help="Diretório da memória persistente")
+    parser.add_argument("--batch-size", type=int, default=512)
+    args = parser.parse_args(argv)
+
+    log = IngestionLog(args.log)
+    if not log.path.exists():
+        logger.error("Arquivo não encontrado: %s", args.log)
+        return 1
+
+    rag = SimpleRAG(path=args.store)
+    logger.info(
+        "Retomando a partir do offset %d de %d bytes", rag.log_offset, log.size()
+    )
+    replayed = rag.replay(log, batch_size=args.batch_size)
+    logger.info("%d registros indexados; offset atual: %d", replayed, rag.log_offset)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
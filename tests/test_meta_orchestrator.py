@@ -1,4 +1,10 @@
+import asyncio
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
 import pytest
 
 from personal_agent.core.interfaces import (
@@ -95,3 +101,47 @@ def test_execute_logs_and_reraises_on_strategy_error(
         and "falha simulada" in record.getMessage()
         for record in caplog.records
     )
+
+
+def test_aexecute_offloads_sync_strategies_to_executor() -> None:
+    """Estratégias síncronas lentas rodam em paralelo fora do laço."""
+
+    class SlowStrategy(IExecutionStrategy):
+        def execute(self, request: UserRequest) -> AgentResponse:
+            time.sleep(0.1)
+            return AgentResponse(text=threading.current_thread().name)
+
+    async def run() -> List[AgentResponse]:
+        requests = [UserRequest(text=f"pedido {i}") for i in range(20)]
+        return await asyncio.gather(*(orchestrator.aexecute(r) for r in requests))
+
+    with ThreadPoolExecutor(max_workers=20, thread_name_prefix="estrategia") as pool:
+        orchestrator = MetaOrchestrator(executor=pool)
+        orchestrator.strategies["basic"] = SlowStrategy()
+        start = time.perf_counter()
+        responses = asyncio.run(run())
+        elapsed = time.perf_counter() - start
+
+    assert elapsed < 1.0
+    assert all(r.text.startswith("estrategia") for r in responses)
+
+
+def test_aexecute_awaits_async_strategies_and_reraises() -> None:
+    class AsyncStrategy(BasicStrategy):
+        async def aexecute(self, request: UserRequest) -> AgentResponse:
+            await asyncio.sleep(0)
+            return AgentResponse(text=f"async: {request.text}")
+
+    class FailingAsyncStrategy(BasicStrategy):
+        async def aexecute(self, request: UserRequest) -> AgentResponse:
+            raise RuntimeError("falha assíncrona")
+
+    orchestrator = MetaOrchestrator()
+    orchestrator.strategies["basic"] = AsyncStrategy()
+    response = asyncio.run(orchestrator.aexecute(UserRequest(text="oi")))
+    assert response.text == "async: oi"
+    assert orchestrator.execute(UserRequest(text="oi")).text == "Processed: oi"
+
+    orchestrator.strategies["basic"] = FailingAsyncStrategy()
+    with pytest.raises(RuntimeError):
+        asyncio.run(orchestrator.aexecute(UserRequest(text="oi")))
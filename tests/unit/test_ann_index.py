@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from personal_agent.memory.ann_index import (
+    ExactIndex,
+    HnswlibIndex,
+    IVFIndex,
+    evaluate_index,
+)
+from personal_agent.memory.simple_rag import SimpleRAG
+from personal_agent.memory.vector_store import VectorStore
+
+
+def _clustered_store(size: int = 2000, dim: int = 16) -> VectorStore:
+    rng = np.random.default_rng(0)
+    means = rng.normal(size=(20, dim))
+    data = means[rng.integers(0, 20, size=size)] + 0.1 * rng.normal(size=(size, dim))
+    store = VectorStore()
+    store.add(data)
+    return store
+
+
+def test_ivf_falls_back_to_exact_below_min_train_size() -> None:
+    store = _clustered_store(size=100)
+    index = IVFIndex(n_lists=8, min_train_size=1000)
+    queries = store.vectors[:3]
+
+    rows, _ = index.search_many(store, queries, top_k=5)
+
+    expected, _ = ExactIndex().search_many(store, queries, top_k=5)
+    assert rows.tolist() == expected.tolist()
+    assert not index.is_trained
+
+
+def test_ivf_recall_improves_with_more_probes() -> None:
+    store = _clustered_store()
+    queries = store.vectors[:50] + 0.01
+
+    low = evaluate_index(store, IVFIndex(n_lists=32, n_probe=1, min_train_size=0), queries)
+    full = evaluate_index(store, IVFIndex(n_lists=32, n_probe=32, min_train_size=0), queries)
+
+    assert full.recall == 1.0
+    assert low.recall <= full.recall
+
+
+def test_ivf_searches_rows_appended_after_training() -> None:
+    store = _clustered_store(size=500)
+    index = IVFIndex(n_lists=8, n_probe=1, min_train_size=0)
+    index.search_many(store, store.vectors[:1], top_k=1)
+
+    new_row = store.add(np.full((1, store.dim or 0), 5.0))[0]
+    rows, _ = index.search_many(store, store.vectors[new_row][None, :], top_k=1)
+
+    assert rows[0, 0] == new_row
+
+
+def test_simple_rag_accepts_custom_index() -> None:
+    rag = SimpleRAG(index=IVFIndex(n_lists=2, n_probe=2, min_train_size=0))
+    rag.add_documents(["The cat sat on the mat", "Dogs are friendly", "zzz"])
+
+    assert rag.query("cat", top_k=1) == ["The cat sat on the mat"]
+
+
+def test_hnsw_keeps_using_the_graph_after_deletes_and_with_filters() -> None:
+    pytest.importorskip("hnswlib")
+    store = _clustered_store()
+    index = HnswlibIndex(min_train_size=100)
+    index._exact.search_many = None  # type: ignore[assignment]
+    queries = store.vectors[:10]
+
+    store.delete(range(5))
+    live = np.arange(5, len(store))
+    rows, _ = index.search_many(store, queries, top_k=5, rows=live)
+    assert not np.isin(rows, np.arange(5)).any()
+    assert rows[5:, 0].tolist() == list(range(5, 10))
+
+    even = live[live % 2 == 0]
+    rows, _ = index.search_many(store, queries, top_k=5, rows=even)
+    assert (rows % 2 == 0).all()
+    expected, _ = ExactIndex().search_many(store, queries, top_k=5, rows=even)
+    recall = np.mean([len(np.intersect1d(e, f)) / 5 for e, f in zip(expected, rows)])
+    assert recall >= 0.9
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import pytest
+
+from personal_agent.core.batch_executor import BatchingExecutor
+from personal_agent.core.interfaces import AgentResponse, UserRequest
+from personal_agent.core.meta_orchestrator import MetaOrchestrator
+from personal_agent.strategies.basic_strategy import BasicStrategy
+
+
+class RecordingBatchStrategy(BasicStrategy):
+    def __init__(self) -> None:
+        self.batches: List[List[str]] = []
+
+    def execute_batch(self, requests: List[UserRequest]) -> List[AgentResponse]:
+        self.batches.append([r.text for r in requests])
+        return [AgentResponse(text=f"batched: {r.text}") for r in requests]
+
+
+def test_execute_many_groups_by_strategy_and_keeps_order() -> None:
+    orchestrator = MetaOrchestrator()
+    strategy = RecordingBatchStrategy()
+    orchestrator.strategies["basic"] = strategy
+    requests = [UserRequest(text=t) for t in ["a", "research x", "b", "archive y", "c"]]
+
+    responses = orchestrator.execute_many(requests)
+
+    assert [r.text for r in responses] == [
+        "batched: a",
+        "Researching: research x",
+        "batched: b",
+        "Archived: archive y",
+        "batched: c",
+    ]
+    assert strategy.batches == [["a", "b", "c"]]
+
+
+def test_run_batch_rejects_mismatched_responses() -> None:
+    class ShortStrategy(BasicStrategy):
+        def execute_batch(self, requests: List[UserRequest]) -> List[AgentResponse]:
+            return []
+
+    orchestrator = MetaOrchestrator()
+    orchestrator.strategies["basic"] = ShortStrategy()
+
+    with pytest.raises(ValueError):
+        orchestrator.run_batch("basic", [UserRequest(text="a")])
+
+
+def test_executor_flushes_full_batches_and_deadlines() -> None:
+    orchestrator = MetaOrchestrator()
+    strategy = RecordingBatchStrategy()
+    orchestrator.strategies["basic"] = strategy
+
+    with BatchingExecutor(orchestrator, max_batch_size=4, max_latency=10.0) as executor:
+        futures = [executor.submit(UserRequest(text=str(i))) for i in range(8)]
+        assert [f.result(timeout=5).text for f in futures] == [f"batched: {i}" for i in range(8)]
+        assert strategy.batches == [["0", "1", "2", "3"], ["4", "5", "6", "7"]]
+
+    with BatchingExecutor(orchestrator, max_batch_size=100, max_latency=0.02) as executor:
+        start = time.monotonic()
+        assert executor.execute(UserRequest(text="solo")).text == "batched: solo"
+        assert time.monotonic() - start < 2.0
+
+
+def test_executor_concurrent_submissions_and_errors() -> None:
+    class FailingStrategy(BasicStrategy):
+        def execute_batch(self, requests: List[UserRequest]) -> List[AgentResponse]:
+            raise RuntimeError("lote falhou")
+
+    orchestrator = MetaOrchestrator()
+    orchestrator.strategies["archivist"] = FailingStrategy()
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        executor = BatchingExecutor(orchestrator, max_batch_size=8, max_latency=0.01, executor=pool)
+        texts = [f"pedido {i}" if i % 2 else f"archive {i}" for i in range(40)]
+        futures = list(pool.map(lambda t: executor.submit(UserRequest(text=t)), texts))
+        executor.close()
+        for text, future in zip(texts, futures):
+            if text.startswith("archive"):
+                with pytest.raises(RuntimeError):
+                    future.result(timeout=5)
+            else:
+                assert future.result(timeout=5).text == f"Processed: {text}"
+
+    with pytest.raises(RuntimeError):
+        executor.submit(UserRequest(text="tarde"))
+
+
+def test_dispatch_failures_resolve_futures() -> None:
+    orchestrator = MetaOrchestrator()
+    pool = ThreadPoolExecutor(max_workers=1)
+    pool.shutdown()
+    executor = BatchingExecutor(orchestrator, max_batch_size=1, executor=pool)
+
+    with pytest.raises(RuntimeError):
+        executor.submit(UserRequest(text="a")).result(timeout=2)
+    assert executor._thread.is_alive()
+    executor.close()
+
+    executor = BatchingExecutor(orchestrator, max_batch_size=100, max_latency=10.0)
+
+    def crash() -> None:
+        raise ValueError("falha inesperada")
+
+    future = executor.submit(UserRequest(text="b"))
+    executor._take_ready = crash  # type: ignore[method-assign, assignment]
+    with executor._cond:
+        executor._cond.notify()
+    with pytest.raises(RuntimeError, match="parou"):
+        future.result(timeout=2)
+    with pytest.raises(RuntimeError, match="parou"):
+        executor.submit(UserRequest(text="c"))
+    executor.close()
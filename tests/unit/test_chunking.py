@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from typing import Any, Iterator, List
+
+import pytest
+
+from personal_agent.memory.chunking import batched, chunk_text, prefetch
+from personal_agent.memory.simple_rag import SimpleRAG
+
+
+def test_chunk_text_respects_size_and_overlap() -> None:
+    text = " ".join(f"word{i}" for i in range(100))
+
+    chunks = list(chunk_text(text, chunk_size=50, overlap=10))
+
+    assert all(len(chunk) <= 50 for chunk in chunks)
+    assert chunks[0].startswith("word0 ")
+    assert chunks[-1].endswith("word99")
+    assert chunks[1].split()[0] in chunks[0]
+
+
+def test_chunk_text_rejects_invalid_overlap() -> None:
+    with pytest.raises(ValueError):
+        list(chunk_text("abc", chunk_size=5, overlap=5))
+
+
+def test_batched_groups_lazily() -> None:
+    assert list(batched(range(5), 2)) == [[0, 1], [2, 3], [4]]
+
+
+def test_prefetch_propagates_source_errors() -> None:
+    def source() -> Iterator[int]:
+        yield 1
+        raise RuntimeError("boom")
+
+    consumed = []
+    with pytest.raises(RuntimeError):
+        for item in prefetch(source(), maxsize=1):
+            consumed.append(item)
+    assert consumed == [1]
+
+
+def test_ingest_consumes_generator_in_bounded_batches() -> None:
+    rag = SimpleRAG()
+    pulled = []
+
+    def documents() -> Iterator[str]:
+        for i in range(10):
+            pulled.append(i)
+            yield f"document {i} " * 20
+
+    committed = []
+    original = rag.add_documents
+
+    def spy(texts: List[str], metadatas: Any = None, ids: Any = None) -> List[str]:
+        committed.append((len(texts), len(pulled)))
+        return original(texts, metadatas, ids)
+
+    rag.add_documents = spy  # type: ignore[method-assign]
+    total = rag.ingest(documents(), chunk_size=100, overlap=20, batch_size=4)
+
+    assert total == len(rag._docs)
+    assert all(size <= 4 for size, _ in committed)
+    assert committed[0][1] < 10
+
+
+def test_ingest_with_prefetch_indexes_everything() -> None:
+    rag = SimpleRAG()
+
+    total = rag.ingest((f"doc {i}" for i in range(50)), batch_size=8, prefetch_batches=2)
+
+    assert total == 50
+    assert rag.query("doc 7", top_k=1)
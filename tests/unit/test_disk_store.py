@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from personal_agent.memory.disk_store import DiskDocumentStore, MMapVectorStore
+from personal_agent.memory.simple_rag import SimpleRAG
+
+DOCS = [
+    "The cat sat on the mat",
+    "Dogs are friendly",
+    "Cats and kittens are cute",
+]
+
+
+def test_persistent_rag_survives_reopen(tmp_path: Path) -> None:
+    rag = SimpleRAG(path=tmp_path)
+    rag.add_documents(DOCS)
+    expected = rag.query("cat", top_k=2)
+
+    reopened = SimpleRAG(path=tmp_path, read_only=True)
+
+    assert isinstance(reopened._store.vectors, np.memmap)
+    assert reopened.query("cat", top_k=2) == expected == [DOCS[0], DOCS[2]]
+
+
+def test_read_only_store_rejects_writes(tmp_path: Path) -> None:
+    SimpleRAG(path=tmp_path).add_documents(DOCS)
+    reader = SimpleRAG(path=tmp_path, read_only=True)
+
+    with pytest.raises(PermissionError):
+        reader.add_documents(["more"])
+
+
+def test_mmap_store_grows_file_across_batches(tmp_path: Path) -> None:
+    store = MMapVectorStore(tmp_path, initial_capacity=2)
+    store.add(np.ones((3, 4)))
+    store.commit()
+    store.add(np.ones((2, 4)))
+    store.commit()
+
+    reopened = MMapVectorStore(tmp_path)
+
+    assert len(reopened) == 5
+    assert reopened.capacity == 8
+
+
+def test_uncommitted_documents_are_truncated_on_open(tmp_path: Path) -> None:
+    rag = SimpleRAG(path=tmp_path)
+    rag.add_documents(DOCS[:1])
+    DiskDocumentStore(tmp_path).extend(["orphan"])
+
+    reopened = SimpleRAG(path=tmp_path)
+
+    assert len(reopened._docs) == 1
+    reopened.add_documents(DOCS[1:])
+    assert [reopened._docs[i] for i in range(3)] == DOCS
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import pickle
+import string
+from collections import Counter
+from typing import List
+
+import numpy as np
+
+from personal_agent.memory.embedders import (
+    BatchedEmbedder,
+    CharHistogramEmbedder,
+    SentenceTransformerEmbedder,
+)
+from personal_agent.memory.simple_rag import SimpleRAG
+
+TEXTS = [f"document number {i} about cats" for i in range(10)]
+
+
+def test_char_histogram_counts_letters() -> None:
+    vectors = CharHistogramEmbedder().embed(["Abba!", ""])
+
+    assert vectors.shape == (2, 26)
+    assert vectors.dtype == np.float32
+    assert vectors[0, 0] == 2 and vectors[0, 1] == 2
+    assert not vectors[1].any()
+
+
+def test_batched_embedder_matches_wrapped_embedder() -> None:
+    base = CharHistogramEmbedder()
+    batched = BatchedEmbedder(base, batch_size=3)
+
+    np.testing.assert_array_equal(batched.embed(TEXTS), base.embed(TEXTS))
+    assert batched.embed([]).shape == (0, 26)
+
+
+def test_batched_embedder_process_pool_preserves_order() -> None:
+    batched = BatchedEmbedder(CharHistogramEmbedder(), batch_size=2, processes=2)
+    try:
+        vectors = batched.embed(TEXTS)
+    finally:
+        batched.close()
+
+    np.testing.assert_array_equal(vectors, CharHistogramEmbedder().embed(TEXTS))
+
+
+def test_sentence_transformer_embedder_pickles_without_model() -> None:
+    embedder = SentenceTransformerEmbedder("some-model")
+    embedder._model = object()
+
+    restored = pickle.loads(pickle.dumps(embedder))
+
+    assert restored._model is None
+    assert restored.name == "sentence-transformers/some-model"
+
+
+def test_simple_rag_uses_injected_embedder() -> None:
+    rag = SimpleRAG(embedder=BatchedEmbedder(CharHistogramEmbedder(), batch_size=1))
+    rag.add_documents(["The cat sat on the mat", "Dogs are friendly"])
+
+    assert rag.query("dog", top_k=1) == ["Dogs are friendly"]
+
+
+def test_char_histogram_matches_counter_reference() -> None:
+    texts = ["Olá, Mundo! ÀÉÎ", "The QUICK brown fox", "ß straße K", "", "zz"]
+
+    def reference(text: str) -> List[float]:
+        counts = Counter(c for c in text.lower() if c in string.ascii_lowercase)
+        return [float(counts.get(ch, 0)) for ch in string.ascii_lowercase]
+
+    vectors = CharHistogramEmbedder().embed(texts)
+
+    assert vectors.tolist() == [reference(t) for t in texts]
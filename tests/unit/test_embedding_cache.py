@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import List, Sequence
+
+import numpy as np
+
+from personal_agent.memory.embedding_cache import EmbeddingCache
+from personal_agent.memory.simple_rag import SimpleRAG
+
+
+class _CountingEmbedder:
+    def __init__(self) -> None:
+        self.calls: List[List[str]] = []
+
+    def __call__(self, texts: List[str]) -> np.ndarray:
+        self.calls.append(list(texts))
+        return np.array([[len(t), 1.0] for t in texts], dtype=np.float32)
+
+
+def test_cache_embeds_each_unique_text_once() -> None:
+    cache = EmbeddingCache()
+    embedder = _CountingEmbedder()
+
+    first = cache.embed(["a", "bb", "a"], embedder)
+    second = cache.embed(["bb", "ccc"], embedder)
+
+    assert embedder.calls == [["a", "bb"], ["ccc"]]
+    assert first.shape == (3, 2)
+    np.testing.assert_array_equal(second[0], first[1])
+    assert cache.stats()["hits"] == 2
+    assert cache.stats()["misses"] == 3
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    cache = EmbeddingCache(max_entries=2)
+    embedder = _CountingEmbedder()
+    cache.embed(["a", "b"], embedder)
+    cache.embed(["a"], embedder)
+    cache.embed(["c"], embedder)
+
+    cache.embed(["a", "b"], embedder)
+
+    assert len(cache) == 2
+    assert embedder.calls[-1] == ["b"]
+
+
+def test_disk_tier_survives_new_instance(tmp_path: Path) -> None:
+    path = tmp_path / "embeddings.db"
+    cache = EmbeddingCache(path=path)
+    cache.embed(["persisted"], _CountingEmbedder())
+    cache.close()
+
+    embedder = _CountingEmbedder()
+    reopened = EmbeddingCache(path=path)
+    vector = reopened.embed(["persisted"], embedder)
+
+    assert embedder.calls == []
+    assert vector[0].tolist() == [9.0, 1.0]
+
+
+def test_simple_rag_shares_cache_between_ingestion_and_query() -> None:
+    cache = EmbeddingCache()
+    rag = SimpleRAG(embedding_cache=cache)
+    rag.add_documents(["cat", "dog", "cat"])
+
+    assert rag.query("dog", top_k=1) == ["dog"]
+    assert cache.stats()["misses"] == 2
+    assert cache.stats()["hits"] == 2
+
+
+class _NamedEmbedder:
+    def __init__(self, name: str, dim: int) -> None:
+        self.name = name
+        self.dim = dim
+        self.calls = 0
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        self.calls += 1
+        return np.ones((len(texts), self.dim), dtype=np.float32)
+
+
+def test_swapping_embedders_does_not_hit_cached_vectors(tmp_path: Path) -> None:
+    path = tmp_path / "embeddings.db"
+    cache = EmbeddingCache(path=path)
+    SimpleRAG(embedding_cache=cache, embedder=_NamedEmbedder("old", 4)).add_documents(["cat"])
+    cache.close()
+
+    cache = EmbeddingCache(path=path)
+    new = _NamedEmbedder("new", 4)
+    rag = SimpleRAG(embedding_cache=cache, embedder=new)
+    rag.add_documents(["cat"])
+    assert new.calls == 1
+    assert cache.stats()["hits"] == 0
+
+    vector = cache.embed(["cat"], _NamedEmbedder("old", 8).embed, namespace="old", dim=8)
+    assert vector.shape == (1, 8)
+    assert cache.stats()["hits"] == 0
@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import numpy as np
+
+from personal_agent.memory.graph_memory import GraphMemory, InMemoryGraphBackend
+
+
+def _memory() -> GraphMemory:
+    memory = GraphMemory()
+    memory.add_entities(
+        ["alice", "acme", "zurich", "bob"],
+        ["alice engineer", "acme corporation", "zurich city", "bob baker"],
+    )
+    memory.add_relations(
+        [("alice", "works_at", "acme"), ("acme", "located_in", "zurich")]
+    )
+    return memory
+
+
+def test_neighbours_follow_edges_in_both_directions() -> None:
+    backend = InMemoryGraphBackend()
+    backend.upsert_entities(["a", "b", "c", "d"], ["a", "b", "c", "d"], np.eye(4))
+    backend.add_relations([0, 1], ["r", "r"], [1, 2])
+
+    assert backend.neighbours(np.array([1])).tolist() == [0, 2]
+    assert backend.neighbours(np.array([3])).tolist() == []
+    backend.add_relations([3], ["s"], [0])
+    assert backend.neighbours(np.array([0])).tolist() == [1, 3]
+
+
+def test_query_expands_from_vector_seeds() -> None:
+    memory = _memory()
+
+    direct = memory.query("alice", top_k=4, hops=0, seeds=1)
+    expanded = memory.query("alice", top_k=4, hops=2, seeds=1)
+
+    assert [hit.name for hit in direct] == ["alice"]
+    assert {hit.name for hit in expanded} == {"alice", "acme", "zurich"}
+    assert {hit.name: hit.hops for hit in expanded}["zurich"] == 2
+
+
+def test_max_nodes_bounds_expansion() -> None:
+    memory = GraphMemory()
+    memory.add_relations([("hub", "links", f"leaf{i}") for i in range(100)])
+
+    hits = memory.query("hub", top_k=100, hops=1, seeds=1, max_nodes=10)
+
+    assert len(hits) == 10
+
+
+def test_relations_lists_outgoing_edges_and_creates_endpoints() -> None:
+    memory = _memory()
+
+    assert memory.relations("acme") == [("located_in", "zurich")]
+    memory.add_relations([("bob", "knows", "carol")])
+    assert memory.relations("bob") == [("knows", "carol")]
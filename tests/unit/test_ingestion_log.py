@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from personal_agent.memory.ingestion_log import IngestionLog
+from personal_agent.memory.simple_rag import SimpleRAG
+from scripts.replay_ingestion_log import main as replay_main
+
+
+def test_read_batches_streams_from_offset(tmp_path: Path) -> None:
+    log = IngestionLog(tmp_path / "log.jsonl")
+    first_end = log.append(["a", "b", "c"])
+    log.append(["d"])
+
+    batches = list(log.read_batches(offset=0, batch_size=2))
+    resumed = [r["text"] for r, _ in log.read(first_end)]
+
+    assert [[r["text"] for r in batch] for batch, _ in batches] == [["a", "b"], ["c", "d"]]
+    assert batches[-1][1] == log.size()
+    assert resumed == ["d"]
+
+
+def test_interrupted_trailing_record_is_ignored(tmp_path: Path) -> None:
+    log = IngestionLog(tmp_path / "log.jsonl")
+    log.append(["a"])
+    with open(log.path, "ab") as fh:
+        fh.write(b'{"op": "add", "te')
+
+    assert [r["text"] for r, _ in log.read()] == ["a"]
+
+
+def test_replay_only_indexes_new_records(tmp_path: Path) -> None:
+    log = IngestionLog(tmp_path / "log.jsonl")
+    writer = SimpleRAG(log=log)
+    writer.add_documents(["The cat sat on the mat", "Dogs are friendly"])
+
+    rebuilt = SimpleRAG(path=tmp_path / "store")
+    assert rebuilt.replay(log) == 2
+    writer.add_documents(["Cats and kittens are cute"])
+
+    assert rebuilt.replay(log, batch_size=1) == 1
+    assert rebuilt.replay(log) == 0
+    assert rebuilt.log_offset == log.size()
+    assert rebuilt.query("cat", top_k=2) == writer.query("cat", top_k=2)
+
+
+def test_replay_script_resumes_from_store_offset(tmp_path: Path) -> None:
+    log = IngestionLog(tmp_path / "log.jsonl")
+    log.append(["first"])
+    store = tmp_path / "store"
+
+    assert replay_main([str(log.path), str(store)]) == 0
+    log.append(["second"])
+    assert replay_main([str(log.path), str(store)]) == 0
+
+    reopened = SimpleRAG(path=store, read_only=True)
+    assert len(reopened._docs) == 2
@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import json
+import logging
+from pathlib import Path
+
+import pytest
+
+from personal_agent.core.instrumentation import (
+    Histogram,
+    InMemorySink,
+    JsonlSink,
+    PrometheusSink,
+    RequestSpan,
+)
+from personal_agent.core.interfaces import AgentResponse, IExecutionStrategy, UserRequest
+from personal_agent.core.meta_orchestrator import MetaOrchestrator
+
+
+def test_spans_record_phases_and_errors() -> None:
+    class FailingStrategy(IExecutionStrategy):
+        def execute(self, request: UserRequest) -> AgentResponse:
+            raise RuntimeError("falha")
+
+    sink = InMemorySink()
+    orchestrator = MetaOrchestrator(sinks=[sink])
+    orchestrator.execute(UserRequest(text="please research this"))
+    orchestrator.strategies["basic"] = FailingStrategy()
+    with pytest.raises(RuntimeError):
+        orchestrator.execute(UserRequest(text="olá"))
+
+    ok, failed = sink.spans
+    assert ok.strategy == "research" and ok.error is None
+    assert set(ok.phases) == {"analyze", "select", "execute"}
+    assert ok.total >= sum(ok.phases.values()) > 0
+    assert failed.strategy == "basic" and failed.error == "RuntimeError"
+
+
+def test_disabled_instrumentation_skips_spans_and_debug_formatting(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    class Response(AgentResponse):
+        def __str__(self) -> str:
+            raise AssertionError("resposta formatada com DEBUG desativado")
+
+    class Strategy(IExecutionStrategy):
+        def execute(self, request: UserRequest) -> AgentResponse:
+            return Response(text="ok")
+
+    orchestrator = MetaOrchestrator()
+    orchestrator.strategies["basic"] = Strategy()
+    with caplog.at_level(logging.INFO, logger="personal_agent.core.meta_orchestrator"):
+        assert orchestrator.execute(UserRequest(text="olá")).text == "ok"
+    assert orchestrator.sinks == []
+
+
+def test_histogram_quantiles() -> None:
+    histogram = Histogram(buckets=(0.01, 0.1, 1.0))
+    for _ in range(98):
+        histogram.observe(0.005)
+    histogram.observe(0.5)
+    histogram.observe(5.0)
+
+    assert histogram.quantile(0.5) == pytest.approx(0.01 * 50 / 98)
+    assert 0.1 < histogram.quantile(0.99) <= 1.0
+    assert histogram.quantile(1.0) == 1.0
+    assert Histogram().quantile(0.5) == 0.0
+
+
+def test_prometheus_exposition_and_jsonl(tmp_path: Path) -> None:
+    prometheus = PrometheusSink(buckets=(0.1, 1.0))
+    jsonl = JsonlSink(tmp_path / "spans.jsonl")
+    orchestrator = MetaOrchestrator(sinks=[prometheus, jsonl])
+    for text in ["olá", "oi", "archive it"]:
+        orchestrator.execute(UserRequest(text=text))
+    jsonl.close()
+
+    text = prometheus.render()
+    assert "# TYPE personal_agent_requests_total counter" in text
+    assert 'personal_agent_requests_total{strategy="basic"} 2' in text
+    assert (
+        'personal_agent_request_duration_seconds_bucket{strategy="basic",phase="total",le="+Inf"} 2'
+        in text
+    )
+    assert (
+        'personal_agent_request_duration_seconds_count{strategy="archivist",phase="execute"} 1'
+        in text
+    )
+    assert prometheus.counters()["basic"] == {"requests": 2, "errors": 0}
+    assert 0.0 < prometheus.quantile("basic", 0.99) <= 0.1
+
+    records = [json.loads(line) for line in (tmp_path / "spans.jsonl").read_text().splitlines()]
+    assert [r["strategy"] for r in records] == ["basic", "basic", "archivist"]
+    assert set(records[0]) == {"started_at", "strategy", "phases", "total", "error"}
+
+
+def test_failing_sink_does_not_break_requests() -> None:
+    class BrokenSink:
+        def record(self, span: RequestSpan) -> None:
+            raise OSError("disco cheio")
+
+    sink = InMemorySink()
+    orchestrator = MetaOrchestrator(sinks=[BrokenSink(), sink])
+    assert orchestrator.execute(UserRequest(text="olá")).text == "Processed: olá"
+    assert len(sink.spans) == 1
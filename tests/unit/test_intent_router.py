@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import pytest
+import yaml
+from pydantic import ValidationError
+
+from config_models import SystemConfig
+from personal_agent.core.config_validator import ConfigValidator
+from personal_agent.core.intent_router import IntentRouter, RoutingRule
+from personal_agent.core.interfaces import UserRequest
+from personal_agent.core.meta_orchestrator import MetaOrchestrator
+
+
+def test_keywords_match_whole_words_only() -> None:
+    router = IntentRouter()
+
+    assert router.route("ask the researcher") == "basic"
+    assert router.route("memoryless process") == "basic"
+    assert router.route("Please RESEARCH this") == "research"
+    assert router.route("salve na memória") == "archivist"
+
+
+def test_highest_priority_match_wins_regardless_of_position() -> None:
+    router = IntentRouter()
+
+    assert router.route("archive this after you research it") == "research"
+
+
+def test_phrases_and_shared_prefixes() -> None:
+    router = IntentRouter(
+        [
+            RoutingRule("plan", ("plan", "plan trip"), priority=1),
+            RoutingRule("travel", ("plan  trip", "planet"), priority=5),
+        ]
+    )
+
+    assert router.route("please plan\ttrip to Rome") == "travel"
+    assert router.route("plan the week") == "plan"
+    assert router.route("planet earth") == "travel"
+    assert router.route("planner") == "basic"
+
+
+def test_router_loads_strategies_from_system_config() -> None:
+    with open("system_config.yaml", encoding="utf-8") as fh:
+        config = SystemConfig.from_dict(yaml.safe_load(fh))
+
+    router = IntentRouter.from_config(config)
+    orchestrator = MetaOrchestrator(router=router)
+
+    assert orchestrator.analyze_request(UserRequest(text="pesquisar algo")) == "research"
+    assert "memória" in router.keywords
+
+
+def test_hundreds_of_keywords_compile_into_one_pattern() -> None:
+    rules = [
+        RoutingRule(f"s{i}", tuple(f"term{i}x{j}" for j in range(10)), priority=i)
+        for i in range(50)
+    ]
+    router = IntentRouter(rules)
+
+    assert len(router.keywords) == 500
+    assert router.route("mention term3x7 and term41x0") == "s41"
+
+
+def test_validator_rejects_blank_strategy_keywords() -> None:
+    config = SystemConfig.from_dict(
+        {
+            "version": "1.0",
+            "llm_profiles": {},
+            "agents": {},
+            "tasks": {},
+            "teams": {},
+            "strategies": {"basic": {"keywords": [" "]}},
+        }
+    )
+
+    with pytest.raises(ValidationError):
+        ConfigValidator(config).validate()
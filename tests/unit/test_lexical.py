@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from personal_agent.memory.lexical import BM25Index, reciprocal_rank_fusion, tokenize
+from personal_agent.memory.simple_rag import SimpleRAG
+
+
+def test_tokenize_lowercases_words() -> None:
+    assert tokenize("Olá, Mundo! GPU-42") == ["olá", "mundo", "gpu", "42"]
+
+
+def test_bm25_ranks_rare_terms_higher_and_skips_non_matching_rows() -> None:
+    index = BM25Index()
+    index.add(["the cat", "the dog", "the zebra and the cat", "unrelated"])
+
+    rows, scores = index.search("zebra cat", top_k=10)
+
+    assert rows.tolist()[0] == 2
+    assert set(rows.tolist()) == {0, 2}
+    assert np.all(np.diff(scores) <= 0)
+
+
+def test_bm25_respects_allowed_mask() -> None:
+    index = BM25Index()
+    index.add(["alpha", "alpha beta", "beta"])
+
+    rows, _ = index.search("alpha", top_k=5, allowed=np.array([False, True, True]))
+
+    assert rows.tolist() == [1]
+
+
+def test_reciprocal_rank_fusion_prefers_rows_ranked_by_both() -> None:
+    assert reciprocal_rank_fusion([[1, 2, 3], [4, 2, 5]], top_k=2) == [2, 1]
+
+
+def test_hybrid_query_finds_exact_keyword() -> None:
+    rag = SimpleRAG(lexical_index=BM25Index())
+    rag.add_documents(["meeting with Zoltan on Friday", "lunch notes", "friday plans"])
+    rag.delete([rag._ids[2]])
+
+    assert rag.query("Zoltan", top_k=1, mode="lexical") == ["meeting with Zoltan on Friday"]
+    assert rag.query("Zoltan", top_k=1, mode="hybrid") == ["meeting with Zoltan on Friday"]
+    assert "friday plans" not in rag.query("friday", top_k=3, mode="lexical")
+
+
+def test_query_mode_is_validated_on_an_empty_store() -> None:
+    rag = SimpleRAG()
+
+    with pytest.raises(ValueError, match="requires a lexical_index"):
+        rag.query("Zoltan", mode="lexical")
+    with pytest.raises(ValueError, match="Unknown query mode"):
+        rag.query_many(["Zoltan"], mode="fuzzy")
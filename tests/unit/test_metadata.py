@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from personal_agent.memory.ingestion_log import IngestionLog
+from personal_agent.memory.metadata import MetadataIndex
+from personal_agent.memory.simple_rag import SimpleRAG
+
+
+def _index() -> MetadataIndex:
+    index = MetadataIndex()
+    index.add([
+        {"user": "alice", "ts": 1},
+        {"user": "bob", "ts": 5},
+        None,
+        {"user": "alice", "ts": 10, "source": "mail"},
+    ])
+    return index
+
+
+def test_equality_and_membership_filters() -> None:
+    index = _index()
+
+    assert index.mask({"user": "alice"}).tolist() == [True, False, False, True]
+    assert index.mask({"user": {"$in": ["bob", "carol"]}}).tolist() == [
+        False, True, False, False,
+    ]
+    assert index.mask({"user": {"$ne": "alice"}}).tolist() == [False, True, True, False]
+    assert index.mask({"missing": "x"}).tolist() == [False] * 4
+
+
+def test_range_filters_and_conjunction() -> None:
+    index = _index()
+
+    assert index.mask({"ts": {"$gte": 5, "$lt": 10}}).tolist() == [False, True, False, False]
+    assert index.mask({"user": "alice", "ts": {"$gt": 1}}).tolist() == [
+        False, False, False, True,
+    ]
+    assert index.get(3) == {"user": "alice", "ts": 10, "source": "mail"}
+
+
+def test_invalid_operator_raises() -> None:
+    with pytest.raises(ValueError):
+        _index().mask({"ts": {"$regex": "a"}})
+
+
+def test_query_filters_before_ranking() -> None:
+    rag = SimpleRAG()
+    rag.add_documents(
+        ["cat food", "cat toys", "dog food"],
+        metadatas=[{"user": "alice"}, {"user": "bob"}, {"user": "bob"}],
+    )
+
+    assert rag.query("cat", top_k=3, where={"user": "bob"}) == ["cat toys", "dog food"]
+    assert rag.query_many(["cat"], top_k=1, where={"user": "alice"}) == [["cat food"]]
+    assert rag.query("cat", where={"user": "nobody"}) == []
+
+
+def test_metadata_persists_on_disk_and_through_replay(tmp_path: Path) -> None:
+    log = IngestionLog(tmp_path / "log.jsonl")
+    rag = SimpleRAG(path=tmp_path / "store", log=log)
+    rag.add_documents(["cat food", "cat toys"], metadatas=[{"user": "a"}, {"user": "b"}])
+
+    reopened = SimpleRAG(path=tmp_path / "store", read_only=True)
+    rebuilt = SimpleRAG()
+    rebuilt.replay(log)
+
+    assert reopened.query("cat", where={"user": "b"}) == ["cat toys"]
+    assert rebuilt.query("cat", where={"user": "b"}) == ["cat toys"]
+
+
+def test_add_documents_rejects_mismatched_metadata() -> None:
+    with pytest.raises(ValueError):
+        SimpleRAG().add_documents(["a", "b"], metadatas=[{"user": "x"}])
+
+
+def test_invalid_metadata_is_rejected_before_anything_is_written(tmp_path: Path) -> None:
+    log = IngestionLog(tmp_path / "log.jsonl")
+    rag = SimpleRAG(path=tmp_path / "store", log=log)
+
+    with pytest.raises(ValueError, match="must be a str"):
+        rag.add_documents(["x"], metadatas=[{"tags": ["a"]}])  # type: ignore[dict-item]
+
+    assert len(rag) == 0
+    assert log.size() == 0
+    assert SimpleRAG().replay(log) == 0
+
+
+def test_tuples_are_rejected_and_booleans_do_not_match_numbers(tmp_path: Path) -> None:
+    rag = SimpleRAG(path=tmp_path / "store")
+    with pytest.raises(ValueError):
+        rag.add_documents(["x"], metadatas=[{"t": (1, 2)}])  # type: ignore[dict-item]
+    rag.add_documents(
+        ["flag on", "count one"], metadatas=[{"v": True}, {"v": 1}], ids=["a", "b"]
+    )
+
+    reopened = SimpleRAG(path=tmp_path / "store")
+    assert reopened.query("x", top_k=5, where={"v": True}) == ["flag on"]
+    assert reopened.query("x", top_k=5, where={"v": 1}) == ["count one"]
+    assert reopened.query("x", top_k=5, where={"v": {"$in": [False, 1]}}) == ["count one"]
+    assert reopened.delete(["a"]) == 1
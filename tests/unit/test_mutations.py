@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import threading
+from pathlib import Path
+from typing import List, Sequence
+
+import pytest
+
+from personal_agent.memory.ingestion_log import IngestionLog
+from personal_agent.memory.lexical import BM25Index
+from personal_agent.memory.simple_rag import SimpleRAG
+
+
+def test_add_documents_returns_ids_and_rejects_duplicates() -> None:
+    rag = SimpleRAG()
+
+    ids = rag.add_documents(["alpha", "beta"], ids=["a", "b"])
+
+    assert ids == ["a", "b"]
+    assert len(rag.add_documents(["gamma"])) == 1
+    with pytest.raises(ValueError):
+        rag.add_documents(["again"], ids=["a"])
+
+
+def test_delete_hides_documents_from_queries() -> None:
+    rag = SimpleRAG(compact_threshold=None)
+    rag.add_documents(["aaaa", "bbbb", "abab"], ids=["a", "b", "ab"])
+
+    assert rag.delete(["a", "missing"]) == 1
+
+    assert len(rag) == 2
+    assert "aaaa" not in rag.query("aaaa", top_k=3)
+    assert rag.query("bbbb", top_k=1, where={}) == ["bbbb"]
+
+
+def test_upsert_replaces_text_and_metadata() -> None:
+    rag = SimpleRAG(compact_threshold=None)
+    rag.add_documents(["old text"], ids=["doc"], metadatas=[{"v": 1}])
+
+    rag.upsert(["new text"], ids=["doc"], metadatas=[{"v": 2}])
+
+    assert len(rag) == 1
+    assert rag.query("text", top_k=5) == ["new text"]
+    assert rag.query("text", where={"v": 1}) == []
+
+
+def test_compact_reclaims_rows_in_memory() -> None:
+    rag = SimpleRAG(compact_threshold=None)
+    rag.add_documents(
+        ["one", "two", "three"], ids=["1", "2", "3"], metadatas=[{"n": i} for i in range(3)]
+    )
+    rag.delete(["2"])
+
+    assert rag.compact() == 1
+
+    assert rag._docs == ["one", "three"]
+    assert rag.query("three", top_k=1, where={"n": 2}) == ["three"]
+    assert rag.delete(["3"]) == 1
+
+
+def test_disk_compaction_and_replay_of_deletes(tmp_path: Path) -> None:
+    log = IngestionLog(tmp_path / "ingest.jsonl")
+    rag = SimpleRAG(path=tmp_path / "store", log=log)
+    rag.add_documents(["keep me", "drop me", "also drop"], ids=["k", "d1", "d2"])
+    rag.delete(["d1", "d2"])  # crosses the default threshold
+
+    reopened = SimpleRAG(path=tmp_path / "store")
+    assert len(reopened._store) == 1
+    assert reopened.query("drop", top_k=3) == ["keep me"]
+
+    rebuilt = SimpleRAG()
+    assert rebuilt.replay(log) == 5
+    assert rebuilt._docs == ["keep me"]
+
+
+def test_replay_keeps_only_the_last_version_of_an_id(tmp_path: Path) -> None:
+    log = IngestionLog(tmp_path / "ingest.jsonl")
+    source = SimpleRAG(log=log)
+    source.add_documents(["old"], ids=["a"])
+    source.upsert(["new"], ids=["a"])
+
+    rebuilt = SimpleRAG(compact_threshold=None)
+    assert rebuilt.replay(log) == 2
+    assert len(rebuilt) == 1
+    assert rebuilt.query("new", top_k=5) == ["new"]
+    assert rebuilt.delete(["a"]) == 1
+    assert rebuilt.query("old", top_k=5) == []
+
+
+def test_add_documents_sees_ids_pending_in_the_log(tmp_path: Path) -> None:
+    log = IngestionLog(tmp_path / "ingest.jsonl")
+    SimpleRAG(log=log).add_documents(["old"], ids=["x"])
+    rag = SimpleRAG(log=log, compact_threshold=None)
+
+    with pytest.raises(ValueError, match="already stored"):
+        rag.add_documents(["new"], ids=["x"])
+
+    assert rag._ids == ["x"]
+    assert rag.delete(["x"]) == 1
+    assert rag.query("old", top_k=5) == []
+
+
+@pytest.mark.parametrize("persistent", [False, True])
+def test_compaction_rebuilds_indexes_without_blocking_queries(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, persistent: bool
+) -> None:
+    rag = SimpleRAG(
+        path=tmp_path / "store" if persistent else None,
+        compact_threshold=None,
+        lexical_index=BM25Index(),
+    )
+    ids = rag.add_documents(
+        [f"note {i} about {'cats' if i % 2 else 'dogs'}" for i in range(20)],
+        metadatas=[{"pet": "cat" if i % 2 else "dog"} for i in range(20)],
+    )
+    rag.delete(ids[:10])
+
+    during: List[List[str]] = []
+    original_add = BM25Index.add
+
+    def add_while_querying(self: BM25Index, texts: Sequence[str]) -> None:
+        # A query from another thread must not wait for the rebuild.
+        worker = threading.Thread(
+            target=lambda: during.append(rag.query("cats", top_k=3, mode="lexical"))
+        )
+        worker.start()
+        worker.join(timeout=2)
+        assert not worker.is_alive()
+        original_add(self, texts)
+
+    monkeypatch.setattr(BM25Index, "add", add_while_querying)
+    assert rag.compact() == 10
+    monkeypatch.setattr(BM25Index, "add", original_add)
+
+    assert during and all(len(r) == 3 for r in during)
+    assert len(rag) == 10
+    cats = rag.query("cats", top_k=10, where={"pet": "cat"}, mode="lexical")
+    assert len(cats) == 5 and all("cats" in doc for doc in cats)
+    assert rag.delete([ids[11]]) == 1
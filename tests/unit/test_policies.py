@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import subprocess
+import sys
+import threading
+import time
+from typing import List
+
+import pytest
+import yaml
+from pydantic import ValidationError
+
+from config_models import ExecutionPolicy, SystemConfig
+from personal_agent.core.config_validator import ConfigValidator
+from personal_agent.agents.archivist_agent import ArchivistAgent
+from personal_agent.core.interfaces import (
+    AgentResponse,
+    IAsyncExecutionStrategy,
+    IBatchExecutionStrategy,
+    UserRequest,
+)
+from personal_agent.core.meta_orchestrator import MetaOrchestrator
+from personal_agent.core.policies import (
+    CircuitBreaker,
+    CircuitOpen,
+    ResilientStrategy,
+    apply_execution_policies,
+)
+from personal_agent.core.response_cache import enable_response_caches
+from personal_agent.strategies.basic_strategy import BasicStrategy
+from personal_agent.strategies.research_strategy import ResearchStrategy
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FlakyStrategy(ResearchStrategy):
+    def __init__(self, failures: int) -> None:
+        self.failures = failures
+        self.calls = 0
+
+    def execute(self, request: UserRequest) -> AgentResponse:
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise ConnectionError("serviço indisponível")
+        return super().execute(request)
+
+
+def test_retries_with_bounded_jittered_backoff() -> None:
+    delays: List[float] = []
+    strategy = FlakyStrategy(failures=2)
+    resilient = ResilientStrategy(
+        strategy,
+        ExecutionPolicy(retries=3, backoff=0.1, max_backoff=0.15),
+        sleep=delays.append,
+        rng=random.Random(0),
+    )
+
+    assert resilient.execute(UserRequest(text="x")).text == "Researching: x"
+    assert strategy.calls == 3
+    assert len(delays) == 2
+    assert 0.0 <= delays[0] <= 0.1 and 0.0 <= delays[1] <= 0.15
+
+
+def test_timeout_falls_back_without_waiting_for_hung_strategy() -> None:
+    release = threading.Event()
+
+    class HungStrategy(ResearchStrategy):
+        def execute(self, request: UserRequest) -> AgentResponse:
+            release.wait(5)
+            return super().execute(request)
+
+    resilient = ResilientStrategy(
+        HungStrategy(), ExecutionPolicy(timeout=0.05), fallback=BasicStrategy()
+    )
+    try:
+        assert resilient.execute(UserRequest(text="x")).text == "Processed: x"
+        resilient.fallback = None
+        with pytest.raises(TimeoutError):
+            resilient.execute(UserRequest(text="x"))
+    finally:
+        release.set()
+
+
+def test_circuit_opens_then_recovers_after_trial() -> None:
+    clock = Clock()
+    strategy = FlakyStrategy(failures=3)
+    resilient = ResilientStrategy(
+        strategy,
+        ExecutionPolicy(failure_threshold=2, recovery_time=10.0),
+        fallback=BasicStrategy(),
+        clock=clock,
+    )
+
+    for _ in range(2):
+        assert resilient.execute(UserRequest(text="x")).text == "Processed: x"
+    assert resilient.breaker.state == CircuitBreaker.OPEN
+    resilient.execute(UserRequest(text="x"))
+    assert strategy.calls == 2
+
+    clock.now = 10.0
+    assert resilient.breaker.state == CircuitBreaker.HALF_OPEN
+    resilient.execute(UserRequest(text="x"))
+    assert strategy.calls == 3 and resilient.breaker.state == CircuitBreaker.OPEN
+
+    clock.now = 20.0
+    assert resilient.execute(UserRequest(text="x")).text == "Researching: x"
+    assert resilient.breaker.state == CircuitBreaker.CLOSED
+
+    resilient.fallback = None
+    resilient.breaker = CircuitBreaker(failure_threshold=1, clock=clock)
+    resilient.breaker.record_failure()
+    with pytest.raises(CircuitOpen):
+        resilient.execute(UserRequest(text="x"))
+
+
+def test_async_and_batch_paths_keep_the_policy() -> None:
+    class AsyncBatchStrategy(FlakyStrategy):
+        attempts = 0
+
+        async def aexecute(self, request: UserRequest) -> AgentResponse:
+            self.attempts += 1
+            if self.attempts == 1:
+                await asyncio.sleep(5)
+            return self.execute(request)
+
+        def execute_batch(self, requests: List[UserRequest]) -> List[AgentResponse]:
+            return [self.execute(request) for request in requests]
+
+    async def no_wait(delay: float) -> None:
+        pass
+
+    strategy = AsyncBatchStrategy(failures=1)
+    resilient = ResilientStrategy(
+        strategy, ExecutionPolicy(timeout=0.05, retries=1, workers=2), asleep=no_wait
+    )
+    assert isinstance(resilient, IAsyncExecutionStrategy)
+    assert isinstance(resilient, IBatchExecutionStrategy)
+    assert not isinstance(ResilientStrategy(BasicStrategy(), ExecutionPolicy()),
+                          IAsyncExecutionStrategy)
+
+    # The first attempt times out and is cancelled and the retry fails, so
+    # the request goes to the fallback.
+    resilient.fallback = BasicStrategy()
+    response = asyncio.run(resilient.aexecute(UserRequest(text="x")))
+    assert response.text == "Processed: x"
+    assert strategy.attempts == 2 and strategy.calls == 1
+
+    responses = resilient.execute_batch([UserRequest(text="a"), UserRequest(text="b")])
+    assert [r.text for r in responses] == ["Researching: a", "Researching: b"]
+
+
+def test_wrapping_keeps_the_cacheable_marker() -> None:
+    orchestrator = MetaOrchestrator()
+    archivist = orchestrator.strategies["archivist"]
+    assert isinstance(archivist, ArchivistAgent)
+    orchestrator.strategies["archivist"] = ResilientStrategy(archivist, ExecutionPolicy())
+    with open("system_config.yaml", "r", encoding="utf-8") as fh:
+        data = yaml.safe_load(fh)
+    data["strategies"]["archivist"]["cache"] = {"enabled": True}
+
+    caches = enable_response_caches(orchestrator, SystemConfig.from_dict(data))
+
+    assert "archivist" not in caches
+    assert isinstance(orchestrator.strategies["archivist"], ResilientStrategy)
+
+
+def test_hung_attempts_do_not_block_close_or_exit() -> None:
+    release = threading.Event()
+
+    class HungStrategy(ResearchStrategy):
+        def execute(self, request: UserRequest) -> AgentResponse:
+            release.wait(5)
+            return super().execute(request)
+
+    orchestrator = MetaOrchestrator()
+    orchestrator.strategies["research"] = ResilientStrategy(
+        HungStrategy(), ExecutionPolicy(timeout=0.05, workers=1), fallback=BasicStrategy()
+    )
+    try:
+        with orchestrator:
+            response = orchestrator.execute(UserRequest(text="research x"))
+            assert response.text == "Processed: research x"
+        started = time.monotonic()
+        orchestrator.close()
+        assert time.monotonic() - started < 1
+        # New attempts fail fast once closed and are served by the fallback.
+        assert orchestrator.execute(UserRequest(text="research y")).text == "Processed: research y"
+    finally:
+        release.set()
+
+    script = (
+        "import time\n"
+        "from config_models import ExecutionPolicy\n"
+        "from personal_agent.core.policies import ResilientStrategy\n"
+        "from personal_agent.strategies.basic_strategy import BasicStrategy\n"
+        "class Hung(BasicStrategy):\n"
+        "    def execute(self, request):\n"
+        "        time.sleep(5)\n"
+        "strategy = ResilientStrategy(Hung(), ExecutionPolicy(timeout=0.05), BasicStrategy())\n"
+        "from personal_agent.core.interfaces import UserRequest\n"
+        "print(strategy.execute(UserRequest(text='x')).text)\n"
+    )
+    started = time.monotonic()
+    done = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, timeout=30
+    )
+    assert done.stdout.strip() == "Processed: x"
+    assert time.monotonic() - started < 4
+
+
+def test_policies_from_config() -> None:
+    with open("system_config.yaml", "r", encoding="utf-8") as fh:
+        data = yaml.safe_load(fh)
+    config = SystemConfig.from_dict(data)
+
+    orchestrator = MetaOrchestrator()
+    wrapped = apply_execution_policies(orchestrator, config)
+
+    assert set(wrapped) == {"research"}
+    assert isinstance(wrapped["research"].fallback, BasicStrategy)
+    response = orchestrator.execute(UserRequest(text="please research AI"))
+    assert response.text == "Researching: please research AI"
+
+    data["strategies"]["research"]["policy"]["fallback"] = "missing"
+    with pytest.raises(ValidationError, match="Unknown fallback strategy"):
+        ConfigValidator(SystemConfig.from_dict(data)).validate()
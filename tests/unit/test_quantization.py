@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import gc
+import logging
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from personal_agent.memory.disk_store import MMapVectorStore
+from personal_agent.memory.ann_index import ExactIndex, evaluate_index
+from personal_agent.memory.quantization import ProductCodec, QuantizedIndex
+from personal_agent.memory.simple_rag import SimpleRAG
+from personal_agent.memory.vector_store import VectorStore
+
+
+def _store(size: int = 2000, dim: int = 32) -> VectorStore:
+    rng = np.random.default_rng(0)
+    store = VectorStore()
+    store.add(rng.normal(size=(size, dim)))
+    return store
+
+
+@pytest.mark.parametrize("codec", ["float16", "int8", "pq"])
+def test_reranked_results_match_exact_search(codec: str) -> None:
+    store = _store()
+    index = QuantizedIndex(codec=codec, rerank_factor=8, min_train_size=0)
+    queries = store.vectors[:20] + 0.01
+
+    report = evaluate_index(store, index, queries, top_k=5)
+
+    assert report.recall >= (0.9 if codec == "pq" else 0.99)
+
+
+def test_scores_are_exact_after_rerank() -> None:
+    store = _store()
+    index = QuantizedIndex(codec="int8", min_train_size=0)
+    queries = store.vectors[:3]
+
+    rows, scores = index.search_many(store, queries, top_k=3)
+
+    expected_rows, expected_scores = ExactIndex().search_many(store, queries, top_k=3)
+    assert rows[:, 0].tolist() == expected_rows[:, 0].tolist()
+    np.testing.assert_allclose(scores[:, 0], expected_scores[:, 0], rtol=1e-5)
+
+
+def test_codes_are_smaller_than_float32_rows() -> None:
+    store = _store(dim=64)
+    index = QuantizedIndex(codec=ProductCodec(n_subvectors=8), min_train_size=0)
+    index.search_many(store, store.vectors[:1], top_k=1)
+
+    assert index.nbytes == len(store) * 8
+    assert index.nbytes * 32 == store.vectors.nbytes
+
+
+def test_filtered_search_only_returns_allowed_rows() -> None:
+    rag = SimpleRAG(index=QuantizedIndex(codec="int8", min_train_size=0))
+    rag.add_documents(
+        ["apple pie", "apple tart", "banana bread"],
+        metadatas=[{"kind": "a"}, {"kind": "b"}, {"kind": "b"}],
+    )
+
+    assert rag.query("apple", top_k=2, where={"kind": "b"}) == ["apple tart", "banana bread"]
+
+
+def test_filter_matching_no_rows_returns_nothing() -> None:
+    index = QuantizedIndex(codec="int8", min_train_size=10)
+    rag = SimpleRAG(index=index)
+    rag.add_documents([f"document {i}" for i in range(50)], metadatas=[{"kind": "a"}] * 50)
+
+    assert rag.query("document", top_k=3, where={"kind": "missing"}) == []
+
+    store = _store(size=50)
+    rows, scores = index.search_many(store, store.vectors[:2], top_k=3, rows=np.array([]))
+    assert rows.shape == scores.shape == (2, 0)
+
+
+def _resident_bytes(path: Path) -> int:
+    """Sum the ``Rss`` of every mapping of ``path`` in this process."""
+    total, inside = 0, False
+    with open("/proc/self/smaps", "r", encoding="utf-8") as fh:
+        for line in fh:
+            fields = line.split()
+            if fields and "-" in fields[0] and len(fields) >= 5:
+                inside = fields[-1] == str(path)
+            elif inside and fields[0] == "Rss:":
+                total += int(fields[1]) * 1024
+    return total
+
+
+@pytest.mark.skipif(not Path("/proc/self/smaps").exists(), reason="needs /proc smaps")
+def test_mapped_rows_are_not_kept_resident_after_encoding(tmp_path: Path) -> None:
+    writer = MMapVectorStore(tmp_path, dim=64)
+    writer.add(np.random.default_rng(0).normal(size=(100000, 64)))
+    writer.commit()
+    del writer
+    gc.collect()
+
+    store = MMapVectorStore(tmp_path, read_only=True)
+    index = QuantizedIndex(codec="int8", min_train_size=0)
+    rows, _ = index.search_many(store, np.asarray(store.vectors[:5]), top_k=3)
+
+    assert rows[:, 0].tolist() == list(range(5))
+    float32_bytes = store.vectors.nbytes
+    assert index.nbytes * 4 == float32_bytes
+    assert _resident_bytes(tmp_path / "vectors.f32") < float32_bytes // 4
+
+
+def test_in_memory_store_warns_that_codes_add_memory(caplog: pytest.LogCaptureFixture) -> None:
+    index = QuantizedIndex(codec="int8", min_train_size=0)
+    with caplog.at_level(logging.WARNING):
+        index.search_many(_store(size=100), np.ones((1, 32)), top_k=1)
+        index.search_many(_store(size=100), np.ones((1, 32)), top_k=1)
+
+    assert sum("in-memory store" in r.message for r in caplog.records) == 1
+
+
+def test_unknown_codec_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        QuantizedIndex(codec="int4")
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import threading
+from typing import List
+
+from personal_agent.memory.query_cache import QueryCache
+from personal_agent.memory.simple_rag import SimpleRAG
+
+
+def test_repeated_question_is_served_from_cache() -> None:
+    cache = QueryCache()
+    rag = SimpleRAG(query_cache=cache)
+    rag.add_documents(["cats purr", "dogs bark"])
+
+    first = rag.query("Cats?", top_k=1)
+    second = rag.query("  cats? ", top_k=1)
+
+    assert first == second == ["cats purr"]
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_writes_invalidate_cached_results() -> None:
+    cache = QueryCache()
+    rag = SimpleRAG(query_cache=cache, compact_threshold=None)
+    ids = rag.add_documents(["cats purr"])
+    assert rag.query("cats", top_k=2) == ["cats purr"]
+
+    rag.add_documents(["cats nap"])
+    assert len(rag.query("cats", top_k=2)) == 2
+
+    rag.delete(ids)
+    assert rag.query("cats", top_k=2) == ["cats nap"]
+    assert cache.stats()["invalidations"] == 2
+
+
+def test_entries_expire_after_ttl_and_respect_lru_bound() -> None:
+    now = [0.0]
+    cache = QueryCache(max_entries=2, ttl=10.0, clock=lambda: now[0])
+    cache.put("a", 0, ["x"])
+    cache.put("b", 0, ["y"])
+    cache.put("c", 0, ["z"])
+
+    assert cache.get("a", 0) is None
+    now[0] = 11.0
+    assert cache.get("b", 0) is None
+    assert len(cache) == 1
+
+
+def test_keys_distinguish_filters_and_modes() -> None:
+    base = QueryCache.make_key("q", 5, {"user": "a"})
+
+    assert base == QueryCache.make_key("Q ", 5, {"user": "a"})
+    assert base != QueryCache.make_key("q", 5, {"user": "b"})
+    assert base != QueryCache.make_key("q", 5, {"user": "a"}, mode="hybrid")
+
+
+def test_cache_is_safe_to_share_across_threads() -> None:
+    cache = QueryCache(max_entries=50)
+    errors: List[BaseException] = []
+
+    def worker(offset: int) -> None:
+        try:
+            for i in range(500):
+                key = (offset + i) % 80
+                if cache.get(key, 0) is None:
+                    cache.put(key, 0, [str(key)])
+        except BaseException as exc:  # pragma: no cover - reported below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    stats = cache.stats()
+    assert stats["hits"] + stats["misses"] == 2000
+    assert len(cache) <= 50
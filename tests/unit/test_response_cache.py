@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import pytest
+import yaml
+
+from config_models import CacheSettings, SystemConfig
+from personal_agent.agents.archivist_agent import ArchivistAgent
+from personal_agent.core.interfaces import (
+    AgentResponse,
+    IAsyncExecutionStrategy,
+    IBatchExecutionStrategy,
+    UserRequest,
+)
+from personal_agent.core.meta_orchestrator import MetaOrchestrator
+from personal_agent.core.response_cache import (
+    NORMALIZERS,
+    CachedStrategy,
+    ResponseCache,
+    enable_response_caches,
+)
+from personal_agent.strategies.basic_strategy import BasicStrategy
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class CountingStrategy(BasicStrategy):
+    def __init__(self) -> None:
+        self.calls: List[str] = []
+
+    def execute(self, request: UserRequest) -> AgentResponse:
+        self.calls.append(request.text)
+        return super().execute(request)
+
+
+def test_normalized_duplicates_hit_until_ttl_and_lru_eviction() -> None:
+    clock = Clock()
+    strategy = CountingStrategy()
+    cached = CachedStrategy(strategy, ResponseCache(max_entries=2, ttl=10.0, clock=clock))
+
+    cached.execute(UserRequest(text="What's on my calendar today"))
+    response = cached.execute(UserRequest(text="  what's ON my   calendar today "))
+    assert response.text == "Processed: What's on my calendar today"
+    assert len(strategy.calls) == 1
+
+    cached.execute(UserRequest(text="b"))
+    cached.execute(UserRequest(text="c"))
+    cached.execute(UserRequest(text="what's on my calendar today"))
+    assert len(strategy.calls) == 4
+
+    clock.now = 11.0
+    cached.execute(UserRequest(text="c"))
+    assert len(strategy.calls) == 5
+    assert cached.cache.stats()["hits"] == 1
+
+
+def test_normalizers() -> None:
+    assert NORMALIZERS["exact"]("A  b") == "A  b"
+    assert NORMALIZERS["whitespace"]("A  b") == "A b"
+    assert NORMALIZERS["casefold"]("A  b") == "a b"
+    assert NORMALIZERS["alphanumeric"]("What's  on?!") == "what s on"
+
+
+def test_single_flight_shares_one_execution() -> None:
+    gate = threading.Event()
+    calls: List[int] = []
+
+    def compute() -> AgentResponse:
+        calls.append(1)
+        gate.wait(5)
+        return AgentResponse(text="ok")
+
+    cache = ResponseCache()
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [pool.submit(cache.get_or_compute, "same", compute) for _ in range(8)]
+        deadline = time.monotonic() + 5
+        while cache.stats()["shared"] < 7 and time.monotonic() < deadline:
+            time.sleep(0.001)
+        gate.set()
+        assert all(f.result(5).text == "ok" for f in futures)
+    assert len(calls) == 1
+
+
+def test_errors_are_shared_but_not_cached() -> None:
+    def fail() -> AgentResponse:
+        raise RuntimeError("falha")
+
+    cache = ResponseCache()
+    with pytest.raises(RuntimeError):
+        cache.get_or_compute("x", fail)
+    assert cache.get_or_compute("x", lambda: AgentResponse(text="ok")).text == "ok"
+
+
+class AsyncBatchStrategy(CountingStrategy):
+    def __init__(self) -> None:
+        super().__init__()
+        self.batches: List[List[str]] = []
+
+    async def aexecute(self, request: UserRequest) -> AgentResponse:
+        self.calls.append("async:" + request.text)
+        return AgentResponse(text="async " + request.text)
+
+    def execute_batch(self, requests: List[UserRequest]) -> List[AgentResponse]:
+        self.batches.append([request.text for request in requests])
+        return [AgentResponse(text="batch " + request.text) for request in requests]
+
+
+def test_wrapper_keeps_async_and_batch_capabilities() -> None:
+    strategy = AsyncBatchStrategy()
+    orchestrator = MetaOrchestrator()
+    orchestrator.strategies["basic"] = CachedStrategy(strategy, ResponseCache())
+
+    wrapped = orchestrator.strategies["basic"]
+    assert isinstance(wrapped, IAsyncExecutionStrategy)
+    assert isinstance(wrapped, IBatchExecutionStrategy)
+    assert not isinstance(CachedStrategy(CountingStrategy(), ResponseCache()),
+                          IAsyncExecutionStrategy)
+
+    first = asyncio.run(orchestrator.aexecute(UserRequest(text="oi")))
+    again = asyncio.run(orchestrator.aexecute(UserRequest(text="OI")))
+    assert first.text == again.text == "async oi"
+    assert strategy.calls == ["async:oi"]
+
+    requests = [UserRequest(text=text) for text in ("oi", "a", "b", "A")]
+    responses = orchestrator.run_batch("basic", requests)
+    assert [r.text for r in responses] == ["async oi", "batch a", "batch b", "batch a"]
+    assert strategy.batches == [["a", "b"]]
+    assert strategy.calls == ["async:oi"]
+
+
+def test_batch_with_missing_responses_fails_without_caching() -> None:
+    class ShortBatchStrategy(AsyncBatchStrategy):
+        def execute_batch(self, requests: List[UserRequest]) -> List[AgentResponse]:
+            return super().execute_batch(requests)[:-1]
+
+    cached = CachedStrategy(ShortBatchStrategy(), ResponseCache())
+    assert isinstance(cached, IBatchExecutionStrategy)
+
+    with pytest.raises(ValueError, match="1 respostas para 2"):
+        cached.execute_batch([UserRequest(text="a"), UserRequest(text="b")])
+    assert len(cached.cache) == 0
+
+
+def test_enable_response_caches_respects_cacheable_markers() -> None:
+    with open("system_config.yaml", "r", encoding="utf-8") as fh:
+        data = yaml.safe_load(fh)
+    data["strategies"]["archivist"]["cache"] = {"enabled": True}
+    config = SystemConfig.from_dict(data)
+
+    orchestrator = MetaOrchestrator()
+    caches = enable_response_caches(orchestrator, config)
+
+    assert set(caches) == {"basic"}
+    assert isinstance(orchestrator.strategies["basic"], CachedStrategy)
+    assert isinstance(orchestrator.strategies["archivist"], ArchivistAgent)
+    orchestrator.execute(UserRequest(text="olá"))
+    orchestrator.execute(UserRequest(text="OLÁ"))
+    assert caches["basic"].stats()["hits"] == 1
+    assert enable_response_caches(orchestrator, config) == {}
+
+    with pytest.raises(ValueError):
+        CacheSettings(normalization="stemmed")  # type: ignore[arg-type]
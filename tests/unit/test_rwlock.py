@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import threading
+import time
+from pathlib import Path
+from typing import List
+
+from personal_agent.memory.simple_rag import SimpleRAG
+from personal_agent.utils.rwlock import RWLock
+
+
+def test_readers_share_the_lock() -> None:
+    lock = RWLock()
+    inside = threading.Barrier(2, timeout=2)
+
+    def reader() -> None:
+        with lock.read():
+            inside.wait()  # both readers must be inside at once
+
+    threads = [threading.Thread(target=reader) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not inside.broken
+
+
+def test_writer_excludes_readers_and_is_not_starved() -> None:
+    lock = RWLock()
+    events: List[str] = []
+    lock.acquire_read()
+
+    writer = threading.Thread(target=lambda: _hold(lock, events, "write"))
+    writer.start()
+    time.sleep(0.05)
+    late_reader = threading.Thread(target=lambda: _hold(lock, events, "read"))
+    late_reader.start()
+    time.sleep(0.05)
+    lock.release_read()
+    writer.join()
+    late_reader.join()
+
+    assert events == ["write", "read"]
+
+
+def _hold(lock: RWLock, events: List[str], kind: str) -> None:
+    with lock.write() if kind == "write" else lock.read():
+        events.append(kind)
+
+
+def test_queries_run_while_documents_are_ingested() -> None:
+    rag = SimpleRAG()
+    rag.add_documents(["seed document"])
+    errors: List[BaseException] = []
+    done = threading.Event()
+
+    def ingest() -> None:
+        try:
+            for i in range(50):
+                rag.add_documents([f"batch {i} doc {j}" for j in range(20)])
+        except BaseException as exc:  # pragma: no cover - reported below
+            errors.append(exc)
+        finally:
+            done.set()
+
+    def query() -> None:
+        try:
+            while not done.is_set():
+                results = rag.query_many(["doc", "batch"], top_k=5)
+                assert all(1 <= len(r) <= 5 for r in results)
+                assert all(isinstance(doc, str) for r in results for doc in r)
+        except BaseException as exc:  # pragma: no cover - reported below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=ingest)] + [
+        threading.Thread(target=query) for _ in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert len(rag) == 1001
+
+
+def test_concurrent_queries_on_reopened_persistent_store(tmp_path: Path) -> None:
+    docs = [f"document {i} " + "abcdefghij"[i % 10] * (i % 17 + 1) for i in range(400)]
+    writer = SimpleRAG(path=tmp_path)
+    writer.add_documents(docs, metadatas=[{"parity": i % 2} for i in range(400)])
+    del writer
+
+    rag = SimpleRAG(path=tmp_path)
+    errors: List[BaseException] = []
+    start = threading.Barrier(6, timeout=5)
+
+    def query(worker: int) -> None:
+        try:
+            start.wait()
+            for i in range(40):
+                where = {"parity": worker % 2} if i % 2 else None
+                results = rag.query(docs[(worker * 40 + i) % 400], top_k=8, where=where)
+                assert len(results) == 8
+                assert all(doc in docs for doc in results)
+        except BaseException as exc:  # pragma: no cover - reported below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=query, args=(w,)) for w in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import threading
+from typing import List
+
+import pytest
+import yaml
+
+from config_models import ExecutionLimits, SystemConfig
+from personal_agent.core.interfaces import AgentResponse, UserRequest
+from personal_agent.core.meta_orchestrator import MetaOrchestrator
+from personal_agent.core.scheduler import SchedulerOverloaded, StrategyScheduler
+from personal_agent.strategies.basic_strategy import BasicStrategy
+
+
+class GatedStrategy(BasicStrategy):
+    def __init__(self) -> None:
+        self.gate = threading.Event()
+        self.started: List[str] = []
+
+    def execute(self, request: UserRequest) -> AgentResponse:
+        self.started.append(request.text)
+        self.gate.wait(5)
+        return super().execute(request)
+
+
+def test_concurrency_cap_and_priority_order() -> None:
+    orchestrator = MetaOrchestrator()
+    strategy = GatedStrategy()
+    orchestrator.strategies["basic"] = strategy
+    limits = {"basic": ExecutionLimits(max_concurrency=1, max_queue=8)}
+
+    with StrategyScheduler(orchestrator, limits) as scheduler:
+        first = scheduler.submit(UserRequest(text="first"))
+        low = scheduler.submit(UserRequest(text="low"), priority=0)
+        high = scheduler.submit(UserRequest(text="high"), priority=5)
+        assert scheduler.stats()["basic"]["queued"] == 2
+        assert scheduler.stats()["basic"]["running"] == 1
+
+        # Outras estratégias têm vagas próprias.
+        assert scheduler.execute(UserRequest(text="research now")).text.startswith("Researching")
+
+        strategy.gate.set()
+        assert [f.result(5).text for f in (first, low, high)] == [
+            "Processed: first",
+            "Processed: low",
+            "Processed: high",
+        ]
+    assert strategy.started == ["first", "high", "low"]
+    assert scheduler.stats()["basic"] == {
+        "running": 0,
+        "queued": 0,
+        "completed": 3,
+        "rejected": 0,
+    }
+
+
+def test_full_queue_sheds_lowest_priority() -> None:
+    orchestrator = MetaOrchestrator()
+    strategy = GatedStrategy()
+    orchestrator.strategies["basic"] = strategy
+    limits = {"basic": ExecutionLimits(max_concurrency=1, max_queue=1)}
+
+    with StrategyScheduler(orchestrator, limits) as scheduler:
+        running = scheduler.submit(UserRequest(text="running"))
+        queued = scheduler.submit(UserRequest(text="queued"))
+        with pytest.raises(SchedulerOverloaded):
+            scheduler.submit(UserRequest(text="rejected"))
+
+        urgent = scheduler.submit(UserRequest(text="urgent"), priority=1)
+        with pytest.raises(SchedulerOverloaded):
+            queued.result(5)
+
+        strategy.gate.set()
+        assert running.result(5).text == "Processed: running"
+        assert urgent.result(5).text == "Processed: urgent"
+    assert scheduler.stats()["basic"]["rejected"] == 2
+
+
+def test_errors_propagate_and_release_the_slot() -> None:
+    class FailingStrategy(BasicStrategy):
+        def execute(self, request: UserRequest) -> AgentResponse:
+            raise RuntimeError("falha simulada")
+
+    orchestrator = MetaOrchestrator()
+    orchestrator.strategies["archivist"] = FailingStrategy()
+    limits = {"archivist": ExecutionLimits(max_concurrency=1, max_queue=0)}
+
+    with StrategyScheduler(orchestrator, limits) as scheduler:
+        for _ in range(3):
+            with pytest.raises(RuntimeError, match="falha simulada"):
+                scheduler.execute(UserRequest(text="archive it"))
+
+
+def test_from_config_reads_strategy_limits() -> None:
+    with open("system_config.yaml", "r", encoding="utf-8") as fh:
+        config = SystemConfig.from_dict(yaml.safe_load(fh))
+
+    with StrategyScheduler.from_config(MetaOrchestrator(), config) as scheduler:
+        assert scheduler.execute(UserRequest(text="olá")).text == "Processed: olá"
+        assert set(scheduler.stats()) == {"basic", "research", "archivist"}
+
+    with pytest.raises(ValueError):
+        ExecutionLimits(max_concurrency=0)
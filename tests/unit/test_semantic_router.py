@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import List, Sequence
+
+import numpy as np
+import yaml
+
+from config_models import SystemConfig
+from personal_agent.core.intent_router import IntentRouter
+from personal_agent.core.interfaces import UserRequest
+from personal_agent.core.meta_orchestrator import MetaOrchestrator
+from personal_agent.core.semantic_router import SemanticRouter
+
+VOCABULARY = ["find", "sources", "study", "papers", "save", "remember", "note", "hello", "thanks"]
+
+
+class BagOfWordsEmbedder:
+    name = "bag-of-words"
+    dim = len(VOCABULARY)
+
+    def __init__(self) -> None:
+        self.calls: List[List[str]] = []
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        self.calls.append(list(texts))
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                if word in VOCABULARY:
+                    out[row, VOCABULARY.index(word)] += 1.0
+        return out
+
+
+EXAMPLES = {
+    "research": ["find sources", "study papers"],
+    "archivist": ["save note", "remember note"],
+    "basic": ["hello", "thanks"],
+}
+
+
+def test_routes_paraphrases_to_nearest_centroid() -> None:
+    router = SemanticRouter(EXAMPLES, BagOfWordsEmbedder(), threshold=0.4)
+
+    assert router.route("could you find papers") == "research"
+    assert router.route("remember this note") == "archivist"
+    assert router.route("hello there") == "basic"
+    assert set(router.scores("save")) == {"research", "archivist", "basic"}
+
+
+def test_low_confidence_falls_back_to_keywords() -> None:
+    router = SemanticRouter(EXAMPLES, BagOfWordsEmbedder(), threshold=0.5)
+
+    assert router.route("archive the meeting") == "archivist"
+    assert router.route("unrelated words") == "basic"
+
+
+def test_centroids_are_cached_on_disk(tmp_path: Path) -> None:
+    cache = tmp_path / "centroids.npz"
+    first = BagOfWordsEmbedder()
+    SemanticRouter(EXAMPLES, first, cache_path=cache)
+    assert cache.exists() and len(first.calls) == 1
+
+    second = BagOfWordsEmbedder()
+    router = SemanticRouter(EXAMPLES, second, threshold=0.5, cache_path=cache)
+    assert second.calls == []
+    assert router.route("find sources") == "research"
+    assert len(second.calls) == 1
+
+    third = BagOfWordsEmbedder()
+    SemanticRouter({**EXAMPLES, "basic": ["hi"]}, third, cache_path=cache)
+    assert len(third.calls) == 1
+
+
+def test_from_config_uses_examples_and_keyword_fallback() -> None:
+    with open("system_config.yaml", "r", encoding="utf-8") as fh:
+        config = SystemConfig(**yaml.safe_load(fh))
+
+    router = SemanticRouter.from_config(config, BagOfWordsEmbedder(), threshold=1.1)
+
+    assert set(router.strategies) == {
+        name for name, strategy in config.strategies.items() if strategy.examples
+    }
+    assert isinstance(router.fallback, IntentRouter)
+    orchestrator = MetaOrchestrator(router=router)
+    assert orchestrator.analyze_request(UserRequest(text="pesquisa sobre IA")) == "research"
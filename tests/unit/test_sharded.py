@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import random
+from pathlib import Path
+
+from personal_agent.memory.sharded import ShardedRAG, merge_top_k, shard_for
+from personal_agent.memory.simple_rag import SimpleRAG
+
+_rng = random.Random(0)
+DOCS = ["".join(_rng.choices("abcdefghijklmnop", k=24)) for _ in range(40)]
+
+
+def test_shard_routing_is_stable_and_balanced() -> None:
+    owners = [shard_for(f"doc-{i}", 4) for i in range(400)]
+
+    assert owners == [shard_for(f"doc-{i}", 4) for i in range(400)]
+    assert all(owners.count(shard) > 50 for shard in range(4))
+
+
+def test_merge_top_k_interleaves_sorted_shard_results() -> None:
+    merged = merge_top_k([[(0.9, "a"), (0.5, "c")], [(0.7, "b"), (0.1, "d")]], top_k=3)
+
+    assert merged == ["a", "b", "c"]
+
+
+def test_sharded_query_matches_single_store() -> None:
+    single = SimpleRAG()
+    sharded = ShardedRAG(n_shards=3)
+    ids = [f"id-{i}" for i in range(len(DOCS))]
+    single.add_documents(DOCS, ids=ids)
+    sharded.add_documents(DOCS, ids=ids)
+
+    try:
+        for question in ["abc", "pop", DOCS[7]]:
+            assert sharded.query(question, top_k=5) == single.query(question, top_k=5)
+        assert sharded.delete(ids[:4]) == 4
+        assert len(sharded) == len(DOCS) - 4
+        assert DOCS[0] not in sharded.query(DOCS[0], top_k=10)
+    finally:
+        sharded.close()
+
+
+def test_process_pool_searches_mapped_shards(tmp_path: Path) -> None:
+    sharded = ShardedRAG(n_shards=2, path=tmp_path, processes=2)
+    sharded.add_documents(DOCS, metadatas=[{"n": i % 2} for i in range(len(DOCS))])
+    threaded = ShardedRAG(n_shards=2, path=tmp_path)
+
+    try:
+        expected = threaded.query_many(["abc", "pop"], top_k=4, where={"n": 1})
+        assert sharded.query_many(["abc", "pop"], top_k=4, where={"n": 1}) == expected
+    finally:
+        sharded.close()
+        threaded.close()
+
+
+def test_worker_processes_remap_compacted_shards(tmp_path: Path) -> None:
+    sharded = ShardedRAG(n_shards=1, path=tmp_path, processes=1)
+    try:
+        ids = sharded.add_documents(["aaaa", "bbbb", "cccc", "dddd"])
+        assert sharded.query("dddd", top_k=1) == ["dddd"]  # worker maps the shard
+        sharded.delete(ids[:3])  # crosses the compaction threshold
+        sharded.add_documents(["zzzz"])
+
+        assert sharded.query("zzzz", top_k=1) == ["zzzz"]
+        assert sorted(sharded.query("zzzz", top_k=5)) == ["dddd", "zzzz"]
+    finally:
+        sharded.close()
@@ -31,3 +31,23 @@ def test_query_returns_semantic_matches() -> None:
         "The cat sat on the mat",
         "Cats and kittens are cute",
     ]
+
+
+def test_query_many_matches_individual_queries() -> None:
+    rag = SimpleRAG()
+    rag.add_documents([
+        "The cat sat on the mat",
+        "Dogs are friendly",
+        "Cats and kittens are cute",
+    ])
+    questions = ["cat", "friendly dog", "kitten"]
+
+    results = rag.query_many(questions, top_k=2)
+
+    assert results == [rag.query(q, top_k=2) for q in questions]
+
+
+def test_query_many_on_empty_store_returns_empty_lists() -> None:
+    rag = SimpleRAG()
+
+    assert rag.query_many(["a", "b"]) == [[], []]
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from personal_agent.memory.vector_store import VectorStore, top_k_indices
+
+
+def test_add_grows_capacity_by_doubling() -> None:
+    store = VectorStore(initial_capacity=2)
+    store.add(np.ones((3, 4)))
+
+    assert len(store) == 3
+    assert store.capacity == 4
+    assert store.vectors.dtype == np.float32
+    np.testing.assert_allclose(np.linalg.norm(store.vectors, axis=1), 1.0, rtol=1e-6)
+
+
+def test_add_rejects_mismatched_dimension() -> None:
+    store = VectorStore()
+    store.add(np.ones((1, 3)))
+
+    with pytest.raises(ValueError):
+        store.add(np.ones((1, 4)))
+
+
+def test_search_matches_full_sort() -> None:
+    rng = np.random.default_rng(0)
+    data = rng.normal(size=(200, 8))
+    query = rng.normal(size=8)
+    store = VectorStore()
+    store.add(data)
+
+    rows, scores = store.search(query, top_k=5)
+
+    normed = data / np.linalg.norm(data, axis=1, keepdims=True)
+    expected = np.argsort(normed @ (query / np.linalg.norm(query)))[::-1][:5]
+    assert rows.tolist() == expected.tolist()
+    assert np.all(np.diff(scores) <= 0)
+
+
+def test_top_k_indices_handles_small_inputs() -> None:
+    assert top_k_indices(np.array([0.1, 0.5]), 5).tolist() == [1, 0]
+    assert top_k_indices(np.array([0.1, 0.5]), 0).tolist() == []
+
+
+def test_search_many_matches_single_searches() -> None:
+    rng = np.random.default_rng(1)
+    store = VectorStore()
+    store.add(rng.normal(size=(50, 6)))
+    queries = rng.normal(size=(4, 6))
+
+    rows, scores = store.search_many(queries, top_k=3)
+
+    assert rows.shape == (4, 3)
+    for i, query in enumerate(queries):
+        single_rows, single_scores = store.search(query, top_k=3)
+        assert rows[i].tolist() == single_rows.tolist()
+        np.testing.assert_allclose(scores[i], single_scores, rtol=1e-5)